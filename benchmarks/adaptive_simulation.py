@@ -0,0 +1,149 @@
+"""
+Simulación offline del programador adaptativo frente al sondeo fijo.
+
+Cada canal sintético transmite tres horas, siempre a la misma hora, uno,
+dos o cinco días por semana. El reloj avanza de a un tick (15 s) durante
+varias semanas sin red: la consulta a Helix se reemplaza por el estado
+simulado. Las primeras semanas sirven para que el programador aprenda los
+horarios y se mide solo la última: solicitudes por semana y demora desde
+que un canal sale en vivo hasta que se detecta.
+
+    python -m benchmarks.adaptive_simulation --channels 50 300 3000 --weeks 3
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from src.scheduler import AdaptiveScheduler
+
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+STREAM_MINUTES = 180
+TICK_SECONDS = 15
+
+
+def make_schedules(channels, seed):
+    """Devuelve user_id -> (días de la semana, minuto del día de inicio)."""
+    rng = random.Random(seed)
+    schedules = {}
+    for index in range(channels):
+        days = set(rng.sample(range(7), rng.choice([1, 2, 5])))
+        start_minute = rng.randrange(24) * 60 + rng.randrange(30)
+        schedules[str(index)] = (days, start_minute)
+    return schedules
+
+
+def transitions_by_minute(schedules):
+    """
+    Cambios de estado por minuto de la semana, en hora local como la que
+    usa ChannelHistory: (día, minuto del día) -> [(user_id, en vivo)].
+    """
+    transitions = {}
+    for user_id, (days, start_minute) in schedules.items():
+        for day in days:
+            end = day * 24 * 60 + start_minute + STREAM_MINUTES
+            end_day, end_minute = divmod(end % (7 * 24 * 60), 24 * 60)
+            transitions.setdefault((day, start_minute), []).append(
+                (user_id, True)
+            )
+            transitions.setdefault((end_day, end_minute), []).append(
+                (user_id, False)
+            )
+    return transitions
+
+
+def simulate(schedules, weeks, **scheduler_options):
+    live = dict.fromkeys(schedules, False)
+    transitions = transitions_by_minute(schedules)
+    went_live_at = {}
+    latencies = []
+
+    def check(user_ids):
+        return {user_id: {} for user_id in user_ids if live[user_id]}
+
+    # Start on a local Monday midnight so the weeks line up with the schedules
+    today = time.localtime()
+    start = time.mktime((today.tm_year, today.tm_mon,
+                         today.tm_mday - today.tm_wday, 0, 0, 0, 0, 0, -1))
+    measured_from = start + (weeks - 1) * WEEK
+    end = start + weeks * WEEK
+
+    scheduler = AdaptiveScheduler(check, tick_seconds=TICK_SECONDS,
+                                  **scheduler_options)
+    for user_id in schedules:
+        scheduler.add_channel(user_id, now=start)
+
+    requests_before = checks_before = 0
+    now = start
+    while now < end:
+        if now == measured_from:
+            requests_before = scheduler.requests_made
+            checks_before = scheduler.checks_made
+        local = time.localtime(now)
+        if local.tm_sec < TICK_SECONDS:
+            minute = local.tm_hour * 60 + local.tm_min
+            for user_id, is_live in transitions.get((local.tm_wday, minute), ()):
+                if is_live and not live[user_id]:
+                    went_live_at[user_id] = now
+                live[user_id] = is_live
+
+        for user_id in scheduler.run_tick(now):
+            if (scheduler.histories[user_id].is_live
+                    and user_id in went_live_at):
+                latency = now - went_live_at.pop(user_id)
+                if now >= measured_from:
+                    latencies.append(latency)
+        now += TICK_SECONDS
+
+    latencies.sort()
+    return {
+        "requests": scheduler.requests_made - requests_before,
+        "checks": scheduler.checks_made - checks_before,
+        "p50": statistics.median(latencies),
+        "p90": latencies[int(len(latencies) * 0.9)],
+        "detected": len(latencies),
+    }
+
+
+def report(label, result):
+    print(f"  {label:10} {result['requests']:7} solicitudes/semana, "
+          f"{result['checks']:9} canales consultados, latencia p50 "
+          f"{result['p50']:4.0f} s, p90 {result['p90']:4.0f} s "
+          f"({result['detected']} inicios)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, nargs="+",
+                        default=[50, 300, 3000],
+                        help="cantidades de canales a simular")
+    parser.add_argument("--weeks", type=int, default=3,
+                        help="semanas simuladas; se mide solo la última")
+    parser.add_argument("--interval", type=float, default=5,
+                        help="intervalo del sondeo fijo, en minutos")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for channels in args.channels:
+        schedules = make_schedules(channels, args.seed)
+        print(f"{channels} canales, semana {args.weeks} de {args.weeks}")
+        # The fixed loop is the adaptive one with every interval pinned
+        report("fijo", simulate(
+            schedules, args.weeks,
+            base_interval_minutes=args.interval,
+            min_interval_minutes=args.interval,
+            max_interval_minutes=args.interval,
+            max_wait_seconds=0,
+            requests_per_minute=1000,
+        ))
+        report("adaptativo", simulate(
+            schedules, args.weeks,
+            base_interval_minutes=args.interval,
+            requests_per_minute=1000,
+        ))
+
+
+if __name__ == "__main__":
+    main()
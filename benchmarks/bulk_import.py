@@ -0,0 +1,118 @@
+"""
+Importación masiva de canales contra el servidor Helix simulado.
+
+Mide tiempo y solicitudes para importar N canales de un archivo (IDs
+resueltos de a 100) y desde /channels/followed (páginas de 100 que ya
+traen los IDs), tanto en consola (main.setup) como en la GUI (hasta que
+todos los canales de la lista quedan resueltos).
+
+    python -m benchmarks.bulk_import --channels 5000
+"""
+
+import argparse
+import contextlib
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+from .mock_helix import MockHelixServer
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+def report(name, server, elapsed, channels):
+    print(f"  {name:28} {channels:6} canales en {elapsed:6.2f} s, "
+          f"{server.request_count} solicitudes")
+
+
+def bench_console(server, channels_path, devnull):
+    main = importlib.import_module("src.main")
+    print("Consola (main.setup):")
+    for name, env in (
+        ("archivo", {"CHANNELS_FILE": channels_path, "FOLLOWED_BY": ""}),
+        ("seguidos", {"CHANNELS_FILE": "", "FOLLOWED_BY": "channel0"}),
+    ):
+        os.environ.update(env)
+        # Start with an empty ID cache, the first-run worst case
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.environ["USER_ID_CACHE_PATH"])
+        server.reset_counters()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(devnull):
+            main.setup(main.Settings(), [])
+        elapsed = time.perf_counter() - started
+        report(name, server, elapsed, len(main.registry))
+        main.shutdown()
+
+
+def bench_gui(server, channels_path, channel_count, devnull):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, SRC_DIR)
+    from PyQt6.QtWidgets import QApplication
+
+    from ui.channel_model import STATE_RESOLVED
+    from ui.main_window import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    print("GUI (MainWindow):")
+    for name, env in (
+        ("archivo", {"CHANNELS_FILE": channels_path, "FOLLOWED_BY": ""}),
+        ("seguidos", {"CHANNELS_FILE": "", "FOLLOWED_BY": "channel0"}),
+    ):
+        os.environ.update(env)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.environ["USER_ID_CACHE_PATH"])
+        server.reset_counters()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(devnull):
+            window = MainWindow()
+            model = window.channels_model
+            deadline = time.monotonic() + 120
+            while time.monotonic() < deadline:
+                app.processEvents()
+                resolved = sum(
+                    1 for row in range(model.rowCount())
+                    if model.state_of(model.channel_at(row)) == STATE_RESOLVED
+                )
+                if resolved >= channel_count:
+                    break
+                time.sleep(0.005)
+        elapsed = time.perf_counter() - started
+        report(name, server, elapsed, resolved)
+        window.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, default=5000)
+    parser.add_argument("--target", choices=["console", "gui", "both"],
+                        default="both")
+    args = parser.parse_args()
+
+    server = MockHelixServer(channels=args.channels, seed=1)
+    with server, tempfile.TemporaryDirectory() as cache_dir, \
+            open(os.devnull, "w") as devnull:
+        channels_path = os.path.join(cache_dir, "channels.txt")
+        with open(channels_path, "w", encoding="utf-8") as channels_file:
+            channels_file.write("\n".join(server.logins()) + "\n")
+        os.environ.update(
+            TWITCH_API_URL=server.url,
+            TWITCH_OAUTH_URL=server.oauth_url,
+            CLIENT_ID="mock-client",
+            ACCESS_TOKEN="mock-token",
+            CHANNELS_TO_CHECK="",
+            USER_ID_CACHE_PATH=os.path.join(cache_dir, "ids.json"),
+            STATE_PATH=os.path.join(cache_dir, "state.jsonl"),
+        )
+        os.environ.setdefault("CLIENT_SECRET", "mock-secret")
+        print(f"{args.channels} canales")
+        if args.target in ("console", "both"):
+            bench_console(server, channels_path, devnull)
+        if args.target in ("gui", "both"):
+            bench_gui(server, channels_path, args.channels, devnull)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Tiempo de arranque del modo consola hasta la primera consulta.
+
+Lanza `python -m src.main --once --sink stdout` varias veces contra el
+servidor Helix simulado y mide, desde que se crea el proceso, cuánto tarda
+en llegar la primera solicitud a /streams y cuánto dura el proceso entero.
+La primera corrida resuelve los IDs por la API; las siguientes los leen de
+la caché, como un cron que arranca una y otra vez.
+
+    python -m benchmarks.cold_start --runs 10 --channels 200
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .mock_helix import MockHelixServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(server, env):
+    """Devuelve (ms hasta la primera consulta, ms del proceso completo)."""
+    server.reset_counters()
+    started = time.time()
+    result = subprocess.run(
+        [sys.executable, "-m", "src.main", "--once", "--sink", "stdout"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=False,
+    )
+    finished = time.time()
+    if result.returncode != 0 or server.first_poll_at is None:
+        sys.exit(f"El proceso falló ({result.returncode}):\n{result.stderr}")
+    return ((server.first_poll_at - started) * 1000,
+            (finished - started) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--channels", type=int, default=200)
+    args = parser.parse_args()
+
+    server = MockHelixServer(channels=args.channels, seed=1)
+    with server, tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(
+            os.environ,
+            TWITCH_API_URL=server.url,
+            TWITCH_OAUTH_URL=server.oauth_url,
+            CLIENT_ID="mock-client",
+            ACCESS_TOKEN="mock-token",
+            CLIENT_SECRET="mock-secret",
+            CHANNELS_TO_CHECK=",".join(server.logins()),
+            USER_ID_CACHE_PATH=os.path.join(cache_dir, "ids.json"),
+            STATE_PATH=os.path.join(cache_dir, "state.jsonl"),
+        )
+        first_poll, total = run_once(server, env)
+        print(f"{args.channels} canales, {args.runs} arranques con caché")
+        print(f"  sin caché: primera consulta {first_poll:.0f} ms, "
+              f"proceso {total:.0f} ms")
+
+        samples = [run_once(server, env) for _ in range(args.runs)]
+        first_polls = sorted(sample[0] for sample in samples)
+        totals = sorted(sample[1] for sample in samples)
+        print(f"  primera consulta: p50 {statistics.median(first_polls):.0f} ms, "
+              f"mín {first_polls[0]:.0f} ms, máx {first_polls[-1]:.0f} ms")
+        print(f"  proceso completo: p50 {statistics.median(totals):.0f} ms")
+
+        # Same interpreter doing nothing, the floor no app change can beat
+        started = time.time()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        print(f"  intérprete vacío: {(time.time() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
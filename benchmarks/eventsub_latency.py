@@ -0,0 +1,153 @@
+"""
+Mide la latencia evento -> notificación del modo EventSub contra el servidor
+simulado, sin red ni credenciales reales.
+
+Cada evento stream.online recorre el mismo camino que en la app: websocket,
+main.on_stream_online, registro de canales y NotificationDispatcher. El
+tiempo se toma cuando el dispatcher llama al notificador, así que incluye
+la ventana de agrupación de notificaciones; también se informa la latencia
+hasta el callback para separar las dos partes. En cada ronda todos los
+canales salen en vivo una vez, con el registro en blanco.
+
+    python -m benchmarks.eventsub_latency --channels 150 --rounds 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import tempfile
+import time
+
+from src import main as console
+from src.eventsub import EventSubClient
+from src.metrics import Metrics, TickProfiler
+from src.notifications import NotificationDispatcher
+from src.registry import ChannelRegistry
+from src.state_journal import StateJournal
+from src.twitch_client import AsyncTwitchClient, TwitchClient
+
+from .mock_eventsub import MockEventSubServer
+
+
+class TimingNotifier:
+    """Anota cuándo llega cada canal al notificador."""
+
+    def __init__(self):
+        self.notified_at = {}
+
+    def notify_live_many(self, channel_names):
+        now = time.perf_counter()
+        for channel_name in channel_names:
+            self.notified_at[channel_name] = now
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def describe(label, latencies):
+    return (f"Latencia {label}: p50 {statistics.median(latencies):.2f} ms, "
+            f"p99 {percentile(latencies, 0.99):.2f} ms, "
+            f"máx {max(latencies):.2f} ms")
+
+
+def new_registry(user_ids):
+    registry = ChannelRegistry()
+    for user_id in user_ids:
+        registry.add(f"user{user_id}", user_id)
+    return registry
+
+
+async def run_benchmark(channels, rounds, rate, coalesce_seconds, state_path,
+                        devnull):
+    user_ids = [str(100000 + i) for i in range(channels)]
+    timing = TimingNotifier()
+    console.metrics = Metrics()
+    console.profiler = TickProfiler()
+    console.state_journal = StateJournal(state_path)
+    console.notifier = NotificationDispatcher(
+        timing, coalesce_seconds=coalesce_seconds
+    )
+    callback_at = {}
+
+    def on_stream_online(user_id, event):
+        callback_at[user_id] = time.perf_counter()
+        console.on_stream_online(user_id, event)
+
+    with MockEventSubServer() as server:
+        twitch_client = TwitchClient("mock-client", "mock-token")
+        twitch_client.base_url = server.api_url
+        eventsub = EventSubClient(
+            AsyncTwitchClient(twitch_client), on_stream_online,
+            console.on_stream_offline, ws_url=server.ws_url,
+        )
+        session = asyncio.create_task(eventsub.run(user_ids))
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        subscribed = await loop.run_in_executor(
+            None, server.wait_for_subscriptions, channels * 2
+        )
+        if not subscribed:
+            raise SystemExit("El servidor simulado no recibió las suscripciones")
+        subscribe_time = time.perf_counter() - started
+
+        to_callback = []
+        to_notification = []
+        for _ in range(rounds):
+            # Every channel starts offline, so each event is a new stream
+            console.registry = new_registry(user_ids)
+            callback_at.clear()
+            timing.notified_at.clear()
+            sent = {}
+            # Keep the per-event console lines out of the report
+            with contextlib.redirect_stdout(devnull):
+                for user_id in user_ids:
+                    sent[user_id] = server.trigger("stream.online", user_id)
+                    # Pace events so the figure is latency, not a backlog
+                    await asyncio.sleep(1 / rate if rate else 0)
+                deadline = time.monotonic() + coalesce_seconds + 10
+                while (len(timing.notified_at) < channels
+                       and time.monotonic() < deadline):
+                    await asyncio.sleep(0.01)
+            for user_id, sent_at in sent.items():
+                if user_id in callback_at:
+                    to_callback.append((callback_at[user_id] - sent_at) * 1000)
+                notified_at = timing.notified_at.get(f"user{user_id}")
+                if notified_at is not None:
+                    to_notification.append((notified_at - sent_at) * 1000)
+
+        session.cancel()
+        console.notifier.close()
+        twitch_client.close()
+
+    print(f"Canales: {channels}, suscripciones: {channels * 2} "
+          f"en {subscribe_time:.2f} s")
+    print(f"Eventos: {channels * rounds}, notificados: {len(to_notification)}, "
+          f"ventana de agrupación {coalesce_seconds:.1f} s")
+    print(describe("evento -> callback", to_callback))
+    print(describe("evento -> notificación", to_notification))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, default=150)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--rate", type=float, default=500,
+                        help="eventos por segundo (0 = ráfaga)")
+    parser.add_argument("--coalesce", type=float, default=1.0,
+                        help="ventana de agrupación del dispatcher, en segundos")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as state_dir, \
+            open(os.devnull, "w") as devnull:
+        asyncio.run(run_benchmark(
+            args.channels, args.rounds, args.rate, args.coalesce,
+            os.path.join(state_dir, "state.jsonl"), devnull,
+        ))
+
+
+if __name__ == "__main__":
+    main()
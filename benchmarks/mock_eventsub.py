@@ -0,0 +1,252 @@
+"""
+Servidor EventSub simulado para pruebas locales.
+
+Expone un websocket con el protocolo de sesiones de Twitch (session_welcome,
+session_keepalive y notification) y un endpoint HTTP
+POST /eventsub/subscriptions para crear suscripciones. Corre en un hilo
+propio, así que se puede usar desde código síncrono o asyncio.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _message(message_type, payload, subscription_type=None):
+    metadata = {
+        "message_id": str(uuid.uuid4()),
+        "message_type": message_type,
+        "message_timestamp": _timestamp(),
+    }
+    if subscription_type:
+        metadata["subscription_type"] = subscription_type
+        metadata["subscription_version"] = "1"
+    return json.dumps({"metadata": metadata, "payload": payload})
+
+
+class MockEventSubServer:
+    """Simula el websocket de EventSub y la creación de suscripciones."""
+
+    def __init__(self, host="127.0.0.1", ws_port=0, http_port=0,
+                 keepalive_seconds=10, rejected_user_ids=()):
+        self.host = host
+        self.ws_port = ws_port
+        self.http_port = http_port
+        self.keepalive_seconds = keepalive_seconds
+        # Subscriptions for these channels are refused with 403
+        self.rejected_user_ids = set(rejected_user_ids)
+        # session_id -> websocket connection
+        self.sessions = {}
+        # (event_type, user_id) -> subscription dict
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+        self.loop = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._http_server = None
+        self._stop = None
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.ws_port}/ws"
+
+    @property
+    def api_url(self):
+        """URL base para usar como TWITCH_API_URL."""
+        return f"http://{self.host}:{self.http_port}/"
+
+    def start(self):
+        self._http_server = ThreadingHTTPServer(
+            (self.host, self.http_port), self._make_http_handler()
+        )
+        self.http_port = self._http_server.server_address[1]
+        threading.Thread(
+            target=self._http_server.serve_forever, daemon=True
+        ).start()
+
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join(timeout=5)
+        if self._http_server:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def wait_for_subscriptions(self, count, timeout=10):
+        """Espera hasta que existan `count` suscripciones."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                if len(self.subscriptions) >= count:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def trigger(self, event_type, user_id, login=None):
+        """
+        Envía un evento stream.online o stream.offline para un canal.
+
+        Devuelve el instante (time.perf_counter) en que se envió, o None si
+        no hay suscripción para ese canal.
+        """
+        with self.lock:
+            subscription = self.subscriptions.get((event_type, user_id))
+        if subscription is None:
+            return None
+
+        login = login or f"user{user_id}"
+        event = {
+            "broadcaster_user_id": user_id,
+            "broadcaster_user_login": login,
+            "broadcaster_user_name": login,
+        }
+        if event_type == "stream.online":
+            event.update(
+                id=str(uuid.uuid4()), type="live", started_at=_timestamp()
+            )
+        raw = _message(
+            "notification",
+            {"subscription": subscription, "event": event},
+            subscription_type=event_type,
+        )
+        websocket = self.sessions.get(subscription["transport"]["session_id"])
+        if websocket is None:
+            return None
+        sent_at = time.perf_counter()
+        asyncio.run_coroutine_threadsafe(websocket.send(raw), self.loop)
+        return sent_at
+
+    def revoke(self, event_type, user_id):
+        """Revoca una suscripción y avisa por su websocket."""
+        with self.lock:
+            subscription = self.subscriptions.pop((event_type, user_id), None)
+        if subscription is None:
+            return False
+        subscription = dict(subscription, status="authorization_revoked")
+        raw = _message("revocation", {"subscription": subscription},
+                       subscription_type=event_type)
+        websocket = self.sessions.get(subscription["transport"]["session_id"])
+        if websocket is None:
+            return False
+        asyncio.run_coroutine_threadsafe(websocket.send(raw), self.loop)
+        return True
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._serve())
+        self.loop.close()
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        async with serve(self._handle, self.host, self.ws_port) as server:
+            self.ws_port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    async def _handle(self, websocket):
+        session_id = str(uuid.uuid4())
+        self.sessions[session_id] = websocket
+        try:
+            await websocket.send(_message("session_welcome", {"session": {
+                "id": session_id,
+                "status": "connected",
+                "keepalive_timeout_seconds": self.keepalive_seconds,
+                "reconnect_url": None,
+                "connected_at": _timestamp(),
+            }}))
+            while True:
+                # Wake up as soon as the connection closes, so stop() does
+                # not wait out a keepalive period
+                try:
+                    await asyncio.wait_for(
+                        websocket.wait_closed(), self.keepalive_seconds
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    await websocket.send(_message("session_keepalive", {}))
+        except ConnectionClosed:
+            pass
+        finally:
+            self.sessions.pop(session_id, None)
+            with self.lock:
+                for key, subscription in list(self.subscriptions.items()):
+                    if subscription["transport"]["session_id"] == session_id:
+                        del self.subscriptions[key]
+
+    def _make_http_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/eventsub/subscriptions":
+                    self._reply(404, {"error": "Not Found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                session_id = body.get("transport", {}).get("session_id")
+                if session_id not in server.sessions:
+                    self._reply(400, {"error": "Bad Request",
+                                      "message": "unknown session_id"})
+                    return
+                user_id = body["condition"]["broadcaster_user_id"]
+                if user_id in server.rejected_user_ids:
+                    self._reply(403, {"error": "Forbidden", "status": 403,
+                                      "message": "subscription missing proper "
+                                                 "authorization"})
+                    return
+                subscription = {
+                    "id": str(uuid.uuid4()),
+                    "status": "enabled",
+                    "type": body["type"],
+                    "version": body.get("version", "1"),
+                    "condition": body["condition"],
+                    "transport": {"method": "websocket",
+                                  "session_id": session_id},
+                    "created_at": _timestamp(),
+                    "cost": 0,
+                }
+                key = (body["type"], user_id)
+                with server.lock:
+                    server.subscriptions[key] = subscription
+                self._reply(202, {"data": [subscription], "total": 1,
+                                  "total_cost": 0, "max_total_cost": 10})
+
+        return Handler
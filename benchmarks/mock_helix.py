@@ -0,0 +1,375 @@
+"""
+Servidor Helix simulado para pruebas locales y benchmarks.
+
+Atiende GET /users y GET /streams con N canales sintéticos: el canal i tiene
+login "channel<i>" e ID str(100000 + i). Permite configurar latencia, tasa de
+errores 5xx y un bucket de rate limit con las cabeceras Ratelimit-* de
+Twitch. También simula el servidor OAuth en /oauth2/ (client credentials y
+validate); con `require_auth` Helix responde 401 a tokens vencidos o
+desconocidos. Corre en un hilo propio y su URL se puede usar como
+TWITCH_API_URL (y `oauth_url` como TWITCH_OAUTH_URL); también se puede
+levantar solo:
+
+    python -m benchmarks.mock_helix --channels 5000 --port 8080
+"""
+
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+FIRST_USER_ID = 100000
+
+
+def synthetic_login(index):
+    return f"channel{index}"
+
+
+def synthetic_user_id(index):
+    return str(FIRST_USER_ID + index)
+
+
+class MockHelixServer:
+    """Simula los endpoints /users, /streams y /channels/followed de Helix."""
+
+    def __init__(self, channels=1000, live_ratio=0.1, latency=0.0,
+                 error_rate=0.0, rate_limit=None, host="127.0.0.1", port=0,
+                 seed=None, require_auth=False, token_lifetime=3600):
+        self.channels = channels
+        self.latency = latency
+        self.error_rate = error_rate
+        # Points per minute, like Helix's app-token bucket; None disables it
+        self.rate_limit = rate_limit
+        self.tokens = float(rate_limit or 0)
+        self.tokens_updated_at = time.monotonic()
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+        self.live_ids = {
+            synthetic_user_id(i) for i in range(channels)
+            if self.random.random() < live_ratio
+        }
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self.throttled_count = 0
+        self.unauthorized_count = 0
+        # Wall-clock time of the first /streams request, for startup timing
+        self.first_poll_at = None
+        # OAuth: issued token -> expiry time
+        self.require_auth = require_auth
+        self.token_lifetime = token_lifetime
+        self.access_tokens = {}
+        self.token_count = 0
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    @property
+    def oauth_url(self):
+        return f"{self.url}oauth2/"
+
+    def issue_token(self):
+        """Emite un token de app como lo haría client credentials."""
+        token = secrets.token_hex(15)
+        with self.lock:
+            self.access_tokens[token] = time.time() + self.token_lifetime
+            self.token_count += 1
+        return token
+
+    def revoke_tokens(self):
+        """Invalida todos los tokens emitidos, como una revocación."""
+        with self.lock:
+            self.access_tokens.clear()
+
+    def _token_expires_in(self, authorization, scheme):
+        """Segundos de vida del token de la cabecera, o None si no sirve."""
+        prefix = f"{scheme} "
+        if not authorization or not authorization.startswith(prefix):
+            return None
+        expires_at = self.access_tokens.get(authorization[len(prefix):])
+        if expires_at is None or expires_at <= time.time():
+            return None
+        return int(expires_at - time.time())
+
+    def logins(self):
+        return [synthetic_login(i) for i in range(self.channels)]
+
+    def user_ids(self):
+        return {
+            synthetic_login(i): synthetic_user_id(i) for i in range(self.channels)
+        }
+
+    def set_live(self, user_id, is_live):
+        with self.lock:
+            if is_live:
+                self.live_ids.add(user_id)
+            else:
+                self.live_ids.discard(user_id)
+
+    def churn(self, fraction):
+        """Cambia de estado una fracción de los canales al azar."""
+        count = int(self.channels * fraction)
+        with self.lock:
+            for index in self.random.sample(range(self.channels), count):
+                user_id = synthetic_user_id(index)
+                if user_id in self.live_ids:
+                    self.live_ids.discard(user_id)
+                else:
+                    self.live_ids.add(user_id)
+
+    def reset_counters(self):
+        with self.lock:
+            self.request_count = 0
+            self.error_count = 0
+            self.throttled_count = 0
+            self.unauthorized_count = 0
+            self.token_count = 0
+            self.first_poll_at = None
+
+    def start(self):
+        self._server = ThreadingHTTPServer(
+            (self.host, self.port), self._make_handler()
+        )
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _lookup_user(self, login):
+        if not login.startswith("channel"):
+            return None
+        try:
+            index = int(login[len("channel"):])
+        except ValueError:
+            return None
+        if 0 <= index < self.channels:
+            return {
+                "id": synthetic_user_id(index),
+                "login": login,
+                "display_name": login,
+            }
+        return None
+
+    def _stream(self, user_id):
+        index = int(user_id) - FIRST_USER_ID
+        login = synthetic_login(index)
+        return {
+            "id": f"9{user_id}",
+            "user_id": user_id,
+            "user_login": login,
+            "user_name": login,
+            "game_id": "509658",
+            "game_name": "Just Chatting",
+            "type": "live",
+            "title": f"Stream de {login}",
+            "viewer_count": 100 + index % 1000,
+            "started_at": "2024-01-01T00:00:00Z",
+        }
+
+    def _take_token(self):
+        """
+        Consume un punto del bucket y devuelve (permitido, cabeceras).
+        Debe llamarse con el lock tomado.
+        """
+        if not self.rate_limit:
+            return True, {}
+        now = time.monotonic()
+        refill = self.rate_limit / 60
+        self.tokens = min(
+            self.rate_limit,
+            self.tokens + (now - self.tokens_updated_at) * refill,
+        )
+        self.tokens_updated_at = now
+        allowed = self.tokens >= 1
+        if allowed:
+            self.tokens -= 1
+        seconds_to_full = (self.rate_limit - self.tokens) / refill
+        headers = {
+            "Ratelimit-Limit": str(self.rate_limit),
+            "Ratelimit-Remaining": str(int(self.tokens)),
+            "Ratelimit-Reset": str(int(time.time() + seconds_to_full) + 1),
+        }
+        return allowed, headers
+
+    def handle_post(self, path, params):
+        """Devuelve (status, headers, body) para una solicitud POST."""
+        if path == "/oauth2/token":
+            form = dict(params)
+            if (form.get("grant_type") != "client_credentials"
+                    or not form.get("client_id")
+                    or not form.get("client_secret")):
+                return 400, {}, {"status": 400, "message": "invalid client"}
+            return 200, {}, {
+                "access_token": self.issue_token(),
+                "expires_in": self.token_lifetime,
+                "token_type": "bearer",
+            }
+        return 404, {}, {"error": "Not Found", "status": 404}
+
+    def handle_get(self, path, params, request_headers=None):
+        """Devuelve (status, headers, body) para una solicitud GET."""
+        authorization = (request_headers or {}).get("Authorization")
+        if path == "/oauth2/validate":
+            with self.lock:
+                expires_in = self._token_expires_in(authorization, "OAuth")
+            if expires_in is None:
+                return 401, {}, {"status": 401,
+                                 "message": "invalid access token"}
+            return 200, {}, {"client_id": "mock-client", "scopes": [],
+                             "expires_in": expires_in}
+
+        with self.lock:
+            self.request_count += 1
+            if path == "/streams" and self.first_poll_at is None:
+                self.first_poll_at = time.time()
+            if self.require_auth and self._token_expires_in(
+                    authorization, "Bearer") is None:
+                self.unauthorized_count += 1
+                return 401, {}, {"error": "Unauthorized", "status": 401,
+                                 "message": "Invalid OAuth token"}
+            allowed, headers = self._take_token()
+            if not allowed:
+                self.throttled_count += 1
+                return 429, headers, {"error": "Too Many Requests",
+                                      "status": 429}
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.error_count += 1
+                return 503, headers, {"error": "Service Unavailable",
+                                      "status": 503}
+            live_ids = set(self.live_ids) if path == "/streams" else None
+
+        if path == "/users":
+            logins = [value for key, value in params if key == "login"]
+            users = [self._lookup_user(login.lower()) for login in logins[:100]]
+            return 200, headers, {"data": [user for user in users if user]}
+
+        if path == "/streams":
+            user_ids = [value for key, value in params if key == "user_id"]
+            if len(user_ids) > 100:
+                return 400, headers, {"error": "Bad Request", "status": 400}
+            first = int(dict(params).get("first", 20))
+            streams = [
+                self._stream(user_id) for user_id in user_ids
+                if user_id in live_ids
+            ]
+            return 200, headers, {"data": streams[:first], "pagination": {}}
+
+        if path == "/channels/followed":
+            # Every synthetic channel is followed, paged by offset cursors
+            query = dict(params)
+            if "user_id" not in query:
+                return 400, headers, {"error": "Bad Request", "status": 400}
+            first = min(int(query.get("first", 20)), 100)
+            offset = int(query.get("after") or 0)
+            end = min(offset + first, self.channels)
+            data = [
+                {
+                    "broadcaster_id": synthetic_user_id(index),
+                    "broadcaster_login": synthetic_login(index),
+                    "broadcaster_name": synthetic_login(index),
+                    "followed_at": "2024-01-01T00:00:00Z",
+                }
+                for index in range(offset, end)
+            ]
+            pagination = {"cursor": str(end)} if end < self.channels else {}
+            return 200, headers, {
+                "data": data, "total": self.channels, "pagination": pagination,
+            }
+
+        return 404, headers, {"error": "Not Found", "status": 404}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                parts = urlsplit(self.path)
+                self.respond(*server.handle_get(
+                    parts.path.rstrip("/"), parse_qsl(parts.query),
+                    self.headers,
+                ))
+
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                form = self.rfile.read(length).decode() if length else ""
+                self.respond(*server.handle_post(
+                    parts.path.rstrip("/"),
+                    parse_qsl(parts.query) + parse_qsl(form),
+                ))
+
+            def respond(self, status, headers, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor Helix simulado")
+    parser.add_argument("--channels", type=int, default=1000)
+    parser.add_argument("--live-ratio", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=800,
+                        help="puntos por minuto (0 = sin límite)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--require-auth", action="store_true",
+                        help="exigir tokens emitidos por /oauth2/token")
+    parser.add_argument("--token-lifetime", type=int, default=3600)
+    args = parser.parse_args()
+
+    server = MockHelixServer(
+        channels=args.channels,
+        live_ratio=args.live_ratio,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit or None,
+        port=args.port,
+        require_auth=args.require_auth,
+        token_lifetime=args.token_lifetime,
+    ).start()
+    print(f"Helix simulado en {server.url} con {args.channels} canales "
+          f"(channel0 ... channel{args.channels - 1}). Ctrl+C para salir.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
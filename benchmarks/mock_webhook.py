@@ -0,0 +1,150 @@
+"""
+Receptor de webhooks simulado para pruebas locales.
+
+Acepta POST con JSON como lo haría un endpoint propio o un webhook de
+Discord, y puede agregar latencia, responder 503 al azar o limitar la tasa
+con 429 y Retry-After. Cuenta los canales recibidos, tanto en el formato de
+WebhookSink ("channels") como en el de DiscordSink (una línea por canal en
+"content").
+
+    python -m benchmarks.mock_webhook --port 8090 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockWebhookServer:
+    """Endpoint POST que registra lo recibido."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=0.05, host="127.0.0.1", port=0, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        # Fraction of requests answered with 429, like Discord's limits
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self.throttled_count = 0
+        self.received = 0
+        self.last_received_at = None
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/webhook"
+
+    def reset_counters(self):
+        with self.lock:
+            self.request_count = 0
+            self.error_count = 0
+            self.throttled_count = 0
+            self.received = 0
+            self.last_received_at = None
+
+    def start(self):
+        self._server = ThreadingHTTPServer(
+            (self.host, self.port), self._make_handler()
+        )
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @staticmethod
+    def count_channels(body):
+        if "channels" in body:
+            return len(body["channels"])
+        return len(body.get("content", "").splitlines())
+
+    def handle_post(self, body):
+        """Devuelve (status, headers, body) para un POST ya decodificado."""
+        with self.lock:
+            self.request_count += 1
+            roll = self.random.random()
+            if roll < self.throttle_rate:
+                self.throttled_count += 1
+                return 429, {"Retry-After": str(self.retry_after)}, {
+                    "message": "You are being rate limited.",
+                    "retry_after": self.retry_after,
+                }
+            if roll < self.throttle_rate + self.error_rate:
+                self.error_count += 1
+                return 503, {}, {"message": "Service Unavailable"}
+            self.received += self.count_channels(body)
+            self.last_received_at = time.monotonic()
+        return 204, {}, None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) if length else b"{}"
+                if server.latency:
+                    time.sleep(server.latency)
+                status, headers, body = server.handle_post(json.loads(raw))
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receptor de webhooks simulado")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    server = MockWebhookServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        port=args.port,
+    )
+    server.start()
+    print(f"Webhook simulado en {server.url}. Ctrl+C para salir.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Benchmark de carga de los bucles de sondeo contra el servidor Helix simulado.
+
+Ejecuta check_channels_and_notify (consola) y
+TwitchMonitorThread.check_channels (GUI) con N canales sintéticos y reporta
+latencia p50/p99 por tick, solicitudes por tick y memoria por canal.
+
+    python -m benchmarks.polling_load --channels 5000 --ticks 20
+"""
+
+import argparse
+import contextlib
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.twitch_client import RateLimiter
+
+from .mock_helix import MockHelixServer
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+class CountingNotifier:
+    """Reemplaza las notificaciones de escritorio durante el benchmark."""
+
+    def __init__(self):
+        self.sent = 0
+
+    def notify_live(self, channel_name):
+        self.sent += 1
+
+    def notify_live_many(self, channel_names):
+        self.sent += len(channel_names)
+
+    def close(self, timeout=None):
+        pass
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def src_memory(snapshot_before, snapshot_after):
+    """
+    Bytes retenidos entre dos snapshots por asignaciones hechas desde src/,
+    incluidas las que ocurren en la biblioteca estándar a pedido de src/.
+    """
+    source_filter = [
+        tracemalloc.Filter(True, os.path.join(SRC_DIR, "*"), all_frames=True)
+    ]
+    before = snapshot_before.filter_traces(source_filter)
+    after = snapshot_after.filter_traces(source_filter)
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def unlimited_rate(twitch_client, args):
+    """
+    Sin --rate-limit el servidor no limita, así que tampoco se limita el
+    cliente: interesa medir el sondeo, no la espera del token bucket.
+    """
+    if not args.rate_limit:
+        twitch_client.rate_limiter = RateLimiter(capacity=10**9)
+
+
+def run_ticks(server, check, ticks, churn):
+    latencies = []
+    requests_per_tick = []
+    for _ in range(ticks):
+        server.churn(churn)
+        before = server.request_count
+        started = time.perf_counter()
+        check()
+        latencies.append((time.perf_counter() - started) * 1000)
+        requests_per_tick.append(server.request_count - before)
+    return latencies, requests_per_tick
+
+
+def report(name, channels, latencies, requests_per_tick, memory, events,
+           events_label):
+    print(f"\n{name}")
+    print(f"  tick p50 {statistics.median(latencies):.1f} ms, "
+          f"p99 {percentile(latencies, 0.99):.1f} ms, "
+          f"máx {max(latencies):.1f} ms")
+    print(f"  solicitudes por tick: {statistics.mean(requests_per_tick):.1f}")
+    print(f"  memoria por canal: {memory / channels:.0f} bytes")
+    print(f"  {events_label}: {events}")
+
+
+def bench_console(server, args, devnull):
+    os.environ["CHANNELS_TO_CHECK"] = ",".join(server.logins())
+    # Import dependencies first so only channel state is traced
+    for module in ("src.main", "src.twitch_client", "src.notifications",
+                   "src.user_cache", "src.state_journal"):
+        importlib.import_module(module)
+    tracemalloc.start(25)
+    before = tracemalloc.take_snapshot()
+    with contextlib.redirect_stdout(devnull):
+        main = importlib.import_module("src.main")
+        main.setup(main.Settings(), [CountingNotifier()])
+        main.notifier.close()
+        main.notifier = CountingNotifier()
+        unlimited_rate(main.twitch_client, args)
+        main.check_channels_and_notify()
+    memory = src_memory(before, tracemalloc.take_snapshot())
+    tracemalloc.stop()
+
+    with contextlib.redirect_stdout(devnull):
+        latencies, requests_per_tick = run_ticks(
+            server, main.check_channels_and_notify, args.ticks, args.churn
+        )
+    main.twitch_client.close()
+    report("Consola: check_channels_and_notify", args.channels, latencies,
+           requests_per_tick, memory, main.notifier.sent, "notificaciones")
+
+
+def bench_gui(server, args, devnull):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, SRC_DIR)
+    from PyQt6.QtCore import QCoreApplication
+
+    from twitch_client import TwitchClient
+    from ui.main_window import TwitchMonitorThread
+    from user_cache import UserIdCache
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    changes = [0]
+
+    tracemalloc.start(25)
+    before = tracemalloc.take_snapshot()
+    twitch_client = TwitchClient("mock-client", "mock-token")
+    unlimited_rate(twitch_client, args)
+    user_id_cache = UserIdCache(os.environ["USER_ID_CACHE_PATH"])
+    monitor = TwitchMonitorThread(twitch_client, interval_minutes=5)
+    monitor.add_channels(user_id_cache.resolve(server.logins(), twitch_client))
+    monitor.channels_status_changed.connect(
+        lambda batch: changes.__setitem__(0, changes[0] + len(batch))
+    )
+    monitor.check_channels()
+    memory = src_memory(before, tracemalloc.take_snapshot())
+    tracemalloc.stop()
+
+    with contextlib.redirect_stdout(devnull):
+        latencies, requests_per_tick = run_ticks(
+            server, monitor.check_channels, args.ticks, args.churn
+        )
+    twitch_client.close()
+    app.processEvents()
+    report("GUI: TwitchMonitorThread.check_channels", args.channels,
+           latencies, requests_per_tick, memory, changes[0],
+           "cambios de estado emitidos")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="latencia simulada por solicitud, en segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="puntos por minuto del servidor (0 = sin límite)")
+    parser.add_argument("--churn", type=float, default=0.01,
+                        help="fracción de canales que cambia de estado por tick")
+    parser.add_argument("--target", choices=["console", "gui", "both"],
+                        default="both")
+    args = parser.parse_args()
+
+    server = MockHelixServer(
+        channels=args.channels,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit or None,
+        seed=1,
+    )
+    with server, tempfile.TemporaryDirectory() as cache_dir, \
+            open(os.devnull, "w") as devnull:
+        os.environ["TWITCH_API_URL"] = server.url
+        os.environ["TWITCH_OAUTH_URL"] = server.oauth_url
+        os.environ.setdefault("CLIENT_SECRET", "mock-secret")
+        os.environ["USER_ID_CACHE_PATH"] = os.path.join(cache_dir, "ids.json")
+        os.environ["STATE_PATH"] = os.path.join(cache_dir, "state.jsonl")
+        os.environ.setdefault("CLIENT_ID", "mock-client")
+        os.environ.setdefault("ACCESS_TOKEN", "mock-token")
+        print(f"{args.channels} canales, {args.ticks} ticks, "
+              f"latencia {args.latency * 1000:.0f} ms, "
+              f"errores {args.error_rate:.0%}, churn {args.churn:.0%}")
+
+        if args.target in ("console", "both"):
+            bench_console(server, args, devnull)
+        if args.target in ("gui", "both"):
+            bench_gui(server, args, devnull)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Mide canales consultados por segundo del modo por procesos según la cantidad
+de workers, contra el servidor Helix simulado.
+
+    python -m benchmarks.sharded_throughput --channels 20000 --workers 1 2 4 8
+"""
+
+import argparse
+import time
+
+from src.sharded import ShardCoordinator
+
+from .mock_helix import MockHelixServer
+
+
+def run_once(server, workers, ticks):
+    checked = [0]
+    transitions = [0]
+
+    def on_tick(shard_index, count, elapsed):
+        checked[0] += count
+
+    def on_transition(channel, is_live, stream):
+        transitions[0] += 1
+
+    coordinator = ShardCoordinator(
+        server.user_ids(),
+        "mock-client",
+        "mock-token",
+        workers=workers,
+        interval_minutes=0,
+        on_transition=on_transition,
+        on_tick=on_tick,
+        base_url=server.url,
+    )
+    server.reset_counters()
+    started = time.perf_counter()
+    coordinator.run(max_ticks=ticks)
+    elapsed = time.perf_counter() - started
+    return checked[0], server.request_count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="latencia simulada por solicitud, en segundos")
+    args = parser.parse_args()
+
+    with MockHelixServer(channels=args.channels, latency=args.latency) as server:
+        print(f"{args.channels} canales, {args.ticks} tick(s) por worker, "
+              f"latencia simulada {args.latency * 1000:.0f} ms")
+        print(f"{'workers':>8} {'canales/s':>12} {'solicitudes':>12} "
+              f"{'tiempo (s)':>11}")
+        for workers in args.workers:
+            checked, requests_made, elapsed = run_once(
+                server, workers, args.ticks
+            )
+            print(f"{workers:>8} {checked / elapsed:>12.0f} "
+                  f"{requests_made:>12} {elapsed:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Throughput de FanOutSink contra receptores de webhooks simulados.
+
+Envía lotes de canales en vivo a tres destinos a la vez: un webhook rápido,
+uno lento y uno tipo Discord que a veces responde 503 o 429. Reporta
+cuánto tarda en volver notify_live_many() (debería ser casi nada) y cuántos
+eventos por segundo recibe cada destino, para cada cantidad de hilos por
+sink. El webhook rápido no debería frenarse por culpa del lento.
+
+    python -m benchmarks.sink_fanout --events 5000 --workers 1,4,8
+"""
+
+import argparse
+import time
+
+from src.sinks import DiscordSink, FanOutSink, WebhookSink
+
+from .mock_webhook import MockWebhookServer
+
+
+def run(servers, args, workers):
+    for server in servers.values():
+        server.reset_counters()
+    sinks = [
+        WebhookSink(servers["rápido"].url, pool_size=workers),
+        WebhookSink(servers["lento"].url, pool_size=workers),
+        DiscordSink(servers["discord"].url, pool_size=workers),
+    ]
+    fan_out = FanOutSink(
+        sinks, http_workers=workers, retry_base_delay=0.05, max_retries=5
+    )
+    names = [f"channel{i}" for i in range(args.batch)]
+
+    started = time.monotonic()
+    submit_time = 0.0
+    for _ in range(args.events // args.batch):
+        submit_started = time.perf_counter()
+        fan_out.notify_live_many(names)
+        submit_time += time.perf_counter() - submit_started
+    fan_out.close(timeout=args.timeout)
+
+    batches = args.events // args.batch
+    print(f"\n{workers} hilo(s) por sink: notify_live_many "
+          f"{submit_time / batches * 1e6:.0f} µs por lote")
+    for label, server in servers.items():
+        elapsed = (server.last_received_at or started) - started
+        rate = server.received / elapsed if elapsed else 0.0
+        print(f"  {label:8} {server.received:6} eventos en {elapsed:5.2f} s "
+              f"({rate:7.0f} ev/s), {server.request_count} solicitudes, "
+              f"{server.error_count} 503, {server.throttled_count} 429")
+    for worker in fan_out.workers:
+        if worker.failed or worker.dropped:
+            print(f"  {worker.name}: {worker.failed} fallidos, "
+                  f"{worker.dropped} lotes descartados")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000,
+                        help="canales en vivo a notificar en total")
+    parser.add_argument("--batch", type=int, default=10,
+                        help="canales por lote")
+    parser.add_argument("--workers", default="1,4",
+                        help="hilos por sink HTTP, separados por coma")
+    parser.add_argument("--slow-latency", type=float, default=0.02,
+                        help="latencia del webhook lento, en segundos")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    servers = {
+        "rápido": MockWebhookServer(seed=1),
+        "lento": MockWebhookServer(latency=args.slow_latency, seed=2),
+        "discord": MockWebhookServer(error_rate=0.05, throttle_rate=0.05,
+                                     seed=3),
+    }
+    for server in servers.values():
+        server.start()
+    print(f"{args.events} eventos en lotes de {args.batch}, webhook lento "
+          f"con {args.slow_latency * 1000:.0f} ms")
+    try:
+        for workers in (int(value) for value in args.workers.split(",")):
+            run(servers, args, workers)
+    finally:
+        for server in servers.values():
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Prueba de renovación de tokens contra el servidor OAuth simulado.
+
+Varios hilos consultan Helix con un TwitchClient compartido mientras los
+tokens vencen cada pocos segundos y, a mitad de la prueba, se revocan todos.
+Reporta consultas fallidas, respuestas 401 y tokens pedidos: con la
+renovación single-flight deberían pedirse unos pocos, no uno por hilo.
+
+    python -m benchmarks.token_refresh --threads 16 --seconds 10
+"""
+
+import argparse
+import os
+import threading
+import time
+
+from src.twitch_client import RateLimiter, TwitchClient
+
+from .mock_helix import MockHelixServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--channels", type=int, default=500)
+    parser.add_argument("--token-lifetime", type=int, default=3,
+                        help="vida de cada token emitido, en segundos")
+    args = parser.parse_args()
+
+    server = MockHelixServer(
+        channels=args.channels,
+        require_auth=True,
+        token_lifetime=args.token_lifetime,
+        seed=1,
+    )
+    with server:
+        os.environ["TWITCH_API_URL"] = server.url
+        os.environ["TWITCH_OAUTH_URL"] = server.oauth_url
+        twitch_client = TwitchClient(
+            "mock-client", None, client_secret="mock-secret",
+            pool_size=args.threads,
+        )
+        twitch_client.rate_limiter = RateLimiter(capacity=10**9)
+        validated = twitch_client.token_manager.validate()
+
+        user_ids = list(server.user_ids().values())
+        deadline = time.monotonic() + args.seconds
+        polls = [0]
+        failures = [0]
+        lock = threading.Lock()
+
+        def poll():
+            while time.monotonic() < deadline:
+                ok = twitch_client.get_live_streams(user_ids) is not None
+                with lock:
+                    polls[0] += 1
+                    failures[0] += not ok
+
+        threads = [threading.Thread(target=poll) for _ in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds / 2)
+        server.revoke_tokens()
+        for thread in threads:
+            thread.join()
+        twitch_client.close()
+
+    print(f"{args.threads} hilos, {args.seconds:.0f} s, tokens de "
+          f"{args.token_lifetime} s, revocación a mitad de la prueba")
+    print(f"  validación inicial: {validated}")
+    print(f"  consultas: {polls[0]}, fallidas: {failures[0]}")
+    print(f"  respuestas 401: {server.unauthorized_count}")
+    print(f"  tokens pedidos: {server.token_count}")
+
+
+if __name__ == "__main__":
+    main()
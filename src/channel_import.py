@@ -0,0 +1,26 @@
+def unique_logins(logins):
+    """Quita logins vacíos y repetidos (sin distinguir mayúsculas)."""
+    seen = set()
+    unique = []
+    for login in logins:
+        login = login.strip()
+        key = login.lower()
+        if login and key not in seen:
+            seen.add(key)
+            unique.append(login)
+    return unique
+
+
+def read_channel_file(path):
+    """
+    Lee los logins de un archivo de texto.
+
+    Acepta uno por línea o varios separados por coma; las líneas vacías y
+    lo que sigue a un # se ignoran. Devuelve los logins sin repetidos, en
+    el orden del archivo.
+    """
+    logins = []
+    with open(path, encoding="utf-8") as channel_file:
+        for line in channel_file:
+            logins.extend(line.split("#", 1)[0].split(","))
+    return unique_logins(logins)
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import random
+
+import websockets
+from websockets.asyncio.client import connect
+
+EVENTSUB_WS_URL = "wss://eventsub.wss.twitch.tv/ws"
+# Twitch allows 300 enabled subscriptions per websocket session and each
+# channel needs two of them (stream.online and stream.offline)
+MAX_SUBSCRIPTIONS_PER_SESSION = 300
+CHANNELS_PER_SESSION = MAX_SUBSCRIPTIONS_PER_SESSION // 2
+# Twitch allows at most 3 websocket sessions per client and user token
+MAX_SESSIONS = 3
+SUBSCRIPTION_TYPES = ("stream.online", "stream.offline")
+
+
+def split_for_sessions(user_ids, max_sessions=MAX_SESSIONS):
+    """
+    Reparte los IDs en grupos que caben en una sesión de websocket.
+
+    Devuelve (grupos, sobrantes): los sobrantes no caben en ninguna sesión
+    y hay que revisarlos por sondeo.
+    """
+    user_ids = list(user_ids)
+    groups = [
+        user_ids[i:i + CHANNELS_PER_SESSION]
+        for i in range(0, len(user_ids), CHANNELS_PER_SESSION)
+    ]
+    covered = groups[:max_sessions]
+    leftover = [user_id for group in groups[max_sessions:] for user_id in group]
+    return covered, leftover
+
+
+class EventSubClient:
+    """
+    Cliente de EventSub por websocket para stream.online/stream.offline.
+
+    Mantiene una sesión por llamada a run(), crea las suscripciones cuando
+    Twitch envía session_welcome y entrega cada evento a los callbacks
+    on_online(user_id, event) y on_offline(user_id, event). Si se pierde la
+    conexión o vence el keepalive, reconecta con backoff y vuelve a
+    suscribirse.
+
+    `unsubscribed` tiene los canales que hoy no reciben eventos: suscripción
+    rechazada o revocada, o sesión caída hasta que se vuelva a suscribir.
+    Esos canales hay que revisarlos por sondeo.
+    """
+
+    def __init__(self, async_twitch_client, on_online, on_offline,
+                 ws_url=EVENTSUB_WS_URL, max_backoff=60.0):
+        self.client = async_twitch_client
+        self.on_online = on_online
+        self.on_offline = on_offline
+        self.ws_url = ws_url
+        self.max_backoff = max_backoff
+        self.unsubscribed = set()
+
+    async def run(self, user_ids):
+        """Mantiene la sesión abierta indefinidamente."""
+        url = self.ws_url
+        needs_subscribe = True
+        attempt = 0
+        while True:
+            try:
+                async with connect(url) as websocket:
+                    session = await self._wait_for_welcome(websocket)
+                    attempt = 0
+                    if needs_subscribe:
+                        failed = await self._subscribe(session["id"], user_ids)
+                        self.unsubscribed.difference_update(user_ids)
+                        self.unsubscribed.update(failed)
+                    keepalive = session.get("keepalive_timeout_seconds") or 10
+                    reconnect_url = await self._listen(websocket, keepalive)
+
+                # Subscriptions carry over to a session_reconnect URL only
+                needs_subscribe = reconnect_url is None
+                url = reconnect_url or self.ws_url
+            except (OSError, asyncio.TimeoutError,
+                    websockets.exceptions.WebSocketException) as e:
+                delay = random.uniform(0, min(self.max_backoff, 2 ** attempt))
+                print(f"EventSub desconectado ({e}); reintentando en "
+                      f"{delay:.1f} s")
+                attempt += 1
+                needs_subscribe = True
+                # Events are lost until the new session subscribes again
+                self.unsubscribed.update(user_ids)
+                url = self.ws_url
+                await asyncio.sleep(delay)
+
+    async def _wait_for_welcome(self, websocket, timeout=10):
+        while True:
+            raw = await asyncio.wait_for(websocket.recv(), timeout)
+            message = json.loads(raw)
+            if message["metadata"]["message_type"] == "session_welcome":
+                return message["payload"]["session"]
+
+    async def _subscribe(self, session_id, user_ids):
+        """
+        Crea las suscripciones de todos los canales en paralelo.
+
+        Devuelve los IDs de los canales con alguna suscripción fallida.
+        """
+        subscriptions = [
+            (user_id, event_type)
+            for user_id in user_ids
+            for event_type in SUBSCRIPTION_TYPES
+        ]
+        results = await asyncio.gather(*(
+            self.client.create_eventsub_subscription(
+                event_type, user_id, session_id
+            )
+            for user_id, event_type in subscriptions
+        ))
+        failed = {
+            user_id
+            for (user_id, _), result in zip(subscriptions, results)
+            if result is None
+        }
+        created = sum(1 for result in results if result is not None)
+        print(f"EventSub: {created} suscripción(es) creadas, "
+              f"{len(results) - created} fallida(s)")
+        return failed
+
+    async def _listen(self, websocket, keepalive_seconds):
+        """
+        Procesa mensajes hasta que Twitch pida reconectar.
+
+        Devuelve la URL de reconexión. Si pasa más del keepalive sin
+        mensajes, la conexión se da por perdida y se lanza TimeoutError.
+        """
+        # Small margin over the keepalive window to absorb network jitter
+        timeout = keepalive_seconds * 1.5
+        while True:
+            raw = await asyncio.wait_for(websocket.recv(), timeout)
+            message = json.loads(raw)
+            message_type = message["metadata"]["message_type"]
+
+            if message_type == "notification":
+                self._dispatch(message)
+            elif message_type == "session_reconnect":
+                return message["payload"]["session"]["reconnect_url"]
+            elif message_type == "revocation":
+                subscription = message["payload"]["subscription"]
+                print(f"EventSub: suscripción revocada ({subscription['type']}, "
+                      f"{subscription['status']})")
+                user_id = subscription["condition"].get("broadcaster_user_id")
+                if user_id:
+                    self.unsubscribed.add(user_id)
+
+    def _dispatch(self, message):
+        subscription_type = message["metadata"].get("subscription_type")
+        event = message["payload"]["event"]
+        user_id = event["broadcaster_user_id"]
+        if subscription_type == "stream.online":
+            self.on_online(user_id, event)
+        elif subscription_type == "stream.offline":
+            self.on_offline(user_id, event)
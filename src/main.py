@@ -1,20 +1,23 @@
+import argparse
+import asyncio
+import contextlib
+import importlib.util
 import os
 import platform
-from dotenv import load_dotenv
+import sys
+import time
 
-from .twitch_client import TwitchClient
-from .notifications import Notifier
-from .scheduler import TaskScheduler
-
-# loads environment variables
-load_dotenv()
-
-CLIENT_ID = os.getenv("CLIENT_ID")
-ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
-CHANNELS_TO_CHECK = os.getenv("CHANNELS_TO_CHECK", "").split(",")
-INTERVAL_MINUTES = int(os.getenv("INTERVAL_MINUTES", default=5))
-
-CHANNELS_TO_CHECK = [channel.strip() for channel in CHANNELS_TO_CHECK if channel.strip()]
+from .twitch_client import TwitchClient, AsyncTwitchClient
+from .notifications import Notifier, NotificationDispatcher
+from .registry import ChannelRegistry, EVENT_LIVE, describe_event
+from .user_cache import UserIdCache, default_cache_dir
+from .state_journal import StateJournal
+from .channel_import import read_channel_file, unique_logins
+from .metrics import Metrics, TickProfiler, start_metrics_server
+from .sinks import (
+    SINK_KINDS, StdoutSink, FileSink, WebhookSink, DiscordSink, HttpSink,
+    FanOutSink,
+)
 
 SCRIPT_DIR = os.path.dirname(__file__)
 ASSETS_DIR = os.path.join(SCRIPT_DIR, "..", "assets")
@@ -23,70 +26,615 @@ ICON_EXTENSION = "png" if platform.system() != "Windows" else "ico"
 ICON_PATH = os.path.join(ASSETS_DIR, f"twitch.{ICON_EXTENSION}") 
 SOUND_PATH = os.path.join(ASSETS_DIR, "alert.wav")
 
-twitch_client = TwitchClient(CLIENT_ID, ACCESS_TOKEN)
-notifier = Notifier(ICON_PATH, SOUND_PATH)
-
-# saves the previous state of each channel
-channels_state = {}
-# saves the ID of each channel
-channels_user_ids = {}
-
-# Init channels data
-for channel in CHANNELS_TO_CHECK:
-    user_id = twitch_client.get_user_id(channel)
-    if user_id:
-        channels_user_ids[channel] = user_id
-        channels_state[channel] = False  # Inicialmente offline
-        print(f"Canal '{channel}' configurado correctamente (ID: {user_id})")
+
+class Settings:
+    """Configuración de la app, leída del entorno (y del archivo .env)."""
+
+    def __init__(self):
+        self.client_id = os.getenv("CLIENT_ID")
+        self.access_token = os.getenv("ACCESS_TOKEN")
+        # With a client secret app tokens are requested and renewed
+        # automatically
+        self.client_secret = os.getenv("CLIENT_SECRET")
+        self.channels = unique_logins(
+            os.getenv("CHANNELS_TO_CHECK", "").split(",")
+        )
+        # Bulk import: a file with one login per line, and/or every channel
+        # followed by a Twitch user (needs a user token)
+        self.channels_file = os.getenv("CHANNELS_FILE")
+        self.followed_by = os.getenv("FOLLOWED_BY")
+        self.interval_minutes = int(os.getenv("INTERVAL_MINUTES", "5"))
+        # "schedule" (default), "async", "adaptive", "sharded" or "eventsub"
+        self.scheduler_mode = (
+            os.getenv("SCHEDULER_MODE", "schedule").strip().lower()
+        )
+        self.max_concurrent_requests = int(
+            os.getenv("MAX_CONCURRENT_REQUESTS", "10")
+        )
+        self.user_id_cache_path = os.getenv("USER_ID_CACHE_PATH")
+        self.user_id_cache_ttl_hours = float(
+            os.getenv("USER_ID_CACHE_TTL_HOURS", "168")
+        )
+        self.state_path = os.getenv("STATE_PATH") or os.path.join(
+            default_cache_dir(), StateJournal.FILENAME
+        )
+        # Sharded mode: worker processes sharing the rate limit
+        self.shard_workers = int(os.getenv("SHARD_WORKERS", "4"))
+        # Adaptive mode: per-channel intervals and a global request budget
+        self.adaptive_min_interval_minutes = float(
+            os.getenv("ADAPTIVE_MIN_INTERVAL_MINUTES", "1")
+        )
+        self.adaptive_max_interval_minutes = float(
+            os.getenv("ADAPTIVE_MAX_INTERVAL_MINUTES", "30")
+        )
+        self.adaptive_requests_per_minute = int(
+            os.getenv("ADAPTIVE_REQUESTS_PER_MINUTE", "30")
+        )
+        self.eventsub_ws_url = os.getenv(
+            "EVENTSUB_WS_URL", "wss://eventsub.wss.twitch.tv/ws"
+        )
+        # In eventsub mode polling only reconciles missed events
+        self.reconcile_interval_minutes = float(
+            os.getenv("RECONCILE_INTERVAL_MINUTES", "30")
+        )
+        # Prometheus text endpoint on this port; unset or 0 keeps it off
+        self.metrics_port = int(os.getenv("METRICS_PORT") or 0)
+        # "cpu" (cProfile) or "memory" (tracemalloc) to profile every tick
+        self.profile_ticks = os.getenv("PROFILE_TICKS")
+        self.profile_dir = os.getenv("PROFILE_DIR")
+        # Where notifications go, comma separated: desktop, stdout, file,
+        # webhook and/or discord
+        self.notify_sinks = parse_sink_list(
+            os.getenv("NOTIFY_SINK", "desktop")
+        )
+        self.notify_file = os.getenv("NOTIFY_FILE")
+        self.notify_webhook_url = os.getenv("NOTIFY_WEBHOOK_URL")
+        self.discord_webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+        # Concurrent deliveries per HTTP sink and retries per batch
+        self.notify_http_workers = int(os.getenv("NOTIFY_HTTP_WORKERS", "4"))
+        self.notify_max_retries = int(os.getenv("NOTIFY_MAX_RETRIES", "3"))
+
+
+def parse_sink_list(value):
+    """Lista de destinos sin repetidos, a partir de "stdout,webhook"."""
+    kinds = [kind.strip().lower() for kind in value.split(",")]
+    return list(dict.fromkeys(kind for kind in kinds if kind))
+
+
+# Everything below is created by setup() when the app starts, so importing
+# this module (as multiprocessing does in spawned workers) has no side
+# effects
+settings = None
+metrics = None
+profiler = None
+twitch_client = None
+async_twitch_client = None
+notifier = None
+user_id_cache = None
+state_journal = None
+# state of every channel, indexed by login and by user ID
+registry = None
+# channels that went live since the last flush_notifications()
+live_to_notify = []
+
+
+def create_sinks(kinds):
+    """
+    Crea los destinos de las notificaciones según NOTIFY_SINK.
+
+    Devuelve None si alguno es desconocido o le falta configuración.
+    """
+    sinks = []
+    for kind in kinds:
+        if kind not in SINK_KINDS:
+            print(f"Error: destino de notificaciones desconocido '{kind}' "
+                  f"(opciones: {', '.join(SINK_KINDS)}).")
+            return None
+        sink = create_sink(kind)
+        if sink is None:
+            return None
+        sinks.append(sink)
+    return sinks
+
+
+def create_sink(kind):
+    """Crea un destino, o devuelve None si le falta configuración."""
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "file":
+        if not settings.notify_file:
+            print("Error: NOTIFY_SINK=file requiere NOTIFY_FILE.")
+            return None
+        return FileSink(settings.notify_file)
+    if kind == "webhook":
+        if not settings.notify_webhook_url:
+            print("Error: NOTIFY_SINK=webhook requiere NOTIFY_WEBHOOK_URL.")
+            return None
+        return WebhookSink(
+            settings.notify_webhook_url,
+            pool_size=settings.notify_http_workers,
+        )
+    if kind == "discord":
+        if not settings.discord_webhook_url:
+            print("Error: NOTIFY_SINK=discord requiere DISCORD_WEBHOOK_URL.")
+            return None
+        return DiscordSink(
+            settings.discord_webhook_url,
+            pool_size=settings.notify_http_workers,
+        )
+    # Desktop notifications; notifypy is only imported on the first one
+    if importlib.util.find_spec("notifypy") is None:
+        print("notifypy no está instalado; las notificaciones se escriben "
+              "en stdout.")
+        return StdoutSink()
+    return Notifier(ICON_PATH, SOUND_PATH)
+
+
+def setup(app_settings, sinks):
+    """
+    Crea los clientes, el notificador y el registro de canales.
+
+    Resuelve los IDs de los canales (desde la caché si es posible) y
+    restaura su último estado conocido.
+    """
+    global settings, metrics, profiler, twitch_client, notifier
+    global user_id_cache, state_journal, registry
+
+    settings = app_settings
+    # Request, tick and queue statistics for the metrics endpoint
+    metrics = Metrics()
+    profiler = TickProfiler(settings.profile_ticks, settings.profile_dir)
+    twitch_client = TwitchClient(
+        settings.client_id, settings.access_token,
+        pool_size=settings.max_concurrent_requests,
+        client_secret=settings.client_secret, metrics=metrics,
+    )
+    # A single local sink is called directly; several sinks, or any HTTP
+    # one, go through a fan-out with its own delivery queue and retries
+    # per sink
+    if len(sinks) == 1 and not isinstance(sinks[0], HttpSink):
+        target = sinks[0]
     else:
-        print(f"Error: No se pudo obtener el ID del canal '{channel}'. Se omitirá.")
+        target = FanOutSink(
+            sinks,
+            http_workers=settings.notify_http_workers,
+            max_retries=settings.notify_max_retries,
+            metrics=metrics,
+        )
+        metrics.register_gauge(
+            "notification_sink_backlog", lambda: target.backlog
+        )
+    # Notifications are sent from a worker thread so they never stall polling
+    notifier = NotificationDispatcher(target)
+    metrics.register_gauge("notification_queue_depth", notifier.backlog)
+    metrics.register_gauge("notifications_dropped", lambda: notifier.dropped)
+    user_id_cache = UserIdCache(
+        settings.user_id_cache_path,
+        ttl_seconds=settings.user_id_cache_ttl_hours * 3600,
+    )
+    # Last known state of every channel, so a restart doesn't notify again
+    state_journal = StateJournal(settings.state_path)
+    registry = ChannelRegistry()
+
+    # A static token is checked before the first Helix call; with a client
+    # secret a rejected token is renewed on the first 401 instead, which
+    # saves a round trip at startup
+    if (not twitch_client.token_manager.can_refresh
+            and twitch_client.token_manager.validate() is False):
+        print("Error: ACCESS_TOKEN no es válido o venció. Configura "
+              "CLIENT_SECRET para obtener y renovar el token "
+              "automáticamente.")
+
+    add_configured_channels()
+    if settings.followed_by:
+        import_followed_channels(settings.followed_by)
+
+    restored = [record for record in registry if state_journal.restore(record)]
+    for record in restored:
+        registry.track(record)
+    if restored:
+        live_count = sum(1 for record in restored if record.is_live)
+        print(f"Estado restaurado de {len(restored)} canal(es), "
+              f"{live_count} en vivo.")
+
+
+def add_configured_channels():
+    """
+    Agrega los canales de CHANNELS_TO_CHECK y de CHANNELS_FILE.
+
+    Los IDs salen de la caché en disco y solo los logins desconocidos se
+    consultan, de a 100 por solicitud.
+    """
+    file_channels = []
+    if settings.channels_file:
+        try:
+            file_channels = read_channel_file(settings.channels_file)
+        except OSError as e:
+            print(f"Error: No se pudo leer CHANNELS_FILE: {e}")
+    channels = unique_logins(settings.channels + file_channels)
+
+    resolved_user_ids = user_id_cache.resolve(channels, twitch_client)
+    registry.add_many(resolved_user_ids)  # Inicialmente offline
+    # Imported lists can be long: only the env channels are listed one by one
+    for channel in settings.channels:
+        user_id = resolved_user_ids.get(channel)
+        if user_id:
+            print(f"Canal '{channel}' configurado correctamente (ID: {user_id})")
+    for channel in channels:
+        if channel not in resolved_user_ids:
+            print(f"Error: No se pudo obtener el ID del canal '{channel}'. "
+                  "Se omitirá.")
+    if file_channels:
+        imported = sum(1 for channel in file_channels
+                       if channel in resolved_user_ids)
+        print(f"{imported} de {len(file_channels)} canal(es) de "
+              f"{settings.channels_file} configurados.")
+
+
+def import_followed_channels(login):
+    """Agrega los canales que sigue `login`, procesando cada página al llegar."""
+    user_id = twitch_client.get_user_ids([login]).get(login)
+    if user_id is None:
+        print(f"Error: No se encontró el usuario '{login}' de FOLLOWED_BY.")
+        return
+    imported = 0
+    for page in twitch_client.iter_followed_channels(user_id):
+        registry.add_many(page)
+        user_id_cache.update(page)
+        imported += len(page)
+    if imported:
+        user_id_cache.save()
+    print(f"{imported} canal(es) seguidos por '{login}' configurados.")
+
+
+def shutdown():
+    """Envía las notificaciones pendientes y cierra las conexiones."""
+    if notifier is not None:
+        flush_notifications()
+        notifier.close()
+    if twitch_client is not None:
+        twitch_client.close()
+
+
+@contextlib.contextmanager
+def instrumented_tick(channel_count):
+    """Mide la duración de un tick de sondeo y lo perfila si se pidió."""
+    metrics.set_gauge("tick_channels", channel_count)
+    metrics.inc("ticks_total")
+    with profiler.tick(), metrics.time("tick_duration_seconds"):
+        yield
 
 
 def check_channels_and_notify():
     """Función que se ejecutará en el programador de tareas."""
-    global channels_state
+    if not registry:
+        print("Error: No hay canales válidos configurados. Deteniendo...")
+        return
+
+    with instrumented_tick(len(registry)):
+        # One request per 100 channels instead of one per channel
+        live_streams = twitch_client.get_live_streams(registry.user_ids())
+        process_live_streams(live_streams)
+
 
-    if not channels_user_ids:
+async def check_channels_and_notify_async(user_ids=None):
+    """
+    Variante asyncio: consulta los bloques de 100 canales en paralelo.
+
+    Con `user_ids` se revisan solo esos canales.
+    """
+    if not registry:
         print("Error: No hay canales válidos configurados. Deteniendo...")
         return
 
-    for channel, user_id in channels_user_ids.items():
-        is_live_now = twitch_client.is_channel_live(user_id)
-        was_live_before = channels_state.get(channel, False)
+    to_check = registry.user_ids() if user_ids is None else user_ids
+    with instrumented_tick(len(to_check)):
+        polled_at = time.time()
+        live_streams = await async_twitch_client.get_live_streams(to_check)
+        process_live_streams(live_streams, user_ids, polled_at=polled_at)
 
-        if is_live_now and not was_live_before:
-            print(f"¡{channel} acaba de empezar a transmitir!")
-            notifier.notify_live(channel)
-            channels_state[channel] = True
 
-        elif not is_live_now and was_live_before:
-            print(f"{channel} ya no está en vivo.")
-            channels_state[channel] = False
+def check_user_ids_and_notify(user_ids):
+    """
+    Consulta solo los canales indicados; la usa el programador adaptativo,
+    que decide qué canales revisar en cada tick.
+    """
+    with instrumented_tick(len(user_ids)):
+        live_streams = twitch_client.get_live_streams(user_ids)
+        process_live_streams(live_streams, user_ids)
+    return live_streams
 
-        elif is_live_now:
-            print(f"{channel} sigue en vivo.")
 
-        else:
-            print(f"{channel} sigue offline.")
+def process_live_streams(live_streams, user_ids=None, polled_at=None):
+    """
+    Compara el resultado de la consulta con el estado previo y notifica.
 
+    Solo se revisan los canales en vivo antes o ahora, y en lugar de una
+    línea por canal se muestra un resumen del tick. Si se indican
+    `user_ids`, solo se procesan esos canales. Con `polled_at`, los canales
+    actualizados después de esa hora (por un evento de EventSub llegado
+    mientras se esperaba la consulta) se dejan como están.
+    """
+    if live_streams is None:
+        registry.record_failure(user_ids)
+        metrics.inc("poll_errors_total")
+        print("No se pudo consultar Twitch; se mantiene el estado anterior.")
+        return
 
-def main():
-    """Punto de entrada de la aplicación."""
-    if not CHANNELS_TO_CHECK:
-        print("Error: No se han especificado canales para monitorear.")
-        print("Configura la variable de entorno CHANNELS_TO_CHECK con una lista separada por comas.")
+    registry.clear_failures(user_ids)
+    live_count = 0
+    changed = 0
+    for record, stream in registry.live_candidates(live_streams, user_ids):
+        if (polled_at is not None and record.last_checked_at is not None
+                and record.last_checked_at > polled_at):
+            # The push event is newer than this poll's result
+            continue
+        live_count += stream is not None
+        if update_record_status(record, stream is not None, stream):
+            changed += 1
+    checked = len(registry) if user_ids is None else len(user_ids)
+    print(f"{checked} canal(es) revisado(s): {live_count} en vivo, "
+          f"{changed} con cambios.")
+    # One journal write and one notification batch per tick
+    state_journal.flush()
+    flush_notifications()
+
+
+def update_record_status(record, is_live_now, stream=None):
+    """
+    Registra el estado de un canal e informa lo que cambió desde la
+    consulta anterior; solo se notifica cuando el canal empieza un stream.
+
+    Devuelve la lista de eventos, vacía si no cambió nada. Lo usan tanto el
+    sondeo como los eventos de EventSub y el modo por procesos.
+    """
+    events = registry.apply(record, is_live_now, stream)
+    for event in events:
+        report_stream_event(record, event)
+    if events:
+        state_journal.record(record)
+    return events
+
+
+def report_stream_event(record, event):
+    """
+    Muestra un evento de stream y, si el canal salió en vivo, lo anota para
+    la próxima flush_notifications().
+    """
+    print(describe_event(record, event))
+    # Restarts are the same broadcast coming back, already notified
+    if event.kind == EVENT_LIVE:
+        live_to_notify.append(record.login)
+
+
+def flush_notifications():
+    """Encola de una vez los canales que salieron en vivo desde la última."""
+    if live_to_notify:
+        notifier.notify_live_many(list(live_to_notify))
+        live_to_notify.clear()
+
+
+def update_channel_status(channel, is_live_now, stream=None):
+    """Igual que update_record_status, buscando el canal por login."""
+    record = registry.get(channel)
+    if record is None:
+        return []
+    return update_record_status(record, is_live_now, stream)
+
+
+def on_stream_online(user_id, event):
+    """Callback de EventSub para stream.online."""
+    record = registry.get_by_user_id(user_id)
+    if record is not None and update_record_status(record, True, event):
+        state_journal.flush()
+        flush_notifications()
+
+
+def on_stream_offline(user_id, event):
+    """Callback de EventSub para stream.offline."""
+    record = registry.get_by_user_id(user_id)
+    if record is not None and update_record_status(record, False):
+        state_journal.flush()
+
+
+def on_shard_tick(shard_index, checked, elapsed):
+    """Reporte de tick de un proceso del modo repartido."""
+    # Changes from all shards are written and notified once per tick report
+    state_journal.flush()
+    flush_notifications()
+    metrics.inc("ticks_total", shard=shard_index)
+    metrics.set_gauge("tick_channels", checked, shard=shard_index)
+    metrics.observe("tick_duration_seconds", elapsed, shard=shard_index)
+
+
+def run_sharded():
+    """
+    Modo por procesos: cada proceso consulta una parte de los canales y los
+    cambios de estado vuelven a este proceso, que es el único que notifica.
+    """
+    from .sharded import ShardCoordinator
+
+    coordinator = ShardCoordinator(
+        registry.user_ids_by_login(),
+        settings.client_id,
+        # Hand over the current token so workers don't request one each
+        twitch_client.access_token,
+        workers=settings.shard_workers,
+        interval_minutes=settings.interval_minutes,
+        on_transition=update_channel_status,
+        on_tick=on_shard_tick,
+        base_url=twitch_client.base_url,
+        client_secret=settings.client_secret,
+        # Restored live channels, so the shards report them going offline
+        snapshots={
+            record.user_id: record.snapshot()
+            for record in registry.live_records()
+        },
+    )
+    print(f"Monitoreo repartido en {len(coordinator.shards)} proceso(s).")
+    coordinator.run()
+
+
+def run_eventsub():
+    """
+    Modo push: recibe stream.online/stream.offline por EventSub y deja el
+    sondeo como reconciliación de baja frecuencia.
+
+    Los canales sin suscripción (fuera del límite de sesiones, rechazadas o
+    con la sesión caída) se siguen revisando cada INTERVAL_MINUTES.
+    """
+    from .eventsub import EventSubClient, split_for_sessions
+    from .scheduler import AsyncTaskScheduler
+
+    eventsub = EventSubClient(
+        async_twitch_client, on_stream_online, on_stream_offline,
+        ws_url=settings.eventsub_ws_url,
+    )
+    groups, leftover = split_for_sessions(registry.user_ids())
+    if leftover:
+        print(f"EventSub: {len(leftover)} canal(es) exceden el límite de "
+              "suscripciones y se revisarán por sondeo cada "
+              f"{settings.interval_minutes} minuto(s).")
+    leftover = set(leftover)
+
+    # Channels without EventSub events keep the normal interval; the ones
+    # with events only need the occasional reconcile
+    def poll(subscribed):
+        async def check():
+            not_covered = leftover | eventsub.unsubscribed
+            user_ids = [
+                user_id for user_id in registry.user_ids()
+                if (user_id not in not_covered) == subscribed
+            ]
+            if user_ids:
+                await check_channels_and_notify_async(user_ids)
+        return check
+
+    poller = AsyncTaskScheduler(interval_minutes=settings.interval_minutes)
+    poller.schedule_task(poll(subscribed=False))
+    reconciler = AsyncTaskScheduler(
+        interval_minutes=settings.reconcile_interval_minutes
+    )
+    reconciler.schedule_task(poll(subscribed=True))
+
+    async def run_all():
+        await asyncio.gather(
+            poller.run_forever(), reconciler.run_forever(),
+            *(eventsub.run(group) for group in groups),
+        )
+
+    asyncio.run(run_all())
+
+
+def run_monitor():
+    """Arranca el modo de monitoreo elegido en SCHEDULER_MODE."""
+    global async_twitch_client
+    # Not needed by --once runs, so not loaded before the first poll
+    from .scheduler import TaskScheduler, AsyncTaskScheduler, AdaptiveScheduler
+
+    mode = settings.scheduler_mode
+    if settings.metrics_port:
+        start_metrics_server(metrics, settings.metrics_port)
+        print(f"Métricas en http://127.0.0.1:{settings.metrics_port}/metrics")
+    if mode == "sharded":
+        run_sharded()
         return
-    
-    if not channels_user_ids:
-        print("Error: No se pudo obtener información de ningún canal. Verifica la configuración.")
+
+    if mode in ("async", "eventsub"):
+        async_twitch_client = AsyncTwitchClient(
+            twitch_client, max_concurrency=settings.max_concurrent_requests
+        )
+    if mode == "eventsub":
+        print("Monitoreo por EventSub iniciado. Presiona Ctrl+C para salir.")
+        run_eventsub()
         return
-    
-    print(f"Iniciando notificador para {len(channels_user_ids)} canal(es)...")
-    scheduler = TaskScheduler(interval_minutes=INTERVAL_MINUTES)
-    scheduler.schedule_task(check_channels_and_notify)
+
+    if mode == "async":
+        scheduler = AsyncTaskScheduler(
+            interval_minutes=settings.interval_minutes
+        )
+        scheduler.schedule_task(check_channels_and_notify_async)
+    elif mode == "adaptive":
+        scheduler = AdaptiveScheduler(
+            check_user_ids_and_notify,
+            base_interval_minutes=settings.interval_minutes,
+            min_interval_minutes=settings.adaptive_min_interval_minutes,
+            max_interval_minutes=settings.adaptive_max_interval_minutes,
+            requests_per_minute=settings.adaptive_requests_per_minute,
+        )
+        for user_id in registry.user_ids():
+            scheduler.add_channel(user_id)
+    else:
+        scheduler = TaskScheduler(interval_minutes=settings.interval_minutes)
+        scheduler.schedule_task(check_channels_and_notify)
     print("Monitoreo iniciado. Presiona Ctrl+C para salir.")
     scheduler.run_pending_tasks()
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.main",
+        description="Notificador de streams de Twitch en modo consola.",
+    )
+    parser.add_argument(
+        "--once", action="store_true",
+        help="consultar una sola vez y salir (para cron o contenedores)",
+    )
+    parser.add_argument(
+        "--sink",
+        help="destinos de las notificaciones separados por coma "
+             f"({', '.join(SINK_KINDS)}); por defecto NOTIFY_SINK o desktop",
+    )
+    return parser.parse_args(argv)
+
+
+def run(app_settings, sinks, once=False):
+    """Prepara la app con la configuración dada y monitorea los canales."""
+    if not (app_settings.channels or app_settings.channels_file
+            or app_settings.followed_by):
+        print("Error: No se han especificado canales para monitorear.")
+        print("Configura la variable de entorno CHANNELS_TO_CHECK con una "
+              "lista separada por comas, CHANNELS_FILE o FOLLOWED_BY.")
+        return 1
+
+    try:
+        setup(app_settings, sinks)
+        if not registry:
+            print("Error: No se pudo obtener información de ningún canal. "
+                  "Verifica la configuración.")
+            return 1
+
+        print(f"Iniciando notificador para {len(registry)} canal(es)...")
+        if once:
+            check_channels_and_notify()
+        else:
+            run_monitor()
+    finally:
+        shutdown()
+    return 0
+
+
+def main(argv=None):
+    """Punto de entrada de la aplicación."""
+    args = parse_args(argv)
+    # .env is read when the app starts, never on import
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    global settings
+    settings = Settings()
+    if args.sink:
+        settings.notify_sinks = parse_sink_list(args.sink)
+
+    sinks = create_sinks(settings.notify_sinks)
+    if not sinks:
+        return 1
+    if any(isinstance(sink, StdoutSink) for sink in sinks):
+        # stdout carries only the JSON events, status messages go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            return run(settings, sinks, once=args.once)
+    return run(settings, sinks, once=args.once)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
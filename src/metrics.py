@@ -0,0 +1,278 @@
+import bisect
+import contextlib
+import io
+import os
+import threading
+import time
+
+PREFIX = "twitch_notifier_"
+# Seconds; covers a fast local request up to a fully backed-off retry
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0)
+
+
+class Histogram:
+    """Histograma acumulado al estilo Prometheus."""
+
+    __slots__ = ("buckets", "count", "counts", "max", "sum")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @property
+    def average(self):
+        return self.sum / self.count if self.count else 0.0
+
+
+class Metrics:
+    """
+    Contadores, gauges e histogramas con etiquetas, seguros entre hilos.
+
+    Las series se identifican por nombre y etiquetas. Los gauges que
+    conviene leer recién al exportar (como el largo de una cola) se
+    registran con register_gauge() y una función.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.gauge_callbacks = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self.lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def register_gauge(self, name, callback):
+        """Gauge calculado al leerlo, por ejemplo el largo de una cola."""
+        with self.lock:
+            self.gauge_callbacks[name] = callback
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def counter_total(self, name):
+        """Suma de un contador en todas sus etiquetas."""
+        with self.lock:
+            return sum(
+                value for (key_name, _), value in self.counters.items()
+                if key_name == name
+            )
+
+    def gauge(self, name, **labels):
+        with self.lock:
+            callback = self.gauge_callbacks.get(name)
+            if callback is None:
+                return self.gauges.get(self._key(name, labels))
+        return callback()
+
+    def histogram(self, name, **labels):
+        with self.lock:
+            return self.histograms.get(self._key(name, labels))
+
+    def histograms_named(self, name):
+        """Histogramas de un nombre, como pares (etiquetas, histograma)."""
+        with self.lock:
+            return [
+                (dict(labels), histogram)
+                for (key_name, labels), histogram in self.histograms.items()
+                if key_name == name
+            ]
+
+    @contextlib.contextmanager
+    def time(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def render_prometheus(self):
+        """Exporta todas las series en el formato de texto de Prometheus."""
+        with self.lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            callbacks = sorted(self.gauge_callbacks.items())
+            histograms = sorted(
+                (key, histogram.buckets, list(histogram.counts),
+                 histogram.count, histogram.sum)
+                for key, histogram in self.histograms.items()
+            )
+
+        lines = []
+        typed = set()
+
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+        for (name, labels), value in gauges:
+            declare(name, "gauge")
+            lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+        for name, callback in callbacks:
+            declare(name, "gauge")
+            lines.append(f"{PREFIX}{name} {callback()}")
+        for (name, labels), buckets, counts, count, total in histograms:
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = labels + (("le", str(bound)),)
+                lines.append(
+                    f"{PREFIX}{name}_bucket{_labels(bucket_labels)} {cumulative}"
+                )
+            inf_labels = labels + (("le", "+Inf"),)
+            lines.append(f"{PREFIX}{name}_bucket{_labels(inf_labels)} {count}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{PREFIX}{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(34), chr(39))}"'
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def start_metrics_server(metrics, port, host="127.0.0.1"):
+    """
+    Sirve las métricas en http://host:port/metrics desde un hilo propio.
+
+    Devuelve el servidor para poder detenerlo con shutdown().
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            data = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    return server
+
+
+class TickProfiler:
+    """
+    Perfilado opcional de cada tick de sondeo.
+
+    Con mode="cpu" corre cProfile durante el tick y guarda las estadísticas
+    en `output_dir/tick-<n>.prof` (se abren con pstats o snakeviz); con
+    mode="memory" compara snapshots de tracemalloc entre ticks. En ambos
+    casos imprime las `top` entradas más pesadas. Sin modo no hace nada, y
+    los módulos de perfilado ni siquiera se importan.
+    """
+
+    def __init__(self, mode=None, output_dir=None, top=10):
+        self.mode = (mode or "").strip().lower() or None
+        if self.mode not in (None, "cpu", "memory"):
+            print(f"PROFILE_TICKS='{mode}' no es válido (usar cpu o memory); "
+                  "se desactiva el perfilado.")
+            self.mode = None
+        self.output_dir = output_dir
+        self.top = top
+        self.ticks = 0
+        self._last_snapshot = None
+        if self.mode == "memory":
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+
+    @contextlib.contextmanager
+    def tick(self):
+        if self.mode is None:
+            yield
+            return
+
+        self.ticks += 1
+        if self.mode == "cpu":
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self._report_cpu(profiler)
+        else:
+            try:
+                yield
+            finally:
+                self._report_memory()
+
+    def _report_cpu(self, profiler):
+        import pstats
+
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profiler.dump_stats(
+                os.path.join(self.output_dir, f"tick-{self.ticks}.prof")
+            )
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        print(f"[perfil] tick {self.ticks} (CPU):\n{output.getvalue()}")
+
+    def _report_memory(self):
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"[perfil] tick {self.ticks} (memoria): {current / 1024:.0f} KiB "
+              f"en uso, pico {peak / 1024:.0f} KiB")
+        if self._last_snapshot is not None:
+            for stat in snapshot.compare_to(
+                    self._last_snapshot, "lineno")[:self.top]:
+                print(f"  {stat}")
+        self._last_snapshot = snapshot
+        tracemalloc.reset_peak()
@@ -1,23 +1,142 @@
 import os
-from notifypy import Notify
+import threading
+import time
 
 
 class Notifier:
     def __init__(self, icon_path, sound_path):
-        self.icon_path = icon_path
-        self.sound_path = sound_path
+        # Resolve the assets once instead of on every notification
+        self.icon_path = icon_path if os.path.exists(icon_path) else None
+        self.sound_path = sound_path if os.path.exists(sound_path) else None
+
+    def _send(self, message):
+        # Imported on first use: it is slow to load and only needed when a
+        # desktop notification is actually shown
+        from notifypy import Notify
 
-    def notify_live(self, channel_name):
-        """Envía una notificación de que un canal está en vivo."""
         notification = Notify()
         notification.title = "Twitch"
-        notification.message = f"¡{channel_name} está en vivo!"
+        notification.message = message
         notification.application_name = "Twitch Stream Notifier"
 
-        if os.path.exists(self.icon_path):
+        if self.icon_path:
             notification.icon = self.icon_path
-        
-        if os.path.exists(self.sound_path):
+
+        if self.sound_path:
             notification.audio = self.sound_path
 
         notification.send()
+
+    def notify_live(self, channel_name):
+        """Envía una notificación de que un canal está en vivo."""
+        self._send(f"¡{channel_name} está en vivo!")
+
+    def notify_live_many(self, channel_names, max_listed=3):
+        """Envía una sola notificación para varios canales en vivo."""
+        if len(channel_names) == 1:
+            self.notify_live(channel_names[0])
+            return
+
+        listed = ", ".join(channel_names[:max_listed])
+        remaining = len(channel_names) - max_listed
+        if remaining > 0:
+            message = f"¡{listed} y {remaining} más están en vivo!"
+        else:
+            message = f"¡{listed} están en vivo!"
+        self._send(message)
+
+
+class NotificationDispatcher:
+    """
+    Cola de notificaciones atendida por un hilo propio.
+
+    notify_live() y notify_live_many() solo encolan y vuelven enseguida, así
+    que ni el bucle de sondeo ni la GUI esperan al backend de
+    notificaciones o al audio. Los canales que llegan dentro de
+    `coalesce_seconds` forman un solo lote y se envían en una notificación
+    resumen, así que una ráfaga de canales en vivo ocupa un único lugar en
+    la cola. Se admiten como máximo `max_backlog` lotes pendientes; los que
+    no entran se descartan.
+    """
+
+    def __init__(self, notifier, max_backlog=100, coalesce_seconds=1.0):
+        self.notifier = notifier
+        self.coalesce_seconds = coalesce_seconds
+        self.max_backlog = max_backlog
+        # [opened_at, channel names] per batch, drained by the worker
+        self.pending = []
+        self.dropped = 0
+        self.closing = False
+        self.condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._worker, name="notification-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def notify_live(self, channel_name):
+        """Encola la notificación de un canal sin bloquear."""
+        self.notify_live_many([channel_name])
+
+    def notify_live_many(self, channel_names):
+        """Encola varios canales sin bloquear."""
+        if not channel_names:
+            return
+        now = time.monotonic()
+        full = False
+        with self.condition:
+            if (self.pending
+                    and now - self.pending[-1][0] < self.coalesce_seconds):
+                self.pending[-1][1].extend(channel_names)
+            elif len(self.pending) >= self.max_backlog:
+                full = True
+                self.dropped += len(channel_names)
+            else:
+                self.pending.append([now, list(channel_names)])
+                self.condition.notify()
+        if full:
+            print(f"Cola de notificaciones llena; se descartan "
+                  f"{len(channel_names)} canal(es)")
+
+    def backlog(self):
+        """Lotes encolados que todavía no se enviaron."""
+        with self.condition:
+            return len(self.pending)
+
+    def close(self, timeout=5):
+        """Envía lo pendiente y detiene el hilo."""
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self._thread.join(timeout)
+        # Sinks with their own delivery threads flush them too
+        close_notifier = getattr(self.notifier, "close", None)
+        if close_notifier is not None:
+            close_notifier(timeout)
+
+    def _next_batch(self):
+        """
+        Espera el primer lote, deja abierta la ventana de agrupación y
+        devuelve los canales de todos los lotes juntos, o None al cerrar.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending or self.closing)
+            if not self.pending:
+                return None
+            deadline = time.monotonic() + self.coalesce_seconds
+            while not self.closing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            batches, self.pending = self.pending, []
+        return [channel for _, names in batches for channel in names]
+
+    def _worker(self):
+        while True:
+            channel_names = self._next_batch()
+            if channel_names is None:
+                return
+            try:
+                self.notifier.notify_live_many(list(dict.fromkeys(channel_names)))
+            except Exception as e:
+                print(f"Error enviando notificación: {e}")
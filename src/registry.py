@@ -0,0 +1,315 @@
+import itertools
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+EVENT_LIVE = "live"
+EVENT_OFFLINE = "offline"
+EVENT_RESTART = "restart"
+EVENT_TITLE_CHANGED = "title_changed"
+EVENT_GAME_CHANGED = "game_changed"
+# Live state carried over from a previous run, see state_journal.py
+EVENT_RESTORED = "restored"
+
+# A channel that comes back within this many seconds of going offline is
+# reported as a restart, not as a new stream
+RESTART_GRACE_SECONDS = 5 * 60
+
+# A change between two polls: `old` and `new` hold the changed title or
+# game, or the stream IDs for live, restart and offline events
+StreamEvent = namedtuple("StreamEvent", ["kind", "login", "old", "new"])
+
+
+def parse_timestamp(value):
+    """Convierte un started_at de Twitch a epoch, o None si no se puede."""
+    try:
+        # Drop fractional seconds, EventSub sends up to nanoseconds
+        parsed = datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+    return parsed.replace(tzinfo=timezone.utc).timestamp()
+
+
+class ChannelRecord:
+    """
+    Estado de un canal monitoreado.
+
+    Usa __slots__ para que cada registro ocupe lo mínimo: con decenas de
+    miles de canales el estado no crece más que unos pocos cientos de bytes
+    por canal. Mientras el canal está en vivo guarda una foto compacta del
+    stream (ID, inicio, título, juego y espectadores) para comparar con la
+    consulta siguiente.
+    """
+
+    __slots__ = (
+        "login",
+        "user_id",
+        "is_live",
+        "stream_id",
+        "stream_started_at",
+        "last_checked_at",
+        "went_offline_at",
+        "title",
+        "game_name",
+        "viewer_count",
+        "error_count",
+    )
+
+    def __init__(self, login, user_id):
+        self.login = login
+        self.user_id = user_id
+        self.is_live = False
+        self.stream_id = None
+        self.stream_started_at = None
+        self.last_checked_at = None
+        self.went_offline_at = None
+        self.title = None
+        self.game_name = None
+        self.viewer_count = None
+        self.error_count = 0
+
+    def __repr__(self):
+        return (f"ChannelRecord(login={self.login!r}, user_id={self.user_id!r}, "
+                f"is_live={self.is_live!r})")
+
+    def apply(self, is_live, stream=None, now=None):
+        """
+        Aplica el resultado de una consulta o evento y devuelve la lista de
+        StreamEvent con lo que cambió desde la consulta anterior. `stream`
+        es el objeto de Helix (o el evento de EventSub) cuando el canal está
+        en vivo.
+
+        Una vuelta al aire dentro de RESTART_GRACE_SECONDS desde la última
+        vez que se vio el canal, ya sea tras verlo offline o con un ID de
+        stream nuevo, se informa como EVENT_RESTART en lugar de EVENT_LIVE
+        para no notificar dos veces el mismo stream.
+        """
+        now = time.time() if now is None else now
+        last_seen_at = self.last_checked_at
+        self.last_checked_at = now
+        events = []
+        if not is_live:
+            if self.is_live:
+                events.append(
+                    StreamEvent(EVENT_OFFLINE, self.login, self.stream_id, None)
+                )
+                self.went_offline_at = now
+            self.is_live = False
+            # Offline channels keep no stream details around
+            self.stream_id = None
+            self.stream_started_at = None
+            self.title = None
+            self.game_name = None
+            self.viewer_count = None
+            return events
+
+        stream = stream or {}
+        stream_id = stream.get("id")
+        if not self.is_live:
+            recently_offline = (
+                self.went_offline_at is not None
+                and now - self.went_offline_at < RESTART_GRACE_SECONDS
+            )
+            kind = EVENT_RESTART if recently_offline else EVENT_LIVE
+            events.append(StreamEvent(kind, self.login, None, stream_id))
+        elif stream_id and self.stream_id and stream_id != self.stream_id:
+            # A new stream id while live: the old broadcast ended between
+            # checks, a quick comeback is the same session
+            started_at = parse_timestamp(stream.get("started_at"))
+            gap = (
+                started_at - last_seen_at
+                if started_at is not None and last_seen_at is not None
+                else 0
+            )
+            kind = EVENT_LIVE if gap >= RESTART_GRACE_SECONDS else EVENT_RESTART
+            events.append(
+                StreamEvent(kind, self.login, self.stream_id, stream_id)
+            )
+        else:
+            # Same stream: only compare fields both snapshots know about,
+            # EventSub events carry no title or game
+            for kind, old, new in (
+                (EVENT_TITLE_CHANGED, self.title, stream.get("title")),
+                (EVENT_GAME_CHANGED, self.game_name, stream.get("game_name")),
+            ):
+                if old is not None and new is not None and old != new:
+                    events.append(StreamEvent(kind, self.login, old, new))
+
+        self.is_live = True
+        self.stream_id = stream_id or self.stream_id
+        self.stream_started_at = stream.get("started_at", self.stream_started_at)
+        self.title = stream.get("title", self.title)
+        self.game_name = stream.get("game_name", self.game_name)
+        self.viewer_count = stream.get("viewer_count", self.viewer_count)
+        return events
+
+    def snapshot(self):
+        """Foto del stream con las claves de Helix, o None si está offline."""
+        if not self.is_live:
+            return None
+        return {
+            "id": self.stream_id,
+            "started_at": self.stream_started_at,
+            "title": self.title,
+            "game_name": self.game_name,
+            "viewer_count": self.viewer_count,
+        }
+
+
+def describe_event(record, event):
+    """Texto para mostrar un StreamEvent en la consola o en los logs."""
+    if event.kind == EVENT_LIVE:
+        details = " - ".join(
+            detail for detail in (record.title, record.game_name) if detail
+        )
+        if details:
+            return f"¡{record.login} acaba de empezar a transmitir! ({details})"
+        return f"¡{record.login} acaba de empezar a transmitir!"
+    if event.kind == EVENT_OFFLINE:
+        return f"{record.login} ya no está en vivo."
+    if event.kind == EVENT_RESTART:
+        return f"{record.login} reinició el stream."
+    if event.kind == EVENT_RESTORED:
+        return f"{record.login} seguía en vivo en la sesión anterior."
+    if event.kind == EVENT_TITLE_CHANGED:
+        return f"{record.login} cambió el título: {event.new}"
+    return f"{record.login} ahora está en {event.new}."
+
+
+class ChannelRegistry:
+    """
+    Registro único de canales indexado por ID y por login.
+
+    Las búsquedas por cualquiera de las dos claves son O(1); los logins se
+    comparan sin distinguir mayúsculas, como hace Twitch. También lleva el
+    conjunto de canales en vivo y el de los que tuvieron una consulta
+    fallida, para que un tick recorra solo lo que puede cambiar y no todos
+    los canales.
+    """
+
+    def __init__(self):
+        self._by_user_id = {}
+        self._by_login = {}
+        # User IDs live as of the last applied result
+        self._live = set()
+        # User IDs with error_count > 0
+        self._failed = set()
+
+    def __len__(self):
+        return len(self._by_user_id)
+
+    def __contains__(self, login):
+        return login.lower() in self._by_login
+
+    def __iter__(self):
+        # Iterate over a snapshot so channels can be added or removed while
+        # a poll walks the registry
+        return iter(list(self._by_user_id.values()))
+
+    def add(self, login, user_id):
+        """Agrega un canal y devuelve su registro (el existente si ya estaba)."""
+        record = self._by_login.get(login.lower())
+        if record is not None:
+            return record
+        record = ChannelRecord(login, user_id)
+        self._by_user_id[user_id] = record
+        self._by_login[login.lower()] = record
+        return record
+
+    def add_many(self, user_ids_by_login):
+        """
+        Agrega de una vez los canales de un diccionario login -> ID.
+
+        Devuelve los registros de todos ellos, incluidos los que ya estaban.
+        """
+        return [
+            self.add(login, user_id)
+            for login, user_id in user_ids_by_login.items()
+        ]
+
+    def remove(self, login):
+        """Quita un canal y devuelve su registro, o None si no estaba."""
+        record = self._by_login.pop(login.lower(), None)
+        if record is not None:
+            self._by_user_id.pop(record.user_id, None)
+            self._live.discard(record.user_id)
+            self._failed.discard(record.user_id)
+        return record
+
+    def apply(self, record, is_live, stream=None, now=None):
+        """Igual que ChannelRecord.apply, manteniendo el conjunto en vivo."""
+        events = record.apply(is_live, stream, now)
+        self.track(record)
+        return events
+
+    def track(self, record):
+        """
+        Anota si un canal está en vivo; hace falta cuando el registro se
+        modifica sin pasar por apply(), como al restaurarlo del diario.
+        """
+        if record.is_live:
+            self._live.add(record.user_id)
+        else:
+            self._live.discard(record.user_id)
+
+    def live_candidates(self, live_streams, user_ids=None):
+        """
+        Registros que pueden haber cambiado tras una consulta de /streams.
+
+        Son los que estaban en vivo en el tick anterior más los que lo
+        están ahora: un canal que sigue offline no se visita, así que el
+        costo depende de los canales en vivo y no del total. Con `user_ids`
+        se limita a los canales consultados. Devuelve pares (registro,
+        stream), con stream None para los que se cortaron.
+        """
+        ended = self._live - live_streams.keys()
+        if user_ids is not None:
+            ended &= set(user_ids)
+        candidates = []
+        for user_id in itertools.chain(live_streams, ended):
+            record = self._by_user_id.get(user_id)
+            if record is not None:
+                candidates.append((record, live_streams.get(user_id)))
+        return candidates
+
+    def record_failure(self, user_ids=None):
+        """Suma una consulta fallida a los canales indicados (o a todos)."""
+        user_ids = self._by_user_id if user_ids is None else user_ids
+        for user_id in user_ids:
+            record = self._by_user_id.get(user_id)
+            if record is not None:
+                record.error_count += 1
+                self._failed.add(user_id)
+
+    def clear_failures(self, user_ids=None):
+        """
+        Pone en cero los errores tras una consulta correcta; solo recorre
+        los canales que venían fallando.
+        """
+        if not self._failed:
+            return
+        recovered = (
+            set(self._failed) if user_ids is None
+            else self._failed.intersection(user_ids)
+        )
+        for user_id in recovered:
+            self._by_user_id[user_id].error_count = 0
+        self._failed -= recovered
+
+    def get(self, login):
+        return self._by_login.get(login.lower())
+
+    def get_by_user_id(self, user_id):
+        return self._by_user_id.get(user_id)
+
+    def user_ids(self):
+        return list(self._by_user_id)
+
+    def user_ids_by_login(self):
+        """Diccionario login -> ID, para pasar los canales a otros procesos."""
+        return {
+            record.login: record.user_id for record in self._by_user_id.values()
+        }
+
+    def live_records(self):
+        return [self._by_user_id[user_id] for user_id in self._live]
@@ -1,5 +1,10 @@
-import schedule
+import asyncio
+import heapq
+import statistics
 import time
+from collections import deque
+
+import schedule
 
 
 class TaskScheduler:
@@ -15,3 +20,304 @@ class TaskScheduler:
         while True:
             schedule.run_pending()
             time.sleep(1)
+
+
+class AsyncTaskScheduler:
+    """
+    Programador basado en asyncio.
+
+    Los ticks se alinean a múltiplos del intervalo contados desde el arranque,
+    así que la duración de una ejecución no desplaza las siguientes. Si un
+    tick tarda más que el intervalo, se saltan los ticks perdidos en lugar de
+    encadenarlos.
+    """
+
+    def __init__(self, interval_minutes=1, history_size=100):
+        self.interval = interval_minutes
+        self.tasks = []
+        self.latencies = deque(maxlen=history_size)
+
+    def schedule_task(self, task_function):
+        """Programa una corrutina para que se ejecute a un intervalo fijo."""
+        self.tasks.append(task_function)
+
+    def latency_report(self):
+        """Resumen de la latencia de los últimos ticks, en milisegundos."""
+        if not self.latencies:
+            return "sin ticks registrados"
+        samples = sorted(self.latencies)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return (
+            f"último {self.latencies[-1] * 1000:.0f} ms, "
+            f"p50 {statistics.median(samples) * 1000:.0f} ms, "
+            f"p95 {p95 * 1000:.0f} ms, máx {samples[-1] * 1000:.0f} ms "
+            f"({len(samples)} ticks)"
+        )
+
+    async def _run_tick(self):
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(task() for task in self.tasks), return_exceptions=True
+        )
+        self.latencies.append(time.perf_counter() - started)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error en la tarea programada: {result}")
+        print(f"Tick completado: {self.latency_report()}")
+
+    async def run_forever(self):
+        """Ejecuta las tareas en cada tick, sin deriva respecto al reloj."""
+        period = self.interval * 60
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tick = 0
+        while True:
+            await self._run_tick()
+            now = loop.time()
+            # Next slot on the start + k * period grid, skipping missed ones
+            tick = max(tick + 1, int((now - start) // period) + 1)
+            await asyncio.sleep(start + tick * period - now)
+
+    def run_pending_tasks(self):
+        """Arranca el bucle de eventos y ejecuta las tareas indefinidamente."""
+        asyncio.run(self.run_forever())
+
+
+class ChannelHistory:
+    """Historial de un canal usado para estimar cuándo suele salir en vivo."""
+
+    HOURS_PER_WEEK = 7 * 24
+    # Older go-live events weigh less so schedules can drift over time
+    DECAY = 0.97
+
+    def __init__(self):
+        self.go_live_hours = [0.0] * self.HOURS_PER_WEEK
+        self.total = 0.0
+        self.is_live = False
+        self.last_offline_at = None
+
+    @staticmethod
+    def hour_of_week(timestamp):
+        local = time.localtime(timestamp)
+        return local.tm_wday * 24 + local.tm_hour
+
+    def record(self, is_live, now):
+        """Registra el resultado de una consulta y devuelve si hubo cambio."""
+        changed = is_live != self.is_live
+        if changed and is_live:
+            self.go_live_hours = [
+                count * self.DECAY for count in self.go_live_hours
+            ]
+            self.go_live_hours[self.hour_of_week(now)] += 1
+            self.total = sum(self.go_live_hours)
+        elif changed:
+            self.last_offline_at = now
+        self.is_live = is_live
+        return changed
+
+    def live_likelihood(self, now, window_hours=2):
+        """
+        Probabilidad relativa de salir en vivo en las próximas horas frente
+        a un canal que transmite a cualquier hora (1.0 = sin preferencia).
+        """
+        first = self.hour_of_week(now)
+        hits = sum(
+            self.go_live_hours[(first + offset) % self.HOURS_PER_WEEK]
+            for offset in range(window_hours)
+        )
+        return hits / self.total * self.HOURS_PER_WEEK / window_hours
+
+
+class AdaptiveScheduler:
+    """
+    Programador con una cola de prioridad por canal.
+
+    Cada canal tiene su propio próximo chequeo, calculado a partir de su
+    historial: los canales en vivo o que acaban de cortar se revisan seguido,
+    los que suelen empezar a esta hora también, y los que casi nunca
+    transmiten a esta hora se espacian hasta max_interval. En cada tick se
+    consultan los canales vencidos en lotes de `batch_size`, sin superar
+    `requests_per_minute`; los que no entran esperan al siguiente tick en
+    orden de antigüedad. Para no gastar solicitudes en lotes casi vacíos,
+    los canales vencidos pueden esperar hasta `max_wait_seconds`.
+
+    Tampoco se hacen más solicitudes que el sondeo fijo: como mucho un lote
+    por cada `batch_size` canales en cada `base_interval_minutes`. Con pocos
+    canales eso manda sobre `max_wait_seconds` y el programador consulta
+    con la misma frecuencia que el sondeo fijo; el ahorro aparece cuando hay
+    más canales que los que entran en unos pocos lotes.
+
+    `check_function(user_ids)` debe devolver el diccionario de streams en
+    vivo de esos IDs, o None si la consulta falló.
+    """
+
+    def __init__(
+        self,
+        check_function,
+        base_interval_minutes=5,
+        min_interval_minutes=1,
+        max_interval_minutes=30,
+        requests_per_minute=30,
+        batch_size=100,
+        tick_seconds=15,
+        max_wait_seconds=30,
+        recent_offline_minutes=30,
+        min_history=2,
+    ):
+        self.check_function = check_function
+        self.base_interval = base_interval_minutes * 60
+        self.min_interval = min_interval_minutes * 60
+        self.max_interval = max_interval_minutes * 60
+        self.requests_per_minute = requests_per_minute
+        self.batch_size = batch_size
+        self.tick_seconds = tick_seconds
+        self.max_wait = max_wait_seconds
+        self.recent_offline = recent_offline_minutes * 60
+        self.min_history = min_history
+
+        self.histories = {}
+        # Heap of (next_check, sequence, user_id). Entries whose sequence no
+        # longer matches `scheduled` (removed or rescheduled channels) are
+        # skipped lazily when popped
+        self.queue = []
+        self.scheduled = {}
+        # Channels already due, waiting to fill a batch: user_id -> due time
+        self.pending = {}
+        self.sequence = 0
+        self.request_times = deque()
+        self.requests_made = 0
+        self.checks_made = 0
+
+    def add_channel(self, user_id, now=None):
+        """Agrega un canal; se revisa en el próximo tick."""
+        if user_id in self.histories:
+            return
+        self.pending.pop(user_id, None)
+        self.histories[user_id] = ChannelHistory()
+        self._push(user_id, now if now is not None else time.time())
+
+    def remove_channel(self, user_id):
+        self.histories.pop(user_id, None)
+        self.scheduled.pop(user_id, None)
+
+    def _push(self, user_id, next_check):
+        self.sequence += 1
+        self.scheduled[user_id] = self.sequence
+        heapq.heappush(self.queue, (next_check, self.sequence, user_id))
+
+    def next_interval(self, user_id, now):
+        """Segundos hasta el próximo chequeo de un canal."""
+        history = self.histories[user_id]
+        if history.is_live:
+            return self.base_interval
+        if (history.last_offline_at is not None
+                and now - history.last_offline_at < self.recent_offline):
+            return self.min_interval
+        if history.total < self.min_history:
+            return self.base_interval
+
+        likelihood = history.live_likelihood(now)
+        if likelihood <= 0:
+            return self.max_interval
+        interval = self.base_interval / likelihood
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _request_budget(self, now):
+        """
+        Solicitudes que todavía se pueden hacer sin pasar de
+        `requests_per_minute` ni de lo que gastaría el sondeo fijo en el
+        último `base_interval`.
+        """
+        window = max(60, self.base_interval)
+        while self.request_times and now - self.request_times[0] >= window:
+            self.request_times.popleft()
+        last_minute = sum(1 for at in self.request_times if now - at < 60)
+        last_interval = sum(
+            1 for at in self.request_times if now - at < self.base_interval
+        )
+        fixed_rate = -(-len(self.histories) // self.batch_size)
+        return min(
+            self.requests_per_minute - last_minute, fixed_rate - last_interval
+        )
+
+    def _pop_due(self, deadline, limit):
+        """Pasa a `pending` los canales que vencen antes de `deadline`."""
+        while (self.queue and self.queue[0][0] <= deadline
+               and len(self.pending) < limit):
+            next_check, sequence, user_id = heapq.heappop(self.queue)
+            if self.scheduled.get(user_id) == sequence:
+                del self.scheduled[user_id]
+                self.pending.setdefault(user_id, next_check)
+
+    def due_channels(self, now):
+        """
+        Devuelve los canales a consultar en este tick.
+
+        Los canales vencidos esperan en `pending` hasta completar un lote o
+        hasta que el más antiguo lleve `max_wait` segundos vencido; así un
+        canal suelto no gasta una solicitud entera. Al enviar, el último lote
+        se completa con los próximos canales de la cola, que viajan en la
+        misma solicitud sin costo adicional.
+        """
+        budget = max(0, self._request_budget(now))
+        self._pop_due(now, budget * self.batch_size)
+        if not self.pending or not budget:
+            return []
+
+        oldest = min(self.pending.values())
+        if (len(self.pending) < self.batch_size
+                and now - oldest < self.max_wait):
+            return []
+
+        batches = min(budget, -(-len(self.pending) // self.batch_size))
+        self._pop_due(float("inf"), batches * self.batch_size)
+        due = [
+            user_id for user_id in self.pending if user_id in self.histories
+        ][:batches * self.batch_size]
+        for user_id in due:
+            del self.pending[user_id]
+        for user_id in [u for u in self.pending if u not in self.histories]:
+            del self.pending[user_id]
+        return due
+
+    def run_tick(self, now=None):
+        """
+        Consulta los canales vencidos y reprograma cada uno.
+
+        Devuelve la lista de IDs que cambiaron de estado.
+        """
+        now = now if now is not None else time.time()
+        due = self.due_channels(now)
+        changed = []
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            self.request_times.append(now)
+            self.requests_made += 1
+            live_streams = self.check_function(batch)
+
+            if live_streams is None:
+                # Keep the previous state and retry on the next tick
+                for user_id in batch:
+                    self._push(user_id, now + self.tick_seconds)
+                continue
+
+            self.checks_made += len(batch)
+            for user_id in batch:
+                if user_id not in self.histories:
+                    continue
+                if self.histories[user_id].record(user_id in live_streams, now):
+                    changed.append(user_id)
+                self._push(user_id, now + self.next_interval(user_id, now))
+        return changed
+
+    def seconds_until_next(self, now=None):
+        now = now if now is not None else time.time()
+        if self.pending or not self.queue:
+            return self.tick_seconds
+        return max(0.0, min(self.tick_seconds, self.queue[0][0] - now))
+
+    def run_pending_tasks(self):
+        """Ejecuta los chequeos en un bucle."""
+        while True:
+            self.run_tick()
+            time.sleep(max(1.0, self.seconds_until_next()))
@@ -0,0 +1,161 @@
+import multiprocessing
+import queue
+import time
+
+from .registry import ChannelRegistry
+from .twitch_client import HELIX_MAX_IDS, TwitchClient
+
+
+def split_into_shards(channels_user_ids, workers):
+    """
+    Reparte los canales en `workers` grupos de tamaño parejo.
+
+    Los grupos se arman en múltiplos de 100 canales cuando es posible para
+    que cada proceso llene sus solicitudes a Helix.
+    """
+    items = list(channels_user_ids.items())
+    workers = max(1, min(workers, len(items)))
+    batches = [
+        items[i:i + HELIX_MAX_IDS] for i in range(0, len(items), HELIX_MAX_IDS)
+    ]
+    shards = [[] for _ in range(workers)]
+    for index, batch in enumerate(batches):
+        shards[index % workers].extend(batch)
+    return [dict(shard) for shard in shards if shard]
+
+
+def _shard_worker(shard_index, channels_user_ids, client_config, interval,
+                  max_ticks, events, stop_event, snapshots=None):
+    """
+    Proceso de un shard: consulta sus canales con su propio TwitchClient y
+    envía al coordinador solo los cambios de estado y un resumen por tick.
+
+    `snapshots` (user_id -> foto del stream) trae los canales que el
+    coordinador tiene en vivo, para partir del mismo estado que él.
+    """
+    base_url = client_config.pop("base_url", None)
+    twitch_client = TwitchClient(**client_config)
+    if base_url:
+        twitch_client.base_url = base_url
+
+    registry = ChannelRegistry()
+    for record in registry.add_many(channels_user_ids):
+        snapshot = (snapshots or {}).get(record.user_id)
+        if snapshot is not None:
+            # A channel restored as live that is offline now must still be
+            # reported, so start from the coordinator's view of it
+            registry.apply(record, True, snapshot)
+    user_ids = list(channels_user_ids.values())
+    tick = 0
+    try:
+        while not stop_event.is_set() and (max_ticks is None or tick < max_ticks):
+            started = time.monotonic()
+            live_streams = twitch_client.get_live_streams(user_ids)
+            if live_streams is not None:
+                for record, stream in registry.live_candidates(live_streams):
+                    # Only the compact snapshot crosses the process boundary
+                    if registry.apply(record, stream is not None, stream):
+                        events.put((
+                            "transition", record.login, record.is_live,
+                            record.snapshot(),
+                        ))
+            elapsed = time.monotonic() - started
+            checked = len(user_ids) if live_streams is not None else 0
+            events.put(("tick", shard_index, checked, elapsed))
+            tick += 1
+            stop_event.wait(max(0.0, interval - elapsed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        twitch_client.close()
+        events.put(("done", shard_index))
+
+
+class ShardCoordinator:
+    """
+    Reparte los canales entre varios procesos y centraliza los resultados.
+
+    Cada proceso tiene su propio TwitchClient con una parte proporcional del
+    rate limit. Los cambios (de estado, título, juego o ID de stream) vuelven
+    por una cola y se entregan a `on_transition(channel, is_live, stream)`
+    en el proceso del coordinador, de modo que hay un único notificador.
+    `stream` es la foto compacta del stream, o None si está offline.
+    `snapshots` (user_id -> foto) indica los canales que ya se saben en
+    vivo, por ejemplo restaurados del diario de estado.
+    """
+
+    def __init__(self, channels_user_ids, client_id, access_token, workers=4,
+                 interval_minutes=5, on_transition=None, on_tick=None,
+                 base_url=None, client_secret=None, snapshots=None):
+        self.shards = split_into_shards(channels_user_ids, workers)
+        self.snapshots = snapshots or {}
+        self.interval = interval_minutes * 60
+        self.on_transition = on_transition
+        self.on_tick = on_tick
+        self.client_config = {
+            "client_id": client_id,
+            "access_token": access_token,
+            # Lets each worker renew the token on its own
+            "client_secret": client_secret,
+            "rate_limit_share": 1.0 / max(1, len(self.shards)),
+        }
+        if base_url:
+            self.client_config["base_url"] = base_url
+
+        context = multiprocessing.get_context("spawn")
+        self.events = context.Queue()
+        self.stop_event = context.Event()
+        self.context = context
+        self.processes = []
+
+    def start(self, max_ticks=None):
+        for index, shard in enumerate(self.shards):
+            snapshots = {
+                user_id: self.snapshots[user_id]
+                for user_id in shard.values() if user_id in self.snapshots
+            }
+            process = self.context.Process(
+                target=_shard_worker,
+                args=(index, shard, dict(self.client_config), self.interval,
+                      max_ticks, self.events, self.stop_event, snapshots),
+                name=f"shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+    def stop(self, timeout=5):
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+    def run(self, max_ticks=None):
+        """
+        Arranca los procesos y atiende sus eventos hasta que terminen.
+
+        Con `max_ticks` cada proceso hace esa cantidad de ticks y termina;
+        sin él, el monitoreo corre hasta Ctrl+C.
+        """
+        self.start(max_ticks)
+        running = len(self.processes)
+        try:
+            while running:
+                try:
+                    event = self.events.get(timeout=1)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in self.processes):
+                        break
+                    continue
+
+                if event[0] == "transition" and self.on_transition:
+                    self.on_transition(*event[1:])
+                elif event[0] == "tick" and self.on_tick:
+                    self.on_tick(*event[1:])
+                elif event[0] == "done":
+                    running -= 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
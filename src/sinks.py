@@ -0,0 +1,352 @@
+import abc
+import heapq
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+SINK_KINDS = ("desktop", "stdout", "file", "webhook", "discord")
+DEFAULT_MAX_RETRIES = 3
+# Seconds; doubled on every failed attempt, with full jitter
+RETRY_BASE_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+
+def _timestamp(now):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+
+
+def live_event(channel_name, now=None):
+    """Evento de canal en vivo tal como lo escriben los sinks."""
+    now = time.time() if now is None else now
+    return {"event": "live", "channel": channel_name, "at": _timestamp(now)}
+
+
+class StdoutSink:
+    """
+    Escribe cada canal en vivo como una línea JSON en la salida estándar.
+
+    Pensado para servidores sin escritorio: la salida se puede redirigir a
+    otro proceso o a un recolector de logs.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+
+    def notify_live(self, channel_name):
+        self.notify_live_many([channel_name])
+
+    def notify_live_many(self, channel_names):
+        now = time.time()
+        lines = "".join(
+            json.dumps(live_event(name, now)) + "\n" for name in channel_names
+        )
+        with self.lock:
+            self.stream.write(lines)
+            self.stream.flush()
+
+
+class FileSink:
+    """Agrega cada canal en vivo como una línea JSON a un archivo."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def notify_live(self, channel_name):
+        self.notify_live_many([channel_name])
+
+    def notify_live_many(self, channel_names):
+        now = time.time()
+        lines = "".join(
+            json.dumps(live_event(name, now)) + "\n" for name in channel_names
+        )
+        with self.lock, open(self.path, "a", encoding="utf-8") as sink_file:
+            sink_file.write(lines)
+
+
+class HttpSink(abc.ABC):
+    """
+    Base de los sinks que envían JSON por POST.
+
+    Cada sink usa su propia sesión con un pool de `pool_size` conexiones,
+    así varias entregas concurrentes reutilizan conexiones abiertas.
+    """
+
+    def __init__(self, url, timeout=10, pool_size=4):
+        # requests is only loaded when an HTTP sink is actually configured
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @abc.abstractmethod
+    def payload(self, channel_names):
+        """Cuerpo JSON del POST para un lote de canales."""
+
+    def notify_live(self, channel_name):
+        self.notify_live_many([channel_name])
+
+    def notify_live_many(self, channel_names):
+        response = self.session.post(
+            self.url, json=self.payload(channel_names), timeout=self.timeout
+        )
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+class WebhookSink(HttpSink):
+    """
+    Envía los canales en vivo a una URL, en un solo JSON por lote.
+
+    El cuerpo es {"event": "live", "channels": [...], "at": ...}.
+    """
+
+    def payload(self, channel_names):
+        return {
+            "event": "live",
+            "channels": list(channel_names),
+            "at": _timestamp(time.time()),
+        }
+
+
+class DiscordSink(HttpSink):
+    """
+    Publica los canales en vivo en un webhook de Discord.
+
+    Los lotes se parten en mensajes de hasta `max_batch` canales para no
+    pasar el límite de largo de Discord.
+    """
+
+    max_batch = 20
+
+    def payload(self, channel_names):
+        lines = [
+            f"🔴 **{name}** está en vivo: https://twitch.tv/{name}"
+            for name in channel_names
+        ]
+        return {
+            "username": "Twitch Stream Notifier",
+            "content": "\n".join(lines),
+            # Channel names never turn into pings
+            "allowed_mentions": {"parse": []},
+        }
+
+
+def retry_delay(error, attempt, base_delay=RETRY_BASE_DELAY):
+    """
+    Segundos a esperar antes de reintentar una entrega fallida, o None si
+    reintentar no tiene sentido (un 4xx que no es 429).
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        if response.status_code == 429:
+            try:
+                return min(float(response.headers["Retry-After"]),
+                           MAX_RETRY_DELAY)
+            except (KeyError, ValueError):
+                pass
+        elif 400 <= response.status_code < 500:
+            return None
+    # Exponential backoff with full jitter, like the Helix client
+    return random.uniform(0, min(MAX_RETRY_DELAY, base_delay * 2 ** attempt))
+
+
+class SinkWorker:
+    """
+    Cola de entrega de un sink, atendida por sus propios hilos.
+
+    Los lotes que fallan vuelven a una cola de reintentos propia del sink,
+    ordenada por el momento en que toca reintentar, así un destino lento o
+    caído solo demora sus propias entregas. Si la cola supera
+    `max_backlog` lotes, los nuevos se descartan.
+    """
+
+    def __init__(self, sink, name=None, workers=1, max_backlog=1000,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 retry_base_delay=RETRY_BASE_DELAY, metrics=None):
+        self.sink = sink
+        self.name = name or type(sink).__name__
+        self.max_backlog = max_backlog
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.metrics = metrics
+        self.pending = deque()
+        # (due, sequence, attempt, batch), soonest first
+        self.retries = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.closing = False
+        self.close_deadline = None
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.threads = [
+            threading.Thread(
+                target=self._worker, name=f"sink-{self.name}-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, channel_names):
+        """Encola los canales para este sink sin bloquear."""
+        max_batch = getattr(self.sink, "max_batch", None) or len(channel_names)
+        with self.condition:
+            for start in range(0, len(channel_names), max_batch):
+                if len(self.pending) >= self.max_backlog:
+                    self.dropped += 1
+                    self._count("dropped")
+                    continue
+                self.pending.append(channel_names[start:start + max_batch])
+            self.condition.notify_all()
+
+    @property
+    def backlog(self):
+        with self.condition:
+            return len(self.pending) + len(self.retries)
+
+    def close(self, timeout=5):
+        """
+        Entrega lo pendiente y detiene los hilos.
+
+        Los reintentos que vencen después de `timeout` se dan por perdidos.
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            self.closing = True
+            self.close_deadline = deadline
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        with self.condition:
+            # Like every other failure, counted in channels, not batches
+            given_up = sum(len(batch) for *_, batch in self.retries)
+            self.failed += given_up
+            self.retries.clear()
+        if given_up:
+            self._count("failed", given_up)
+        close_sink = getattr(self.sink, "close", None)
+        if close_sink is not None:
+            close_sink()
+
+    def _next_batch(self):
+        """Espera el próximo lote o reintento; None cuando hay que parar."""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self.retries and self.retries[0][0] <= now:
+                    _, _, attempt, batch = heapq.heappop(self.retries)
+                    return attempt, batch
+                if self.pending:
+                    return 0, self.pending.popleft()
+                timeout = self.retries[0][0] - now if self.retries else None
+                # When closing, only wait for retries due before the deadline
+                if self.closing and (
+                        timeout is None or now + timeout > self.close_deadline):
+                    return None
+                self.condition.wait(timeout)
+
+    def _worker(self):
+        while True:
+            item = self._next_batch()
+            if item is None:
+                return
+            attempt, batch = item
+            try:
+                self.sink.notify_live_many(batch)
+            except Exception as e:
+                self._retry_or_fail(batch, attempt, e)
+                continue
+            with self.condition:
+                self.delivered += len(batch)
+            self._count("delivered", len(batch))
+
+    def _retry_or_fail(self, batch, attempt, error):
+        delay = retry_delay(error, attempt, self.retry_base_delay)
+        if delay is None or attempt >= self.max_retries:
+            print(f"No se pudo notificar por {self.name}: {error}")
+            with self.condition:
+                self.failed += len(batch)
+            self._count("failed", len(batch))
+            return
+        self._count("retried")
+        with self.condition:
+            heapq.heappush(self.retries, (
+                time.monotonic() + delay, next(self.sequence), attempt + 1,
+                batch,
+            ))
+            self.condition.notify_all()
+
+    def _count(self, result, value=1):
+        if self.metrics is not None:
+            self.metrics.inc(
+                "sink_deliveries_total", value, sink=self.name, result=result
+            )
+
+
+class FanOutSink:
+    """
+    Reparte cada lote de canales en vivo entre varios sinks.
+
+    notify_live_many() solo encola en el SinkWorker de cada sink y vuelve
+    enseguida, de modo que ni el despachador ni el sondeo esperan a ningún
+    destino. Los sinks HTTP usan `http_workers` hilos para entregar varios
+    lotes a la vez por su pool de conexiones; el resto usa uno solo, que
+    mantiene el orden de las líneas que escriben.
+    """
+
+    def __init__(self, sinks, http_workers=4, max_retries=DEFAULT_MAX_RETRIES,
+                 retry_base_delay=RETRY_BASE_DELAY, metrics=None):
+        self.workers = []
+        names = set()
+        for sink in sinks:
+            name = type(sink).__name__
+            if name in names:
+                name = f"{name}-{len(self.workers)}"
+            names.add(name)
+            self.workers.append(SinkWorker(
+                sink,
+                name=name,
+                workers=http_workers if isinstance(sink, HttpSink) else 1,
+                max_retries=max_retries,
+                retry_base_delay=retry_base_delay,
+                metrics=metrics,
+            ))
+
+    def notify_live(self, channel_name):
+        self.notify_live_many([channel_name])
+
+    def notify_live_many(self, channel_names):
+        channel_names = list(channel_names)
+        for worker in self.workers:
+            worker.submit(channel_names)
+
+    @property
+    def backlog(self):
+        """Lotes pendientes o por reintentar, sumando todos los sinks."""
+        return sum(worker.backlog for worker in self.workers)
+
+    def close(self, timeout=5):
+        """Entrega lo pendiente de todos los sinks, en paralelo."""
+        closers = [
+            threading.Thread(target=worker.close, args=(timeout,))
+            for worker in self.workers
+        ]
+        for closer in closers:
+            closer.start()
+        for closer in closers:
+            closer.join()
@@ -0,0 +1,128 @@
+import json
+import os
+import time
+
+# Rewrite the journal once it holds this many lines more than channels
+COMPACT_EXTRA_LINES = 10000
+
+
+class StateJournal:
+    """
+    Diario append-only del estado de los canales, en JSON Lines.
+
+    Cada tick agrega una línea por canal que cambió y una línea final con la
+    hora del tick, todo en una sola escritura. Al arrancar se reproduce el
+    diario para que los canales que ya estaban en vivo no vuelvan a
+    notificarse y los cambios ocurridos mientras la app estaba cerrada se
+    detecten como tales. Una línea cortada por un corte a mitad de
+    escritura se ignora.
+    """
+
+    FILENAME = "state.jsonl"
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.last_tick_at = None
+        self.pending = {}
+        self.lines = 0
+        # Set when a crash left the last line without its newline
+        self.torn_tail = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as journal_file:
+                for line in journal_file:
+                    self.lines += 1
+                    self.torn_tail = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "tick" in entry:
+                        self.last_tick_at = entry["tick"]
+                    elif "user_id" in entry:
+                        self.entries[entry["user_id"]] = entry
+        except OSError:
+            return
+        if self.lines > len(self.entries) + COMPACT_EXTRA_LINES:
+            self.compact()
+
+    def restore(self, record):
+        """
+        Carga en un registro el último estado guardado de su canal.
+
+        Devuelve True si había estado guardado para ese canal.
+        """
+        entry = self.entries.get(record.user_id)
+        if entry is None:
+            return False
+        record.is_live = entry.get("is_live", False)
+        record.stream_id = entry.get("stream_id")
+        record.stream_started_at = entry.get("stream_started_at")
+        record.title = entry.get("title")
+        record.game_name = entry.get("game_name")
+        record.went_offline_at = entry.get("went_offline_at")
+        # Last time the channel was seen in that state
+        record.last_checked_at = self.last_tick_at or entry.get("saved_at")
+        return True
+
+    def record(self, record, now=None):
+        """Anotar el estado de un canal para la próxima escritura."""
+        self.pending[record.user_id] = {
+            "user_id": record.user_id,
+            "is_live": record.is_live,
+            "stream_id": record.stream_id,
+            "stream_started_at": record.stream_started_at,
+            "title": record.title,
+            "game_name": record.game_name,
+            "went_offline_at": record.went_offline_at,
+            "saved_at": time.time() if now is None else now,
+        }
+
+    def flush(self, now=None):
+        """Escribir los cambios anotados y la hora del tick de una sola vez."""
+        now = time.time() if now is None else now
+        lines = [json.dumps(entry) for entry in self.pending.values()]
+        lines.append(json.dumps({"tick": now}))
+        if self.torn_tail:
+            # Keep the first new line off the torn one
+            lines.insert(0, "")
+        self.entries.update(self.pending)
+        self.pending = {}
+        self.last_tick_at = now
+        try:
+            # A bare file name has no directory to create
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as journal_file:
+                journal_file.write("\n".join(lines) + "\n")
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+        except OSError as e:
+            print(f"No se pudo guardar el estado de los canales: {e}")
+            return
+        self.torn_tail = False
+        self.lines += len(lines)
+        if self.lines > len(self.entries) + COMPACT_EXTRA_LINES:
+            self.compact()
+
+    def compact(self):
+        """Reescribe el diario con una sola línea por canal, de forma atómica."""
+        lines = [json.dumps(entry) for entry in self.entries.values()]
+        if self.last_tick_at is not None:
+            lines.append(json.dumps({"tick": self.last_tick_at}))
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as journal_file:
+                journal_file.write("".join(line + "\n" for line in lines))
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"No se pudo compactar el estado de los canales: {e}")
+            return
+        self.torn_tail = False
+        self.lines = len(lines)
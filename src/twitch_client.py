@@ -1,24 +1,431 @@
-import requests
+import asyncio
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
+from requests.adapters import HTTPAdapter
 
-class TwitchClient:
-    def __init__(self, client_id, access_token):
+# Helix accepts up to 100 repeated login/user_id parameters per request
+HELIX_MAX_IDS = 100
+# Stream fields the registry uses; the rest of each /streams entry is dropped
+STREAM_FIELDS = ("user_id", "id", "started_at", "title", "game_name",
+                 "viewer_count")
+# Default app-token budget: 800 points per minute
+HELIX_DEFAULT_RATE_LIMIT = 800
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+OAUTH_URL = "https://id.twitch.tv/oauth2/"
+# Refresh once less than this fraction of the token lifetime is left
+REFRESH_FRACTION = 0.1
+# Twitch asks apps to validate their tokens every hour
+VALIDATE_INTERVAL_SECONDS = 60 * 60
+# Wait between refresh attempts after a failed one
+REFRESH_RETRY_SECONDS = 60
+
+
+def _chunks(items, size=HELIX_MAX_IDS):
+    """Divide una lista en bloques de como máximo `size` elementos."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class RateLimiter:
+    """
+    Token bucket que se sincroniza con las cabeceras Ratelimit-* de Helix.
+
+    Ratelimit-Remaining fija los tokens disponibles y Ratelimit-Reset indica
+    cuándo vuelve a estar lleno el bucket, de donde se deriva la recarga.
+    """
+
+    def __init__(self, capacity=HELIX_DEFAULT_RATE_LIMIT, period=60.0,
+                 share=1.0):
+        # `share` is the fraction of the client's bucket this limiter may
+        # use, for processes that split one Client-Id between them
+        self.share = share
+        capacity = capacity * share
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.refill_rate = capacity / period
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible y lo consume."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.refill_rate
+            time.sleep(wait)
+
+    def update_from_headers(self, headers):
+        """Ajusta el bucket a partir de las cabeceras de la respuesta."""
+        limit = headers.get("Ratelimit-Limit")
+        remaining = headers.get("Ratelimit-Remaining")
+        reset = headers.get("Ratelimit-Reset")
+        try:
+            with self.lock:
+                self._refill()
+                if limit is not None:
+                    self.capacity = int(limit) * self.share
+                if remaining is not None:
+                    self.tokens = min(float(remaining) * self.share,
+                                      self.capacity)
+                    if reset is not None:
+                        until_reset = float(reset) - time.time()
+                        missing = self.capacity - self.tokens
+                        if until_reset > 0 and missing > 0:
+                            self.refill_rate = missing / until_reset
+                        else:
+                            self.refill_rate = self.capacity / self.period
+        except ValueError:
+            # Malformed headers: keep the local estimate
+            pass
+
+    def seconds_until_reset(self, headers):
+        """Segundos hasta Ratelimit-Reset, o None si no viene la cabecera."""
+        reset = headers.get("Ratelimit-Reset")
+        if reset is None:
+            return None
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            return None
+
+
+class TokenManager:
+    """
+    Token de acceso de la app con renovación automática.
+
+    Con `client_secret` obtiene tokens de app por client credentials, los
+    renueva antes de que venzan y también cuando Helix responde 401. Sin
+    secreto usa el `access_token` fijo del .env y solo puede validarlo.
+
+    Las renovaciones son single-flight: un lock hace que, si varios hilos
+    necesitan un token nuevo a la vez, solo uno lo pida y el resto use el
+    resultado. Si una renovación anticipada falla se sigue usando el token
+    actual mientras no venza, y se vuelve a intentar recién pasados
+    REFRESH_RETRY_SECONDS.
+    """
+
+    def __init__(self, client_id, client_secret=None, access_token=None,
+                 oauth_url=None, timeout=(3.05, 10)):
         self.client_id = client_id
+        self.client_secret = client_secret
         self.access_token = access_token
+        self.oauth_url = oauth_url or os.getenv("TWITCH_OAUTH_URL", OAUTH_URL)
+        self.timeout = timeout
+        self.expires_at = None
+        self.lifetime = None
+        self.validated_at = None
+        self.refresh_failed_at = None
+        self.refresh_count = 0
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+
+    @property
+    def can_refresh(self):
+        return bool(self.client_secret)
+
+    def close(self):
+        self.session.close()
+
+    def _expiring(self, now):
+        if not self.access_token:
+            return True
+        if self.expires_at is None:
+            return False
+        return self.expires_at - now < self.lifetime * REFRESH_FRACTION
+
+    def _still_valid(self, now):
+        return (bool(self.access_token) and self.expires_at is not None
+                and self.expires_at > now)
+
+    def _validation_due(self, now):
+        return (self.validated_at is not None
+                and now - self.validated_at > VALIDATE_INTERVAL_SECONDS)
+
+    def get_token(self):
+        """
+        Devuelve un token vigente, renovándolo antes si está por vencer.
+
+        Lanza RequestException solo si el token ya venció (o no hay) y no se
+        pudo obtener uno nuevo.
+        """
+        now = time.time()
+        if self.can_refresh and self._expiring(now):
+            with self.lock:
+                # Another thread may have refreshed while we waited
+                if self._expiring(time.time()):
+                    self._refresh_before_expiry()
+        elif self._validation_due(now):
+            with self.lock:
+                if self._validation_due(time.time()):
+                    self._validate_locked()
+        return self.access_token
+
+    def refresh(self):
+        """Pide un token nuevo por client credentials."""
+        with self.lock:
+            self._refresh_locked()
+        return self.access_token
+
+    def _refresh_before_expiry(self):
+        now = time.time()
+        still_valid = self._still_valid(now)
+        if (self.refresh_failed_at is not None
+                and now - self.refresh_failed_at < REFRESH_RETRY_SECONDS):
+            if still_valid:
+                return
+            raise requests.exceptions.RequestException(
+                "El token de Twitch venció y no se pudo renovar"
+            )
+        try:
+            self._refresh_locked()
+        except requests.exceptions.RequestException as e:
+            self.refresh_failed_at = now
+            if not still_valid:
+                raise
+            print(f"No se pudo renovar el token de Twitch, se sigue usando "
+                  f"el actual: {e}")
+
+    def _refresh_locked(self):
+        if not self.can_refresh:
+            raise requests.exceptions.RequestException(
+                "No hay CLIENT_SECRET para renovar el token"
+            )
+        response = self.session.post(
+            f"{self.oauth_url}token",
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "grant_type": "client_credentials",
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        now = time.time()
+        self.access_token = payload["access_token"]
+        self.lifetime = payload.get("expires_in")
+        self.expires_at = now + self.lifetime if self.lifetime else None
+        self.validated_at = now
+        self.refresh_failed_at = None
+        self.refresh_count += 1
+
+    def validate(self):
+        """
+        Valida el token contra Twitch y actualiza su vencimiento.
+
+        Devuelve True si el token es válido (o se pudo renovar), False si
+        Twitch lo rechazó y no hay forma de renovarlo, y None si no se pudo
+        consultar.
+        """
+        with self.lock:
+            return self._validate_locked()
+
+    def _validate_locked(self):
+        now = time.time()
+        try:
+            if not self.access_token:
+                self._refresh_locked()
+                return True
+            response = self.session.get(
+                f"{self.oauth_url}validate",
+                headers={"Authorization": f"OAuth {self.access_token}"},
+                timeout=self.timeout,
+            )
+            if response.status_code == 401:
+                if not self.can_refresh:
+                    return False
+                self._refresh_locked()
+                return True
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"No se pudo validar el token de Twitch: {e}")
+            # Try again on the next hourly check
+            self.validated_at = now
+            return None
+
+        expires_in = response.json().get("expires_in")
+        if expires_in:
+            self.lifetime = self.lifetime or expires_in
+            self.expires_at = now + expires_in
+        self.validated_at = now
+        return True
+
+    def handle_unauthorized(self, token):
+        """
+        Reacciona a un 401 obtenido con `token`.
+
+        Devuelve True si hay un token distinto con el que reintentar.
+        """
+        with self.lock:
+            if self.access_token != token:
+                # Already replaced by a concurrent refresh
+                return True
+            if not self.can_refresh:
+                return False
+            try:
+                self._refresh_locked()
+            except requests.exceptions.RequestException as e:
+                print(f"No se pudo renovar el token de Twitch: {e}")
+                return False
+            return True
+
+
+class TwitchClient:
+    def __init__(
+        self,
+        client_id,
+        access_token,
+        pool_size=10,
+        timeout=(3.05, 10),
+        max_retries=3,
+        backoff_base=0.5,
+        backoff_max=30.0,
+        rate_limit_share=1.0,
+        client_secret=None,
+        token_manager=None,
+        metrics=None,
+    ):
+        self.client_id = client_id
+        # Optional metrics.Metrics, fed with per-endpoint request stats
+        self.metrics = metrics
+        # The Authorization header is set per request from the current token
+        self.token_manager = token_manager or TokenManager(
+            client_id, client_secret, access_token
+        )
         self.headers = {
-            "Authorization": f"Bearer {self.access_token}",
             "Client-Id": self.client_id,
         }
         self.base_url = os.getenv("TWITCH_API_URL")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = RateLimiter(share=rate_limit_share)
+
+        # Keep-alive connections reused across every poll
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def access_token(self):
+        return self.token_manager.access_token
+
+    def close(self):
+        """Cierra las conexiones del pool."""
+        self.session.close()
+        self.token_manager.close()
+
+    def _backoff_delay(self, attempt):
+        """Backoff exponencial con jitter completo."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _request(self, method, endpoint, params=None, json=None):
+        """
+        Solicitud a Helix respetando el rate limit y reintentando ante 429/5xx
+        y errores de conexión. Ante un 401 renueva el token y reintenta una
+        vez. Lanza RequestException si se agotan los intentos.
+        """
+        url = f"{self.base_url}{endpoint}"
+        renewed_token = False
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            token = self.token_manager.get_token()
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method, url, params=params, json=json, timeout=self.timeout,
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                self._record_request(endpoint, started, error=e)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            self._record_request(endpoint, started, response=response)
+            self.rate_limiter.update_from_headers(response.headers)
+            if (response.status_code == 401 and not renewed_token
+                    and attempt < self.max_retries
+                    and self.token_manager.handle_unauthorized(token)):
+                renewed_token = True
+                continue
+            if (response.status_code in RETRY_STATUS_CODES
+                    and attempt < self.max_retries):
+                delay = self._backoff_delay(attempt)
+                if response.status_code == 429:
+                    until_reset = self.rate_limiter.seconds_until_reset(
+                        response.headers
+                    )
+                    if until_reset is not None:
+                        delay = max(delay, min(until_reset, self.backoff_max))
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response.json()
+
+    def _record_request(self, endpoint, started, response=None, error=None):
+        """Registra duración, resultado y margen de rate limit de un intento."""
+        if self.metrics is None:
+            return
+        self.metrics.observe(
+            "helix_request_duration_seconds",
+            time.perf_counter() - started,
+            endpoint=endpoint,
+        )
+        if error is not None:
+            self.metrics.inc(
+                "helix_errors_total", endpoint=endpoint,
+                kind=type(error).__name__,
+            )
+            return
+        self.metrics.inc(
+            "helix_requests_total", endpoint=endpoint,
+            status=response.status_code,
+        )
+        if response.status_code >= 400:
+            self.metrics.inc(
+                "helix_errors_total", endpoint=endpoint,
+                kind=str(response.status_code),
+            )
+        remaining = response.headers.get("Ratelimit-Remaining")
+        limit = response.headers.get("Ratelimit-Limit")
+        if remaining is not None:
+            self.metrics.set_gauge("ratelimit_remaining", remaining)
+        if limit is not None:
+            self.metrics.set_gauge("ratelimit_limit", limit)
+
+    def _get(self, endpoint, params):
+        return self._request("GET", endpoint, params=params)
+
+    def _post(self, endpoint, json):
+        return self._request("POST", endpoint, json=json)
 
     def get_user_id(self, username):
         """Obtiene el ID de usuario a partir del nombre de usuario."""
         try:
-            url = f"{self.base_url}users?login={username}"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json().get("data")
+            data = self._get("users", {"login": username}).get("data")
             if data:
                 return data[0]["id"]
             return None
@@ -26,14 +433,167 @@ class TwitchClient:
             print(f"Error en la API de Twitch (get_user_id): {e}")
             return None
 
+    def get_user_ids(self, logins):
+        """
+        Obtiene los IDs de varios usuarios con una solicitud cada 100 logins.
+
+        Devuelve un diccionario login -> ID solo con los canales encontrados.
+        """
+        # Helix answers with lowercase logins, keep the caller's spelling
+        requested = {}
+        for login in logins:
+            requested.setdefault(login.lower(), login)
+
+        user_ids = {}
+        for chunk in _chunks(list(requested)):
+            try:
+                params = [("login", login) for login in chunk]
+                payload = self._get("users", params)
+                for user in payload.get("data") or []:
+                    login = requested.get(user["login"].lower(), user["login"])
+                    user_ids[login] = user["id"]
+            except requests.exceptions.RequestException as e:
+                print(f"Error en la API de Twitch (get_user_ids): {e}")
+        return user_ids
+
     def is_channel_live(self, user_id):
-        """Verifica si un canal está en vivo usando su ID de usuario."""
+        """
+        Verifica si un canal está en vivo usando su ID de usuario.
+
+        Devuelve None si no se pudo consultar, para no confundir un error
+        con un canal offline.
+        """
         try:
-            url = f"{self.base_url}streams?user_id={user_id}"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json().get("data")
+            data = self._get("streams", {"user_id": user_id}).get("data")
             return bool(data)
         except requests.exceptions.RequestException as e:
             print(f"Error en la API de Twitch (is_channel_live): {e}")
-            return False
+            return None
+
+    def get_live_streams(self, user_ids):
+        """
+        Consulta qué canales están en vivo con una solicitud cada 100 IDs.
+
+        Devuelve un diccionario user_id -> datos del stream, solo con los
+        canales que están transmitiendo. Si algún bloque falla tras los
+        reintentos devuelve None, para que el llamador conserve el estado
+        anterior en vez de marcar los canales como offline.
+        """
+        live_streams = {}
+        for chunk in _chunks(list(dict.fromkeys(user_ids))):
+            params = [("user_id", user_id) for user_id in chunk]
+            params.append(("first", HELIX_MAX_IDS))
+            try:
+                payload = self._get("streams", params)
+            except requests.exceptions.RequestException as e:
+                print(f"Error en la API de Twitch (get_live_streams): {e}")
+                return None
+            for stream in payload.get("data") or []:
+                # Keep only what the registry reads, not tags or thumbnails
+                live_streams[stream["user_id"]] = {
+                    field: stream.get(field) for field in STREAM_FIELDS
+                }
+        return live_streams
+
+    def iter_followed_channels(self, user_id, page_size=HELIX_MAX_IDS):
+        """
+        Recorre los canales que sigue un usuario, una página por vez.
+
+        Genera diccionarios login -> ID a medida que llega cada página,
+        siguiendo el cursor de Helix, así que no hace falta esperar la lista
+        completa. Requiere un token de usuario con el scope
+        user:read:follows. Si una página falla se informa y se corta el
+        recorrido.
+        """
+        params = {"user_id": user_id, "first": page_size}
+        while True:
+            try:
+                payload = self._get("channels/followed", params)
+            except requests.exceptions.RequestException as e:
+                print(f"Error en la API de Twitch (get_followed_channels): {e}")
+                return
+            page = {
+                channel["broadcaster_login"]: channel["broadcaster_id"]
+                for channel in payload.get("data") or []
+            }
+            if page:
+                yield page
+            cursor = (payload.get("pagination") or {}).get("cursor")
+            if not cursor or not page:
+                return
+            params["after"] = cursor
+
+    def create_eventsub_subscription(self, event_type, user_id, session_id):
+        """
+        Crea una suscripción EventSub por websocket para un canal.
+
+        Devuelve los datos de la suscripción, o None si Twitch la rechaza
+        (por ejemplo, si el token no es de usuario).
+        """
+        body = {
+            "type": event_type,
+            "version": "1",
+            "condition": {"broadcaster_user_id": user_id},
+            "transport": {"method": "websocket", "session_id": session_id},
+        }
+        try:
+            data = self._post("eventsub/subscriptions", body).get("data")
+            return data[0] if data else None
+        except requests.exceptions.RequestException as e:
+            print(f"Error en la API de Twitch (eventsub {event_type}): {e}")
+            return None
+
+
+class AsyncTwitchClient:
+    """
+    Versión asyncio de TwitchClient.
+
+    Reutiliza la sesión con pool de un TwitchClient y ejecuta cada bloque de
+    100 IDs en un hilo, de modo que los bloques se consultan en paralelo,
+    limitados por un semáforo del tamaño del pool.
+    """
+
+    def __init__(self, twitch_client, max_concurrency=10):
+        self.client = twitch_client
+        self.max_concurrency = max_concurrency
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="helix"
+        )
+        self._semaphore = None
+
+    @property
+    def semaphore(self):
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, function, *args):
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+
+    async def get_live_streams(self, user_ids):
+        """
+        Consulta en paralelo qué canales están en vivo.
+
+        Igual que TwitchClient.get_live_streams, devuelve None si falla algún
+        bloque.
+        """
+        chunks = list(_chunks(list(dict.fromkeys(user_ids))))
+        results = await asyncio.gather(
+            *(self._run(self.client.get_live_streams, chunk) for chunk in chunks)
+        )
+        live_streams = {}
+        for result in results:
+            if result is None:
+                return None
+            live_streams.update(result)
+        return live_streams
+
+    async def create_eventsub_subscription(self, event_type, user_id, session_id):
+        """Crea una suscripción EventSub sin bloquear el bucle de eventos."""
+        return await self._run(
+            self.client.create_eventsub_subscription,
+            event_type, user_id, session_id,
+        )
@@ -0,0 +1,157 @@
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor
+
+STATE_PENDING = "pending"
+STATE_RESOLVED = "resolved"
+STATE_FAILED = "failed"
+
+STATE_BRUSHES = {
+    STATE_PENDING: QBrush(QColor(Qt.GlobalColor.gray)),
+    STATE_FAILED: QBrush(QColor(Qt.GlobalColor.red)),
+}
+STATE_SUFFIXES = {
+    STATE_PENDING: " (resolviendo...)",
+    STATE_FAILED: " (no encontrado)",
+}
+
+
+class ChannelListModel(QAbstractListModel):
+    """
+    Modelo de la lista de canales para un QListView.
+
+    Mantiene un índice canal -> fila, así que actualizar el estado de un
+    canal es O(1), y apply_status_changes() aplica todos los cambios de un
+    tick con una sola señal dataChanged.
+
+    Cada fila tiene además un estado de resolución del ID: pendiente,
+    resuelto o fallido.
+    """
+
+    LIVE_BRUSH = QBrush(QColor(Qt.GlobalColor.green))
+    OFFLINE_BRUSH = QBrush(QColor(Qt.GlobalColor.white))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._channels = []
+        self._live = []
+        self._states = []
+        self._rows = {}
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._channels)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            state = self._states[row]
+            return self._channels[row] + STATE_SUFFIXES.get(state, "")
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return STATE_BRUSHES.get(self._states[row])
+        if role == Qt.ItemDataRole.CheckStateRole:
+            if self._live[row]:
+                return Qt.CheckState.Checked
+            return Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.LIVE_BRUSH if self._live[row] else self.OFFLINE_BRUSH
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def row_of(self, channel):
+        """Fila de un canal, o None si no está en la lista."""
+        return self._rows.get(channel.lower())
+
+    def channel_at(self, row):
+        return self._channels[row]
+
+    def state_of(self, channel):
+        row = self.row_of(channel)
+        return None if row is None else self._states[row]
+
+    def add_channels(self, channels, state=STATE_PENDING):
+        """
+        Agrega varios canales con una sola inserción.
+
+        Devuelve los que no estaban en la lista.
+        """
+        new_channels = []
+        seen = set()
+        for channel in channels:
+            key = channel.lower()
+            if key not in self._rows and key not in seen:
+                seen.add(key)
+                new_channels.append(channel)
+        if not new_channels:
+            return new_channels
+
+        first = len(self._channels)
+        last = first + len(new_channels) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        for offset, channel in enumerate(new_channels):
+            self._rows[channel.lower()] = first + offset
+            self._channels.append(channel)
+            self._live.append(False)
+            self._states.append(state)
+        self.endInsertRows()
+        return new_channels
+
+    def add_channel(self, channel, state=STATE_PENDING):
+        self.add_channels([channel], state)
+
+    def remove_channel(self, channel):
+        """Quita un canal; devuelve False si no estaba en la lista."""
+        row = self.row_of(channel)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._channels[row]
+        del self._live[row]
+        del self._states[row]
+        del self._rows[channel.lower()]
+        # Rows below the removed one shift up by one
+        for later_row in range(row, len(self._channels)):
+            self._rows[self._channels[later_row].lower()] = later_row
+        self.endRemoveRows()
+        return True
+
+    def set_states(self, channels, state):
+        """Cambia el estado de resolución de varios canales a la vez."""
+        rows = []
+        for channel in channels:
+            row = self.row_of(channel)
+            if row is not None and self._states[row] != state:
+                self._states[row] = state
+                rows.append(row)
+        self._emit_changed(
+            rows, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole]
+        )
+
+    def apply_status_changes(self, changes):
+        """
+        Aplica una lista de (canal, en_vivo) y emite un único dataChanged
+        que cubre las filas modificadas.
+        """
+        rows = []
+        for channel, is_live in changes:
+            row = self.row_of(channel)
+            if row is None or self._live[row] == is_live:
+                continue
+            self._live[row] = is_live
+            rows.append(row)
+        self._emit_changed(
+            rows,
+            [Qt.ItemDataRole.CheckStateRole, Qt.ItemDataRole.BackgroundRole],
+        )
+
+    def _emit_changed(self, rows, roles):
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows)), self.index(max(rows)), roles
+            )
@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from twitch_client import HELIX_MAX_IDS
+
+
+class ChannelResolver(QObject):
+    """
+    Resuelve IDs de canales en un pool de hilos sin bloquear la GUI.
+
+    Los resultados se emiten por bloques a medida que llegan: primero los
+    que ya estaban en la caché y luego cada solicitud de hasta 100 logins.
+    Las señales se entregan en el hilo del objeto conectado, así que los
+    slots de la ventana pueden tocar widgets directamente.
+    """
+
+    resolved = pyqtSignal(dict)  # login -> ID
+    failed = pyqtSignal(list)    # logins sin ID
+    token_invalid = pyqtSignal()
+    imported = pyqtSignal(dict)             # página de canales seguidos
+    import_finished = pyqtSignal(str, int)  # usuario, canales importados
+    followed_user_missing = pyqtSignal(str)
+
+    def __init__(self, twitch_client, user_id_cache=None, max_workers=4,
+                 parent=None):
+        super().__init__(parent)
+        self.twitch_client = twitch_client
+        self.user_id_cache = user_id_cache
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="channel-resolver"
+        )
+
+    def resolve(self, channels):
+        """Encolar la resolución de los canales y volver enseguida."""
+        if channels:
+            self.executor.submit(self._resolve, list(channels))
+
+    def import_followed(self, login):
+        """Importar en segundo plano los canales que sigue un usuario."""
+        self.executor.submit(self._import_followed, login)
+
+    def validate_token(self):
+        """Validar el token de Twitch en segundo plano."""
+        self.executor.submit(self._validate_token)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve(self, channels):
+        missing = channels
+        if self.user_id_cache is not None:
+            cached, missing, stale = self.user_id_cache.lookup(channels)
+            if cached:
+                self.resolved.emit(cached)
+            if stale:
+                self.user_id_cache.refresh_in_background(
+                    stale, self.twitch_client
+                )
+
+        for start in range(0, len(missing), HELIX_MAX_IDS):
+            self.executor.submit(
+                self._fetch, missing[start:start + HELIX_MAX_IDS]
+            )
+
+    def _import_followed(self, login):
+        user_id = self.twitch_client.get_user_ids([login]).get(login)
+        if user_id is None:
+            self.followed_user_missing.emit(login)
+            return
+
+        imported = 0
+        # Every page already carries the IDs and is handed over as it
+        # arrives, one batch update per page
+        for page in self.twitch_client.iter_followed_channels(user_id):
+            if self.user_id_cache is not None:
+                self.user_id_cache.update(page)
+            self.imported.emit(page)
+            imported += len(page)
+        if imported and self.user_id_cache is not None:
+            self.user_id_cache.save()
+        self.import_finished.emit(login, imported)
+
+    def _validate_token(self):
+        if self.twitch_client.token_manager.validate() is False:
+            self.token_invalid.emit()
+
+    def _fetch(self, channels):
+        try:
+            user_ids = self.twitch_client.get_user_ids(channels)
+        except Exception:
+            user_ids = {}
+
+        if user_ids:
+            if self.user_id_cache is not None:
+                self.user_id_cache.update(user_ids)
+                self.user_id_cache.save()
+            self.resolved.emit(user_ids)
+
+        # Logins the API did not return, matching its case-insensitive lookup
+        found = {login.lower() for login in user_ids}
+        failed = [login for login in channels if login.lower() not in found]
+        if failed:
+            self.failed.emit(failed)
@@ -0,0 +1,37 @@
+import time
+from collections import deque
+
+DEFAULT_MAX_LINES = 5000
+
+
+class LogBuffer:
+    """
+    Buffer circular de líneas de log pendientes de mostrar.
+
+    Los mensajes se acumulan con su hora y se vuelcan todos juntos con
+    take_pending(); si llegan más de `max_lines` entre dos volcados se
+    descartan los más viejos, ya que la vista tampoco los conservaría.
+    """
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES):
+        self.max_lines = max_lines
+        self._pending = deque(maxlen=max_lines)
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def append(self, message):
+        """Agregar un mensaje con la hora actual."""
+        if len(self._pending) == self.max_lines:
+            self.dropped += 1
+        self._pending.append(f"[{time.strftime('%H:%M:%S')}] {message}")
+
+    def take_pending(self):
+        """Devolver las líneas pendientes en un solo texto y vaciar el buffer."""
+        text = "\n".join(self._pending)
+        self._pending.clear()
+        return text
+
+    def clear(self):
+        self._pending.clear()
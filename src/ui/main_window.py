@@ -1,108 +1,216 @@
 import sys
 import os
+import queue
+import threading
+import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QListWidget, QListWidgetItem, QLabel,
-    QTextEdit, QGroupBox, QGridLayout, QMessageBox, QSpinBox,
-    QCheckBox, QSplitter, QFrame
+    QPushButton, QLineEdit, QListView, QLabel,
+    QPlainTextEdit, QGroupBox, QGridLayout, QMessageBox, QSpinBox,
+    QCheckBox, QSplitter, QFrame, QFileDialog, QInputDialog
 )
 from PyQt6.QtCore import QThread, pyqtSignal, QTimer, Qt
 from PyQt6.QtGui import QFont, QIcon, QPixmap
 
 from twitch_client import TwitchClient
-from notifications import Notifier
+from notifications import Notifier, NotificationDispatcher
 from scheduler import TaskScheduler
+from user_cache import UserIdCache, default_cache_dir
+from state_journal import StateJournal
+from metrics import Metrics, TickProfiler
+from channel_import import read_channel_file
+from registry import (
+    ChannelRegistry, StreamEvent, EVENT_LIVE, EVENT_OFFLINE, EVENT_RESTART,
+    EVENT_RESTORED, describe_event
+)
+from ui.channel_model import (
+    ChannelListModel, STATE_PENDING, STATE_RESOLVED, STATE_FAILED
+)
+from ui.channel_resolver import ChannelResolver
+from ui.log_buffer import LogBuffer, DEFAULT_MAX_LINES
 
 
 class TwitchMonitorThread(QThread):
-    """Hilo separado para monitorear los canales de Twitch."""
+    """
+    Hilo separado para monitorear los canales de Twitch.
+
+    Entre consultas espera sobre un evento en lugar de dormir, así que
+    stop() y los cambios de configuración se atienden al instante. Los
+    cambios de intervalo y de canales llegan por una cola de comandos y los
+    aplica el propio hilo, de modo que el registro nunca se modifica
+    mientras se recorre.
+    """
     
-    channel_status_changed = pyqtSignal(str, str, bool)  # canal, estado, en_vivo
+    # Every StreamEvent of a tick, in one emit
+    channels_status_changed = pyqtSignal(list)
     log_message = pyqtSignal(str)
     
-    def __init__(self, twitch_client, channels, interval_minutes):
+    def __init__(self, twitch_client, interval_minutes, state_journal=None,
+                 metrics=None, profiler=None):
         super().__init__()
         self.twitch_client = twitch_client
-        self.channels = channels
         self.interval_minutes = interval_minutes
+        self.state_journal = state_journal
+        self.metrics = metrics
+        self.profiler = profiler or TickProfiler()
         self.running = False
-        self.channels_state = {}
-        self.channels_user_ids = {}
-        
-        # Init channel states
-        for channel in channels:
-            user_id = self.twitch_client.get_user_id(channel)
-            if user_id:
-                self.channels_user_ids[channel] = user_id
-                self.channels_state[channel] = False
-                self.log_message.emit(f"Canal '{channel}' configurado (ID: {user_id})")
-            else:
-                self.log_message.emit(f"Error: No se pudo obtener ID del canal '{channel}'")
-    
+        # Channels arrive already resolved through add_channels(), the IDs
+        # are looked up by ChannelResolver off the GUI thread
+        self.registry = ChannelRegistry()
+        self.commands = queue.Queue()
+        self.wakeup = threading.Event()
+
     def run(self):
         """Ejecutar el monitoreo en bucle."""
         self.running = True
+        last_check = None
         while self.running:
-            self.check_channels()
-            self.sleep(self.interval_minutes * 60)
+            # Clear before draining, so a command posted meanwhile still
+            # cuts the wait short
+            self.wakeup.clear()
+            self.apply_commands()
+            if not self.running:
+                break
+
+            interval = self.interval_minutes * 60
+            now = time.monotonic()
+            if last_check is None or now - last_check >= interval:
+                last_check = now
+                self.run_tick()
+                now = time.monotonic()
+
+            self.wakeup.wait(max(0, last_check + interval - now))
     
     def stop(self):
         """Detener el monitoreo."""
         self.running = False
+        self.wakeup.set()
+
+    def post_command(self, command, *args):
+        """Encolar un cambio para que lo aplique el hilo de monitoreo."""
+        self.commands.put((command, *args))
+        self.wakeup.set()
+
+    def apply_commands(self):
+        """Aplicar los cambios pendientes de la cola de comandos."""
+        while True:
+            try:
+                command, *args = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            if command == "interval":
+                self.interval_minutes = args[0]
+            elif command == "add":
+                self.add_to_registry(args[0])
+            elif command == "remove" and self.registry.remove(args[0]):
+                self.log_message.emit(f"Canal '{args[0]}' removido")
+
+    def add_to_registry(self, user_ids_by_login):
+        """Agregar canales al registro con su estado guardado, si lo hay."""
+        restored = []
+        for channel, user_id in user_ids_by_login.items():
+            record = self.registry.add(channel, user_id)
+            if self.state_journal is None:
+                continue
+            if not self.state_journal.restore(record):
+                continue
+            self.registry.track(record)
+            if record.is_live:
+                restored.append(StreamEvent(
+                    EVENT_RESTORED, record.login, None, record.stream_id
+                ))
+        if restored:
+            self.log_message.emit(
+                f"{len(restored)} canal(es) seguían en vivo en la sesión anterior"
+            )
+            self.channels_status_changed.emit(restored)
+
+    def set_interval(self, interval_minutes):
+        """Cambiar el intervalo sin reiniciar el hilo."""
+        self.post_command("interval", interval_minutes)
     
+    def run_tick(self):
+        """Verificar los canales midiendo el tick para las estadísticas."""
+        started = time.perf_counter()
+        with self.profiler.tick():
+            self.check_channels()
+        if self.metrics is not None:
+            self.metrics.observe(
+                "tick_duration_seconds", time.perf_counter() - started
+            )
+            self.metrics.set_gauge("tick_channels", len(self.registry))
+            self.metrics.inc("ticks_total")
+
+    def count_poll_error(self):
+        if self.metrics is not None:
+            self.metrics.inc("poll_errors_total")
+
     def check_channels(self):
         """Verificar el estado de todos los canales."""
-        if not self.channels_user_ids:
+        self.apply_commands()
+        if not self.registry:
             return
-            
-        for channel, user_id in self.channels_user_ids.items():
+
+        try:
+            live_streams = self.twitch_client.get_live_streams(
+                self.registry.user_ids()
+            )
+        except Exception as e:
+            self.count_poll_error()
+            self.log_message.emit(f"Error verificando canales: {str(e)}")
+            return
+
+        if live_streams is None:
+            self.registry.record_failure()
+            self.count_poll_error()
+            self.log_message.emit(
+                "No se pudo consultar Twitch; se mantiene el estado anterior"
+            )
+            return
+
+        self.registry.clear_failures()
+
+        now = time.time()
+        tick_events = []
+        # Channels that were and still are offline have nothing to update
+        for record, stream in self.registry.live_candidates(live_streams):
+            channel = record.login
             try:
-                is_live_now = self.twitch_client.is_channel_live(user_id)
-                was_live_before = self.channels_state.get(channel, False)
-                
-                if is_live_now != was_live_before:
-                    self.channels_state[channel] = is_live_now
-                    status = "EN VIVO" if is_live_now else "OFFLINE"
-                    self.channel_status_changed.emit(channel, status, is_live_now)
-                    
-                    if is_live_now:
-                        self.log_message.emit(f"¡{channel} acaba de empezar a transmitir!")
-                    else:
-                        self.log_message.emit(f"{channel} ya no está en vivo.")
+                events = self.registry.apply(
+                    record, stream is not None, stream, now
+                )
+                for event in events:
+                    self.log_message.emit(describe_event(record, event))
+                if events and self.state_journal is not None:
+                    self.state_journal.record(record, now)
+                tick_events.extend(events)
                         
             except Exception as e:
                 self.log_message.emit(f"Error verificando {channel}: {str(e)}")
+
+        if self.state_journal is not None:
+            # One journal write per tick with every change
+            self.state_journal.flush(now)
+
+        if tick_events:
+            self.channels_status_changed.emit(tick_events)
     
-    def add_channel(self, channel):
-        """Agregar un nuevo canal al monitoreo."""
-        if channel in self.channels_user_ids:
-            return False
-            
-        user_id = self.twitch_client.get_user_id(channel)
-        if user_id:
-            self.channels_user_ids[channel] = user_id
-            self.channels_state[channel] = False
-            self.channels.append(channel)
-            self.log_message.emit(f"Canal '{channel}' agregado correctamente")
-            return True
-        else:
-            self.log_message.emit(f"Error: No se pudo obtener ID del canal '{channel}'")
-            return False
+    def add_channels(self, user_ids_by_login):
+        """Agregar al monitoreo canales con su ID ya resuelto."""
+        self.post_command("add", dict(user_ids_by_login))
     
     def remove_channel(self, channel):
         """Remover un canal del monitoreo."""
-        if channel in self.channels_user_ids:
-            del self.channels_user_ids[channel]
-            del self.channels_state[channel]
-            self.channels.remove(channel)
-            self.log_message.emit(f"Canal '{channel}' removido")
-            return True
-        return False
+        self.post_command("remove", channel)
 
 
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación."""
     
+    LOG_FLUSH_INTERVAL_MS = 200
+    # Bigger batches of resolved channels are logged as a single line
+    LOG_EACH_CHANNEL_MAX = 10
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Twitch Stream Notifier")
@@ -110,9 +218,12 @@ class MainWindow(QMainWindow):
         
         # Loads environment variables
         self.load_environment()
+        # Request and tick statistics shown in the stats panel
+        self.metrics = Metrics()
         
         # Init components
         self.init_ui()
+        self.init_notifier()
         self.init_twitch_client()
         self.init_monitor_thread()
         
@@ -128,10 +239,23 @@ class MainWindow(QMainWindow):
         
         self.client_id = os.getenv("CLIENT_ID")
         self.access_token = os.getenv("ACCESS_TOKEN")
+        self.client_secret = os.getenv("CLIENT_SECRET")
         self.interval_minutes = int(os.getenv("INTERVAL_MINUTES", "5"))
+        self.user_id_cache_path = os.getenv("USER_ID_CACHE_PATH")
+        self.user_id_cache_ttl_hours = float(
+            os.getenv("USER_ID_CACHE_TTL_HOURS", "168")
+        )
+        self.log_max_lines = int(os.getenv("LOG_MAX_LINES", DEFAULT_MAX_LINES))
+        self.state_path = os.getenv("STATE_PATH") or os.path.join(
+            default_cache_dir(), StateJournal.FILENAME
+        )
+        self.profile_ticks = os.getenv("PROFILE_TICKS")
+        self.profile_dir = os.getenv("PROFILE_DIR")
         
         channels_str = os.getenv("CHANNELS_TO_CHECK", "")
         self.initial_channels = [ch.strip() for ch in channels_str.split(",") if ch.strip()]
+        self.channels_file = os.getenv("CHANNELS_FILE")
+        self.followed_by = os.getenv("FOLLOWED_BY")
     
     def init_ui(self):
         """Inicializar la interfaz de usuario."""
@@ -165,8 +289,12 @@ class MainWindow(QMainWindow):
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         layout.addWidget(title)
         
-        self.channels_list = QListWidget()
-        self.channels_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
+        self.channels_model = ChannelListModel(self)
+        self.channels_list = QListView()
+        self.channels_list.setModel(self.channels_model)
+        self.channels_list.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        # Every row has the same height, so the view skips measuring them
+        self.channels_list.setUniformItemSizes(True)
         layout.addWidget(self.channels_list)
         
         controls_layout = QHBoxLayout()
@@ -185,6 +313,18 @@ class MainWindow(QMainWindow):
         remove_btn.clicked.connect(self.remove_selected_channel)
         layout.addWidget(remove_btn)
         
+        import_layout = QHBoxLayout()
+        
+        import_file_btn = QPushButton("Importar archivo...")
+        import_file_btn.clicked.connect(self.import_channels_file)
+        import_layout.addWidget(import_file_btn)
+        
+        import_followed_btn = QPushButton("Importar seguidos...")
+        import_followed_btn.clicked.connect(self.ask_followed_import)
+        import_layout.addWidget(import_followed_btn)
+        
+        layout.addLayout(import_layout)
+        
         # Interval settings
         interval_group = QGroupBox("Configuración")
         interval_layout = QGridLayout(interval_group)
@@ -219,29 +359,84 @@ class MainWindow(QMainWindow):
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         layout.addWidget(title)
         
-        self.log_area = QTextEdit()
+        # Plain text view capped at log_max_lines, the oldest lines are
+        # dropped as new ones arrive
+        self.log_area = QPlainTextEdit()
         self.log_area.setReadOnly(True)
         self.log_area.setFont(QFont("Monospace", 10))
+        self.log_area.setMaximumBlockCount(self.log_max_lines)
         layout.addWidget(self.log_area)
         
+        # Messages are buffered and flushed together, so a burst of log
+        # lines costs a single repaint
+        self.log_buffer = LogBuffer(self.log_max_lines)
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self.log_flush_timer.timeout.connect(self.flush_logs)
+        
         clear_btn = QPushButton("Limpiar Logs")
         clear_btn.clicked.connect(self.clear_logs)
         layout.addWidget(clear_btn)
         
+        layout.addWidget(self.create_stats_group())
+        
         return panel
     
+    def create_stats_group(self):
+        """Crear el recuadro de estadísticas de sondeo."""
+        stats_group = QGroupBox("Estadísticas")
+        stats_layout = QGridLayout(stats_group)
+        self.stats_labels = {}
+        rows = [
+            ("requests", "Solicitudes a Twitch:"),
+            ("latency", "Latencia media:"),
+            ("tick", "Duración del tick:"),
+            ("channels", "Canales por tick:"),
+            ("ratelimit", "Rate limit restante:"),
+            ("notifications", "Notificaciones en cola:"),
+            ("errors", "Errores:"),
+        ]
+        for row, (key, text) in enumerate(rows):
+            stats_layout.addWidget(QLabel(text), row, 0)
+            value_label = QLabel("-")
+            stats_layout.addWidget(value_label, row, 1)
+            self.stats_labels[key] = value_label
+        return stats_group
+    
+    def init_notifier(self):
+        """Inicializar el despachador de notificaciones en segundo plano."""
+        script_dir = os.path.dirname(os.path.dirname(__file__))
+        assets_dir = os.path.join(script_dir, "..", "assets")
+        icon_path = os.path.join(assets_dir, "twitch.png")
+        sound_path = os.path.join(assets_dir, "alert.wav")
+        self.notifier = NotificationDispatcher(Notifier(icon_path, sound_path))
+        self.metrics.register_gauge(
+            "notification_queue_depth", self.notifier.backlog
+        )
+
     def init_twitch_client(self):
         """Inicializar el cliente de Twitch."""
-        if not self.client_id or not self.access_token:
+        if not self.client_id or not (self.access_token or self.client_secret):
             QMessageBox.warning(
                 self, 
                 "Error de Configuración",
-                "CLIENT_ID o ACCESS_TOKEN no están configurados en el archivo .env"
+                "Configura CLIENT_ID y ACCESS_TOKEN o CLIENT_SECRET en el "
+                "archivo .env"
             )
             return
         
         try:
-            self.twitch_client = TwitchClient(self.client_id, self.access_token)
+            self.twitch_client = TwitchClient(
+                self.client_id,
+                self.access_token,
+                client_secret=self.client_secret,
+                metrics=self.metrics,
+            )
+            self.user_id_cache = UserIdCache(
+                self.user_id_cache_path,
+                ttl_seconds=self.user_id_cache_ttl_hours * 3600,
+            )
             self.log_message("Cliente de Twitch inicializado correctamente")
         except Exception as e:
             QMessageBox.critical(
@@ -254,17 +449,41 @@ class MainWindow(QMainWindow):
         """Inicializar el hilo de monitoreo."""
         self.monitor_thread = TwitchMonitorThread(
             self.twitch_client, 
-            self.initial_channels.copy(), 
-            self.interval_minutes
+            self.interval_minutes,
+            state_journal=StateJournal(self.state_path),
+            metrics=self.metrics,
+            profiler=TickProfiler(self.profile_ticks, self.profile_dir),
         )
         
         # Conect signals
-        self.monitor_thread.channel_status_changed.connect(self.on_channel_status_changed)
+        self.monitor_thread.channels_status_changed.connect(
+            self.on_channels_status_changed
+        )
         self.monitor_thread.log_message.connect(self.log_message)
         
-        # Load initial channels into the list
-        for channel in self.initial_channels:
-            self.add_channel_to_list(channel)
+        self.channel_resolver = ChannelResolver(
+            self.twitch_client,
+            user_id_cache=getattr(self, "user_id_cache", None),
+            parent=self,
+        )
+        self.channel_resolver.resolved.connect(self.on_channels_resolved)
+        self.channel_resolver.failed.connect(self.on_channels_failed)
+        self.channel_resolver.token_invalid.connect(self.on_token_invalid)
+        self.channel_resolver.imported.connect(self.on_channels_imported)
+        self.channel_resolver.import_finished.connect(self.on_import_finished)
+        self.channel_resolver.followed_user_missing.connect(
+            self.on_followed_user_missing
+        )
+        self.channel_resolver.validate_token()
+        
+        # Initial channels show up as pending right away, their IDs are
+        # resolved in the background
+        self.channels_model.add_channels(self.initial_channels)
+        self.channel_resolver.resolve(self.initial_channels)
+        if self.channels_file:
+            self.import_channels_from(self.channels_file)
+        if self.followed_by:
+            self.import_followed(self.followed_by)
     
     def add_channel(self):
         """Agregar un canal desde la interfaz."""
@@ -272,28 +491,117 @@ class MainWindow(QMainWindow):
         if not channel:
             return
         
-        if self.monitor_thread.add_channel(channel):
+        state = self.channels_model.state_of(channel)
+        if state is None:
             self.add_channel_to_list(channel)
-            self.channel_input.clear()
+        elif state == STATE_FAILED:
+            # Retry a channel whose lookup failed before
+            self.channels_model.set_states([channel], STATE_PENDING)
         else:
-            QMessageBox.warning(self, "Error", f"No se pudo agregar el canal '{channel}'")
+            QMessageBox.warning(self, "Error", f"El canal '{channel}' ya está en la lista")
+            return
+        
+        self.channel_resolver.resolve([channel])
+        self.channel_input.clear()
+    
+    def import_channels_file(self):
+        """Elegir un archivo de canales e importarlo."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Importar canales", "", "Texto (*.txt *.csv);;Todos (*)"
+        )
+        if path:
+            self.import_channels_from(path)
+    
+    def import_channels_from(self, path):
+        """Agregar de una vez los canales de un archivo, uno por línea."""
+        try:
+            channels = read_channel_file(path)
+        except OSError as e:
+            self.log_message(f"Error: No se pudo leer {path}: {e}")
+            return
+        # One insert for the whole file, IDs resolve in batches of 100
+        new_channels = self.channels_model.add_channels(channels)
+        self.channel_resolver.resolve(new_channels)
+        self.log_message(
+            f"{len(new_channels)} canal(es) nuevos de "
+            f"{os.path.basename(path)}, resolviendo IDs..."
+        )
+    
+    def ask_followed_import(self):
+        """Pedir un usuario e importar los canales que sigue."""
+        login, accepted = QInputDialog.getText(
+            self, "Importar seguidos", "Usuario de Twitch:"
+        )
+        if accepted and login.strip():
+            self.import_followed(login.strip())
+    
+    def import_followed(self, login):
+        self.log_message(f"Importando los canales que sigue '{login}'...")
+        self.channel_resolver.import_followed(login)
     
     def add_channel_to_list(self, channel):
         """Agregar un canal a la lista visual."""
-        item = QListWidgetItem(channel)
-        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-        item.setCheckState(Qt.CheckState.Unchecked)
-        self.channels_list.addItem(item)
+        self.channels_model.add_channel(channel)
     
     def remove_selected_channel(self):
         """Remover el canal seleccionado."""
-        current_item = self.channels_list.currentItem()
-        if not current_item:
+        current_index = self.channels_list.currentIndex()
+        if not current_index.isValid():
             return
         
-        channel = current_item.text()
-        if self.monitor_thread.remove_channel(channel):
-            self.channels_list.takeItem(self.channels_list.row(current_item))
+        channel = self.channels_model.channel_at(current_index.row())
+        # Channels still pending or failed are only in the list
+        self.monitor_thread.remove_channel(channel)
+        self.channels_model.remove_channel(channel)
+    
+    def on_channels_resolved(self, user_ids):
+        """Agregar al monitoreo los canales cuyo ID ya se resolvió."""
+        # Skip channels removed from the list while they were resolving
+        user_ids = {
+            channel: user_id for channel, user_id in user_ids.items()
+            if self.channels_model.row_of(channel) is not None
+        }
+        self.monitor_thread.add_channels(user_ids)
+        self.channels_model.set_states(user_ids, STATE_RESOLVED)
+        if len(user_ids) > self.LOG_EACH_CHANNEL_MAX:
+            self.log_message(f"{len(user_ids)} canales configurados")
+            return
+        for channel, user_id in user_ids.items():
+            self.log_message(f"Canal '{channel}' configurado (ID: {user_id})")
+    
+    def on_channels_imported(self, user_ids):
+        """Agregar una página de canales seguidos, que ya traen su ID."""
+        new_channels = self.channels_model.add_channels(
+            user_ids, STATE_RESOLVED
+        )
+        self.monitor_thread.add_channels(
+            {channel: user_ids[channel] for channel in new_channels}
+        )
+    
+    def on_import_finished(self, login, count):
+        self.log_message(f"{count} canal(es) seguidos por '{login}' importados")
+    
+    def on_followed_user_missing(self, login):
+        self.log_message(f"Error: No se encontró el usuario '{login}'")
+        QMessageBox.warning(
+            self, "Importar seguidos", f"No se encontró el usuario '{login}'"
+        )
+    
+    def on_token_invalid(self):
+        """Avisar que el token fijo del .env ya no sirve."""
+        self.log_message("Error: ACCESS_TOKEN no es válido o venció")
+        QMessageBox.warning(
+            self,
+            "Token inválido",
+            "ACCESS_TOKEN no es válido o venció. Configura CLIENT_SECRET en el "
+            "archivo .env para obtener y renovar el token automáticamente."
+        )
+    
+    def on_channels_failed(self, channels):
+        """Marcar los canales cuyo ID no se pudo obtener."""
+        self.channels_model.set_states(channels, STATE_FAILED)
+        for channel in channels:
+            self.log_message(f"Error: No se pudo obtener ID del canal '{channel}'")
     
     def toggle_monitoring(self):
         """Alternar entre iniciar y detener el monitoreo."""
@@ -310,63 +618,99 @@ class MainWindow(QMainWindow):
     def change_interval(self, value):
         """Cambiar el intervalo de monitoreo."""
         self.interval_minutes = value
-        if self.monitor_thread.isRunning():
-            self.monitor_thread.stop()
-            self.monitor_thread.wait()
-            self.monitor_thread.interval_minutes = value
-            self.monitor_thread.start()
+        # Applied by the running thread, no restart needed
+        self.monitor_thread.set_interval(value)
         self.log_message(f"Intervalo cambiado a {value} minutos")
     
-    def on_channel_status_changed(self, channel, status, is_live):
-        """Manejar cambios de estado de canales."""
-        # Update the visual state in the list
-        for i in range(self.channels_list.count()):
-            item = self.channels_list.item(i)
-            if item.text() == channel:
-                if is_live:
-                    item.setCheckState(Qt.CheckState.Checked)
-                    item.setBackground(Qt.GlobalColor.green)
-                else:
-                    item.setCheckState(Qt.CheckState.Unchecked)
-                    item.setBackground(Qt.GlobalColor.white)
-                break
-        
-        # Send notification if live
-        if is_live:
-            try:
-                script_dir = os.path.dirname(os.path.dirname(__file__))
-                assets_dir = os.path.join(script_dir, "..", "assets")
-                icon_path = os.path.join(assets_dir, "twitch.png")
-                sound_path = os.path.join(assets_dir, "alert.wav")
-                
-                notifier = Notifier(icon_path, sound_path)
-                notifier.notify_live(channel)
-            except Exception as e:
-                self.log_message(f"Error enviando notificación: {str(e)}")
+    def on_channels_status_changed(self, events):
+        """Manejar los cambios de estado de canales de un tick."""
+        # One dataChanged for the whole tick instead of a repaint per channel
+        self.channels_model.apply_status_changes([
+            (event.login, event.kind != EVENT_OFFLINE)
+            for event in events
+            if event.kind in (
+                EVENT_LIVE, EVENT_OFFLINE, EVENT_RESTART, EVENT_RESTORED
+            )
+        ])
+        
+        # Queue the notifications, the dispatcher thread sends them; a
+        # restart is the same broadcast and was already notified
+        live_channels = [
+            event.login for event in events if event.kind == EVENT_LIVE
+        ]
+        if len(live_channels) == 1:
+            self.notifier.notify_live(live_channels[0])
+        elif live_channels:
+            self.notifier.notify_live_many(live_channels)
     
     def log_message(self, message):
         """Agregar mensaje al área de logs."""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_area.append(f"[{timestamp}] {message}")
-        
-        # Auto-scroll at the end
-        scrollbar = self.log_area.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        self.log_buffer.append(message)
+        if not self.log_flush_timer.isActive():
+            self.log_flush_timer.start()
+    
+    def flush_logs(self):
+        """Volcar los mensajes pendientes al área de logs."""
+        if not self.log_buffer:
+            return
+        # The view keeps following new lines while scrolled to the bottom
+        self.log_area.appendPlainText(self.log_buffer.take_pending())
     
     def clear_logs(self):
         """Limpiar el área de logs."""
+        self.log_buffer.clear()
         self.log_area.clear()
     
     def update_ui(self):
         """Actualizar la interfaz de usuario."""
-        pass
+        self.update_stats()
+    
+    def update_stats(self):
+        """Refrescar el recuadro de estadísticas con las métricas actuales."""
+        metrics = self.metrics
+        labels = self.stats_labels
+        labels["requests"].setText(
+            str(metrics.counter_total("helix_requests_total"))
+        )
+        latencies = sorted(
+            (series["endpoint"], histogram.average)
+            for series, histogram in metrics.histograms_named(
+                "helix_request_duration_seconds"
+            )
+        )
+        labels["latency"].setText(", ".join(
+            f"{endpoint} {average * 1000:.0f} ms"
+            for endpoint, average in latencies
+        ) or "-")
+        tick = metrics.histogram("tick_duration_seconds")
+        if tick is not None:
+            labels["tick"].setText(
+                f"{tick.average * 1000:.0f} ms promedio, "
+                f"{tick.max * 1000:.0f} ms máx. ({tick.count} ticks)"
+            )
+        channels = metrics.gauge("tick_channels")
+        labels["channels"].setText("-" if channels is None else str(channels))
+        remaining = metrics.gauge("ratelimit_remaining")
+        limit = metrics.gauge("ratelimit_limit")
+        if remaining is not None:
+            labels["ratelimit"].setText(f"{remaining} / {limit or '?'}")
+        labels["notifications"].setText(
+            str(metrics.gauge("notification_queue_depth"))
+        )
+        errors = (metrics.counter_total("helix_errors_total")
+                  + metrics.counter_total("poll_errors_total"))
+        labels["errors"].setText(str(errors))
     
     def closeEvent(self, event):
         """Manejar el cierre de la ventana."""
         if hasattr(self, 'monitor_thread') and self.monitor_thread.isRunning():
             self.monitor_thread.stop()
             self.monitor_thread.wait()
+        if hasattr(self, 'channel_resolver'):
+            self.channel_resolver.close()
+        if hasattr(self, 'twitch_client'):
+            self.twitch_client.close()
+        self.notifier.close()
         event.accept()
 
 
@@ -0,0 +1,144 @@
+import json
+import os
+import platform
+import threading
+import time
+
+APP_NAME = "twitch-stream-notifier"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def default_cache_dir():
+    """Directorio de caché del usuario según el sistema operativo."""
+    system = platform.system()
+    if system == "Windows":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    elif system == "Darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, APP_NAME)
+
+
+class UserIdCache:
+    """
+    Caché persistente login -> ID de Twitch guardada como JSON.
+
+    Las entradas vencidas se siguen usando para no bloquear el arranque y se
+    revalidan en segundo plano; solo los logins desconocidos se consultan
+    antes de devolver el resultado.
+    """
+
+    def __init__(self, path=None, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.path = path or os.path.join(default_cache_dir(), "user_ids.json")
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        # Several resolver threads may save at once; writes go one at a time
+        self.save_lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        # Entries are [user_id, resolved_at] pairs, the most compact shape
+        # JSON gives us; older files stored one dict per entry
+        return {
+            login: (
+                [entry["id"], entry["resolved_at"]]
+                if isinstance(entry, dict) else entry
+            )
+            for login, entry in entries.items()
+        }
+
+    def save(self):
+        """Escribe la caché de forma atómica."""
+        with self.lock:
+            data = json.dumps(self.entries)
+        try:
+            with self.save_lock:
+                # A bare file name has no directory to create
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                    cache_file.write(data)
+                os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"No se pudo guardar la caché de IDs: {e}")
+
+    def get(self, login):
+        """Devuelve el ID guardado para un login, aunque esté vencido."""
+        entry = self.entries.get(login.lower())
+        return entry[0] if entry else None
+
+    def is_stale(self, login):
+        entry = self.entries.get(login.lower())
+        if not entry:
+            return True
+        return time.time() - entry[1] > self.ttl_seconds
+
+    def update(self, user_ids):
+        """Guarda un diccionario login -> ID con la fecha actual."""
+        now = time.time()
+        with self.lock:
+            for login, user_id in user_ids.items():
+                self.entries[login.lower()] = [user_id, now]
+
+    def lookup(self, logins):
+        """
+        Separa los logins según la caché, sin consultar la API.
+
+        Devuelve (login -> ID conocidos, logins sin ID, logins vencidos).
+        """
+        user_ids = {}
+        missing = []
+        stale = []
+        for login in logins:
+            user_id = self.get(login)
+            if user_id is None:
+                missing.append(login)
+                continue
+            user_ids[login] = user_id
+            if self.is_stale(login):
+                stale.append(login)
+        return user_ids, missing, stale
+
+    def resolve(self, logins, twitch_client):
+        """
+        Devuelve login -> ID para los logins indicados.
+
+        Solo consulta la API por los logins que no están en caché; los
+        vencidos se devuelven igualmente y se revalidan en un hilo aparte.
+        """
+        user_ids, missing, stale = self.lookup(logins)
+
+        if missing:
+            fetched = twitch_client.get_user_ids(missing)
+            if fetched:
+                self.update(fetched)
+                self.save()
+            user_ids.update(fetched)
+
+        if stale:
+            self.refresh_in_background(stale, twitch_client)
+        return user_ids
+
+    def refresh_in_background(self, logins, twitch_client):
+        """Revalida logins vencidos sin bloquear al llamador."""
+        def refresh():
+            fetched = twitch_client.get_user_ids(logins)
+            if fetched:
+                self.update(fetched)
+                self.save()
+
+        thread = threading.Thread(
+            target=refresh, name="user-id-cache-refresh", daemon=True
+        )
+        thread.start()
+        return thread
@@ -0,0 +1,10 @@
+import pytest
+
+from benchmarks.mock_helix import MockHelixServer
+
+
+@pytest.fixture
+def helix_server():
+    """Servidor Helix simulado con 20 canales, todos offline."""
+    with MockHelixServer(channels=20, live_ratio=0.0, seed=1) as server:
+        yield server
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+from benchmarks.mock_eventsub import MockEventSubServer
+from src.eventsub import EventSubClient
+from src.twitch_client import AsyncTwitchClient, TwitchClient
+
+USER_IDS = ["1", "2", "3"]
+
+
+async def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def run_session(server, steps):
+    """Abre una sesión contra el servidor simulado y corre `steps`."""
+    twitch_client = TwitchClient("mock-client", "mock-token")
+    twitch_client.base_url = server.api_url
+    online = []
+    eventsub = EventSubClient(
+        AsyncTwitchClient(twitch_client),
+        lambda user_id, event: online.append(user_id),
+        lambda user_id, event: None,
+        ws_url=server.ws_url, max_backoff=0.1,
+    )
+    session = asyncio.create_task(eventsub.run(USER_IDS))
+    try:
+        await steps(eventsub, online)
+    finally:
+        session.cancel()
+        twitch_client.close()
+
+
+def test_rejected_subscriptions_are_reported():
+    with MockEventSubServer(rejected_user_ids=["2"]) as server:
+        async def steps(eventsub, online):
+            await wait_until(lambda: len(server.subscriptions) == 4)
+            await wait_until(lambda: eventsub.unsubscribed == {"2"})
+
+            server.trigger("stream.online", "1")
+            await wait_until(lambda: online == ["1"])
+
+        asyncio.run(run_session(server, steps))
+
+
+def test_revoked_subscription_is_reported():
+    with MockEventSubServer() as server:
+        async def steps(eventsub, online):
+            await wait_until(lambda: len(server.subscriptions) == 6)
+            assert eventsub.unsubscribed == set()
+
+            assert server.revoke("stream.online", "3")
+            await wait_until(lambda: eventsub.unsubscribed == {"3"})
+
+        asyncio.run(run_session(server, steps))
+
+
+def test_lost_session_reports_every_channel():
+    server = MockEventSubServer().start()
+
+    async def steps(eventsub, online):
+        await wait_until(lambda: len(server.subscriptions) == 6)
+        # stop() blocks until the close handshake, which needs this loop
+        await asyncio.get_running_loop().run_in_executor(None, server.stop)
+        await wait_until(lambda: eventsub.unsubscribed == set(USER_IDS))
+
+    asyncio.run(run_session(server, steps))
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from src import main
+from src.metrics import Metrics, TickProfiler
+from src.registry import ChannelRegistry
+from src.state_journal import StateJournal
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.notified = []
+
+    def notify_live_many(self, channel_names):
+        self.notified.extend(channel_names)
+
+
+@pytest.fixture
+def console(tmp_path, monkeypatch):
+    """Estado global de main.py con un registro de tres canales."""
+    registry = ChannelRegistry()
+    for index in range(3):
+        registry.add(f"channel{index}", str(index))
+    notifier = RecordingNotifier()
+    monkeypatch.setattr(main, "registry", registry)
+    monkeypatch.setattr(main, "notifier", notifier)
+    monkeypatch.setattr(main, "metrics", Metrics())
+    monkeypatch.setattr(main, "profiler", TickProfiler())
+    monkeypatch.setattr(
+        main, "state_journal", StateJournal(str(tmp_path / "state.jsonl"))
+    )
+    monkeypatch.setattr(main, "live_to_notify", [])
+    return main
+
+
+def stream(stream_id):
+    return {"id": stream_id, "started_at": "2026-03-01T20:00:00Z",
+            "title": "Jugando", "game_name": "Minecraft", "viewer_count": 1}
+
+
+def test_poll_notifies_channels_going_live_once(console):
+    console.process_live_streams({"1": stream("s1")})
+    console.process_live_streams({"1": stream("s1")})
+
+    assert console.notifier.notified == ["channel1"]
+    assert console.registry.get("channel1").is_live
+
+
+def test_failed_poll_keeps_the_previous_state(console):
+    console.process_live_streams({"1": stream("s1")})
+    console.process_live_streams(None)
+
+    record = console.registry.get("channel1")
+    assert record.is_live
+    assert record.error_count == 1
+
+
+def test_push_event_during_reconcile_poll_wins(console, monkeypatch):
+    class SlowClient:
+        async def get_live_streams(self, user_ids):
+            # stream.online arrives while the poll is waiting on Helix
+            await asyncio.sleep(0.01)
+            console.on_stream_online("1", {"id": "s1", "type": "live"})
+            return {}
+
+    monkeypatch.setattr(console, "async_twitch_client", SlowClient())
+    asyncio.run(console.check_channels_and_notify_async())
+
+    assert console.registry.get("channel1").is_live
+    # The next reconcile sees it live: no second notification
+    console.process_live_streams({"1": stream("s1")})
+    assert console.notifier.notified == ["channel1"]
+
+
+def test_poll_only_visits_live_channels(console):
+    console.process_live_streams({"1": stream("s1")})
+    console.process_live_streams({})
+
+    assert console.registry.get("channel0").last_checked_at is None
+    assert not console.registry.get("channel1").is_live
+    assert console.registry.live_records() == []
+
+
+def test_adaptive_poll_failure_counts_only_polled_channels(console):
+    console.process_live_streams(None, ["1"])
+    console.process_live_streams({}, ["2"])
+
+    assert console.registry.get("channel1").error_count == 1
+    console.process_live_streams({}, ["1"])
+    assert console.registry.get("channel1").error_count == 0
+
+
+def test_async_poll_of_some_channels_leaves_the_rest(console, monkeypatch):
+    class RecordingClient:
+        def __init__(self):
+            self.requested = []
+
+        async def get_live_streams(self, user_ids):
+            self.requested.append(list(user_ids))
+            return {}
+
+    client = RecordingClient()
+    monkeypatch.setattr(console, "async_twitch_client", client)
+    console.process_live_streams({"1": stream("s1")})
+
+    asyncio.run(console.check_channels_and_notify_async(["0", "2"]))
+
+    assert client.requested == [["0", "2"]]
+    # channel1 was not polled, so it is not taken as offline
+    assert console.registry.get("channel1").is_live
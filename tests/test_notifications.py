@@ -0,0 +1,73 @@
+import threading
+
+from src.notifications import NotificationDispatcher
+
+
+class RecordingNotifier:
+    def __init__(self, block=None):
+        self.calls = []
+        self.block = block
+
+    def notify_live_many(self, channel_names):
+        if self.block is not None:
+            self.block.wait()
+        self.calls.append(channel_names)
+
+
+def test_burst_of_single_channels_is_one_batch():
+    notifier = RecordingNotifier()
+    dispatcher = NotificationDispatcher(notifier, max_backlog=10)
+    for index in range(300):
+        dispatcher.notify_live(f"channel{index}")
+    dispatcher.close()
+
+    assert dispatcher.dropped == 0
+    assert notifier.calls == [[f"channel{index}" for index in range(300)]]
+
+
+def test_repeated_channels_are_notified_once():
+    notifier = RecordingNotifier()
+    dispatcher = NotificationDispatcher(notifier)
+    dispatcher.notify_live_many(["a", "b"])
+    dispatcher.notify_live("a")
+    dispatcher.close()
+
+    assert notifier.calls == [["a", "b"]]
+
+
+def test_backlog_is_bounded_by_batches():
+    block = threading.Event()
+    notifier = RecordingNotifier(block)
+    dispatcher = NotificationDispatcher(
+        notifier, max_backlog=2, coalesce_seconds=0
+    )
+    dispatcher.notify_live_many(["first"])
+    # Wait until the worker is stuck delivering the first batch
+    while dispatcher.backlog():
+        pass
+    for index in range(4):
+        dispatcher.notify_live_many([f"a{index}", f"b{index}"])
+    assert dispatcher.backlog() == 2
+    assert dispatcher.dropped == 4
+
+    block.set()
+    dispatcher.close()
+    assert notifier.calls == [["first"], ["a0", "b0", "a1", "b1"]]
+
+
+def test_close_does_not_block_on_a_full_backlog():
+    block = threading.Event()
+    dispatcher = NotificationDispatcher(
+        RecordingNotifier(block), max_backlog=1, coalesce_seconds=0
+    )
+    dispatcher.notify_live("first")
+    while dispatcher.backlog():
+        pass
+    dispatcher.notify_live("second")
+    dispatcher.notify_live("third")
+
+    closer = threading.Thread(target=dispatcher.close, kwargs={"timeout": 0.2})
+    closer.start()
+    closer.join(1)
+    assert not closer.is_alive()
+    block.set()
@@ -0,0 +1,223 @@
+from src.registry import (
+    EVENT_GAME_CHANGED,
+    EVENT_LIVE,
+    EVENT_OFFLINE,
+    EVENT_RESTART,
+    EVENT_TITLE_CHANGED,
+    RESTART_GRACE_SECONDS,
+    ChannelRecord,
+    ChannelRegistry,
+    StreamEvent,
+    parse_timestamp,
+)
+
+STARTED_AT = "2026-03-01T20:00:00Z"
+NOW = parse_timestamp(STARTED_AT) + 60
+
+
+def helix_stream(stream_id="s1", title="Jugando", game_name="Minecraft",
+                 started_at=STARTED_AT):
+    return {
+        "id": stream_id,
+        "started_at": started_at,
+        "title": title,
+        "game_name": game_name,
+        "viewer_count": 10,
+    }
+
+
+def live_record(now=NOW, **stream):
+    record = ChannelRecord("canal", "1")
+    record.apply(True, helix_stream(**stream), now)
+    return record
+
+
+def test_going_live():
+    record = ChannelRecord("canal", "1")
+
+    events = record.apply(True, helix_stream(), NOW)
+
+    assert events == [StreamEvent(EVENT_LIVE, "canal", None, "s1")]
+    assert record.is_live
+    assert record.snapshot() == helix_stream()
+
+
+def test_going_offline():
+    record = live_record()
+
+    events = record.apply(False, now=NOW + 300)
+
+    assert events == [StreamEvent(EVENT_OFFLINE, "canal", "s1", None)]
+    assert not record.is_live
+    assert record.went_offline_at == NOW + 300
+    assert record.snapshot() is None
+
+
+def test_unchanged_channel_has_no_events():
+    offline = ChannelRecord("canal", "1")
+    assert offline.apply(False, now=NOW) == []
+    assert live_record().apply(True, helix_stream(), NOW + 300) == []
+
+
+def test_title_change():
+    record = live_record()
+
+    events = record.apply(True, helix_stream(title="Otro título"), NOW + 300)
+
+    assert events == [
+        StreamEvent(EVENT_TITLE_CHANGED, "canal", "Jugando", "Otro título")
+    ]
+    assert record.title == "Otro título"
+
+
+def test_game_change():
+    record = live_record()
+
+    events = record.apply(True, helix_stream(game_name="Fortnite"), NOW + 300)
+
+    assert events == [
+        StreamEvent(EVENT_GAME_CHANGED, "canal", "Minecraft", "Fortnite")
+    ]
+
+
+def test_new_stream_id_inside_grace_is_a_restart():
+    record = live_record()
+    started_at = "2026-03-01T20:03:00Z"
+
+    events = record.apply(
+        True, helix_stream("s2", started_at=started_at), NOW + 300
+    )
+
+    assert events == [StreamEvent(EVENT_RESTART, "canal", "s1", "s2")]
+    assert record.stream_id == "s2"
+
+
+def test_new_stream_id_outside_grace_is_a_new_stream():
+    record = live_record()
+    # Started long after the previous poll saw the old stream
+    started_at = "2026-03-01T21:00:00Z"
+
+    events = record.apply(
+        True, helix_stream("s2", started_at=started_at),
+        parse_timestamp(started_at) + 60,
+    )
+
+    assert events == [StreamEvent(EVENT_LIVE, "canal", "s1", "s2")]
+
+
+def test_back_online_inside_grace_is_a_restart():
+    record = live_record()
+    record.apply(False, now=NOW + 60)
+
+    events = record.apply(
+        True, helix_stream("s2"), NOW + 60 + RESTART_GRACE_SECONDS - 1
+    )
+
+    assert events == [StreamEvent(EVENT_RESTART, "canal", None, "s2")]
+
+
+def test_back_online_after_grace_is_a_new_stream():
+    record = live_record()
+    record.apply(False, now=NOW + 60)
+
+    events = record.apply(
+        True, helix_stream("s2"), NOW + 60 + RESTART_GRACE_SECONDS
+    )
+
+    assert events == [StreamEvent(EVENT_LIVE, "canal", None, "s2")]
+
+
+def test_eventsub_event_without_title_keeps_the_polled_details():
+    record = live_record()
+    eventsub_event = {"id": "s1", "started_at": STARTED_AT, "type": "live"}
+
+    events = record.apply(True, eventsub_event, NOW + 300)
+
+    assert events == []
+    assert record.title == "Jugando"
+    assert record.game_name == "Minecraft"
+
+
+def test_eventsub_online_event_goes_live_without_details():
+    record = ChannelRecord("canal", "1")
+    eventsub_event = {"id": "s1", "started_at": STARTED_AT, "type": "live"}
+
+    events = record.apply(True, eventsub_event, NOW)
+
+    assert events == [StreamEvent(EVENT_LIVE, "canal", None, "s1")]
+    assert record.title is None
+    # The next poll fills in the details without reporting them as changes
+    assert record.apply(True, helix_stream(), NOW + 300) == []
+    assert record.title == "Jugando"
+
+
+def test_registry_lookups_ignore_case():
+    registry = ChannelRegistry()
+    record = registry.add("Canal", "1")
+
+    assert registry.add("canal", "1") is record
+    assert "CANAL" in registry
+    assert registry.get_by_user_id("1") is record
+    assert registry.remove("canal") is record
+    assert len(registry) == 0
+
+
+def registry_with_channels(count=5):
+    registry = ChannelRegistry()
+    registry.add_many({f"channel{index}": str(index) for index in range(count)})
+    return registry
+
+
+def test_live_candidates_are_previous_and_current_live_channels():
+    registry = registry_with_channels()
+    registry.apply(registry.get("channel1"), True, helix_stream(), NOW)
+    registry.apply(registry.get("channel2"), True, helix_stream(), NOW)
+
+    candidates = registry.live_candidates({"2": helix_stream(), "3": None})
+
+    assert [(record.login, stream is not None)
+            for record, stream in candidates] == [
+        ("channel2", True), ("channel3", False), ("channel1", False),
+    ]
+    assert registry.get("channel0").last_checked_at is None
+
+
+def test_live_candidates_limited_to_polled_channels():
+    registry = registry_with_channels()
+    registry.apply(registry.get("channel1"), True, helix_stream(), NOW)
+    registry.apply(registry.get("channel2"), True, helix_stream(), NOW)
+
+    candidates = registry.live_candidates({}, user_ids=["2", "3"])
+
+    assert [record.login for record, _ in candidates] == ["channel2"]
+
+
+def test_live_set_follows_apply_track_and_remove():
+    registry = registry_with_channels()
+    record = registry.get("channel1")
+    registry.apply(record, True, helix_stream(), NOW)
+    assert registry.live_records() == [record]
+
+    registry.apply(record, False, now=NOW + 60)
+    assert registry.live_records() == []
+
+    # Restored from the journal without apply()
+    record.is_live = True
+    registry.track(record)
+    assert registry.live_records() == [record]
+    registry.remove("channel1")
+    assert registry.live_records() == []
+
+
+def test_failures_are_cleared_only_for_recovered_channels():
+    registry = registry_with_channels()
+    registry.record_failure(["1", "2"])
+    registry.record_failure(["2"])
+    assert registry.get("channel2").error_count == 2
+
+    registry.clear_failures(["2", "3"])
+    assert registry.get("channel1").error_count == 1
+    assert registry.get("channel2").error_count == 0
+
+    registry.clear_failures()
+    assert registry.get("channel1").error_count == 0
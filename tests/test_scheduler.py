@@ -0,0 +1,148 @@
+from src.scheduler import AdaptiveScheduler
+
+NOW = 1_800_000_000
+
+
+class FakeHelix:
+    """check_function que registra cada lote consultado."""
+
+    def __init__(self, live=(), fail=False):
+        self.live = set(live)
+        self.fail = fail
+        self.batches = []
+
+    def __call__(self, user_ids):
+        self.batches.append(list(user_ids))
+        if self.fail:
+            return None
+        return {user_id: {} for user_id in user_ids if user_id in self.live}
+
+
+def scheduler_with(helix, channels, **options):
+    scheduler = AdaptiveScheduler(helix, **options)
+    for index in range(channels):
+        scheduler.add_channel(str(index), now=NOW)
+    return scheduler
+
+
+def test_requests_are_capped_by_the_budget():
+    helix = FakeHelix()
+    scheduler = scheduler_with(
+        helix, 50, batch_size=10, requests_per_minute=2
+    )
+
+    scheduler.run_tick(NOW)
+    assert [len(batch) for batch in helix.batches] == [10, 10]
+
+    # The budget is spent until the first request is a minute old
+    scheduler.run_tick(NOW + 30)
+    assert len(helix.batches) == 2
+    scheduler.run_tick(NOW + 60)
+    assert len(helix.batches) == 4
+    # The oldest due channels go first
+    assert helix.batches[2][0] == "20"
+
+
+def test_partial_batch_waits_for_more_channels():
+    helix = FakeHelix()
+    scheduler = scheduler_with(
+        helix, 5, batch_size=100, max_wait_seconds=30
+    )
+
+    scheduler.run_tick(NOW)
+    scheduler.run_tick(NOW + 15)
+    assert helix.batches == []
+
+    scheduler.run_tick(NOW + 30)
+    assert helix.batches == [["0", "1", "2", "3", "4"]]
+
+
+def test_partial_batch_is_topped_up_with_upcoming_channels():
+    helix = FakeHelix()
+    scheduler = scheduler_with(
+        helix, 3, batch_size=5, max_wait_seconds=0
+    )
+    scheduler.add_channel("later", now=NOW + 600)
+
+    scheduler.run_tick(NOW)
+
+    assert helix.batches == [["0", "1", "2", "later"]]
+
+
+def test_failed_request_is_retried_next_tick():
+    helix = FakeHelix(live=["1"], fail=True)
+    # A 15 s base interval leaves budget for the retry on the next tick
+    scheduler = scheduler_with(
+        helix, 3, max_wait_seconds=0, tick_seconds=15,
+        base_interval_minutes=0.25,
+    )
+
+    assert scheduler.run_tick(NOW) == []
+    assert scheduler.checks_made == 0
+    assert not scheduler.histories["1"].is_live
+
+    helix.fail = False
+    assert scheduler.run_tick(NOW + 15) == ["1"]
+    assert helix.batches[1] == ["0", "1", "2"]
+
+
+def test_failed_request_counts_against_the_fixed_rate():
+    helix = FakeHelix(fail=True)
+    scheduler = scheduler_with(helix, 3, max_wait_seconds=0)
+
+    scheduler.run_tick(NOW)
+    helix.fail = False
+    for now in range(NOW + 15, NOW + 5 * 60, 15):
+        scheduler.run_tick(now)
+    assert len(helix.batches) == 1
+
+    scheduler.run_tick(NOW + 5 * 60)
+    assert len(helix.batches) == 2
+
+
+def test_small_list_never_polls_more_than_the_fixed_loop():
+    # Channels keep going live and offline, so many are checked every minute
+    helix = FakeHelix()
+    scheduler = scheduler_with(helix, 40, base_interval_minutes=5)
+    sent_at = []
+    day = 24 * 60 * 60
+    for now in range(NOW, NOW + day, 15):
+        helix.live = {
+            str(index) for index in range(40)
+            if (now // 60 + index * 7) % 90 < 30
+        }
+        before = len(helix.batches)
+        scheduler.run_tick(now)
+        sent_at.extend([now] * (len(helix.batches) - before))
+
+    # 40 channels fit in one batch: at most one request every 5 minutes
+    assert len(sent_at) <= day // (5 * 60)
+    assert min(
+        sent_at[index + 1] - sent_at[index]
+        for index in range(len(sent_at) - 1)
+    ) >= 5 * 60
+    assert scheduler.checks_made == 40 * len(sent_at)
+
+
+def test_next_interval_follows_the_history():
+    scheduler = scheduler_with(
+        FakeHelix(), 1, base_interval_minutes=5, min_interval_minutes=1,
+        max_interval_minutes=30, min_history=2,
+    )
+    history = scheduler.histories["0"]
+    # Not enough history yet: base interval
+    assert scheduler.next_interval("0", NOW) == 5 * 60
+
+    day = 24 * 60 * 60
+    for week in range(3):
+        went_live = NOW + week * 7 * day
+        history.record(True, went_live)
+        assert scheduler.next_interval("0", went_live) == 5 * 60
+        history.record(False, went_live + 60)
+    # Just went offline: checked often in case it comes back
+    assert scheduler.next_interval("0", NOW + 14 * day + 120) == 60
+
+    # Usual go-live hour next week: min interval; twelve hours off: max
+    next_week = NOW + 21 * day
+    assert scheduler.next_interval("0", next_week) == 60
+    assert scheduler.next_interval("0", next_week + day // 2) == 30 * 60
@@ -0,0 +1,46 @@
+import queue
+import threading
+
+from src.sharded import _shard_worker, split_into_shards
+
+
+def run_worker(server, channels_user_ids, snapshots=None, ticks=1):
+    events = queue.Queue()
+    client_config = {
+        "client_id": "mock-client",
+        "access_token": "mock-token",
+        "base_url": server.url,
+    }
+    _shard_worker(0, channels_user_ids, client_config, 0, ticks, events,
+                  threading.Event(), snapshots)
+    collected = []
+    while not events.empty():
+        collected.append(events.get())
+    return [event[1:3] for event in collected if event[0] == "transition"]
+
+
+def test_split_into_shards_fills_requests():
+    channels = {f"channel{i}": str(i) for i in range(250)}
+    shards = split_into_shards(channels, 2)
+    assert [len(shard) for shard in shards] == [150, 100]
+
+
+def test_channel_going_live_is_reported(helix_server):
+    channels = dict(list(helix_server.user_ids().items())[:3])
+    helix_server.set_live(channels["channel1"], True)
+
+    assert run_worker(helix_server, channels) == [("channel1", True)]
+
+
+def test_restored_live_channel_now_offline_is_reported(helix_server):
+    channels = dict(list(helix_server.user_ids().items())[:3])
+    snapshot = {
+        "id": "old-stream", "started_at": "2026-01-01T00:00:00Z",
+        "title": "Título", "game_name": "Juego", "viewer_count": 10,
+    }
+
+    transitions = run_worker(
+        helix_server, channels, {channels["channel0"]: snapshot}, ticks=2
+    )
+
+    assert transitions == [("channel0", False)]
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import requests
+
+from src.metrics import Metrics
+from src.sinks import FanOutSink, SinkWorker, retry_delay
+
+
+def http_error(status, headers=None):
+    """El mismo error que lanza raise_for_status() en un HttpSink."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+class FakeSink:
+    """
+    Sink que falla con los errores de `failures`, en orden, y después
+    entrega. Con `gate`, cada entrega espera a que se abra.
+    """
+
+    def __init__(self, failures=(), gate=None):
+        self.failures = list(failures)
+        self.gate = gate
+        self.attempts = []
+        self.delivered = []
+        self.started = threading.Event()
+        self.done = threading.Event()
+
+    def notify_live_many(self, channel_names):
+        self.attempts.append(time.monotonic())
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.failures:
+            raise self.failures.pop(0)
+        self.delivered.extend(channel_names)
+        self.done.set()
+
+
+def test_failed_delivery_is_retried():
+    sink = FakeSink(failures=[http_error(503)])
+    worker = SinkWorker(sink, retry_base_delay=0.01)
+
+    worker.submit(["uno", "dos"])
+    worker.close()
+
+    assert sink.delivered == ["uno", "dos"]
+    assert len(sink.attempts) == 2
+    assert (worker.delivered, worker.failed) == (2, 0)
+
+
+def test_client_error_is_not_retried():
+    sink = FakeSink(failures=[http_error(404)])
+    metrics = Metrics()
+    worker = SinkWorker(sink, name="webhook", retry_base_delay=0.01,
+                        metrics=metrics)
+
+    worker.submit(["uno"])
+    worker.close()
+
+    assert len(sink.attempts) == 1
+    assert sink.delivered == []
+    assert worker.failed == 1
+    assert metrics.counter_total("sink_deliveries_total") == 1
+
+
+def test_rate_limit_waits_for_retry_after():
+    assert retry_delay(http_error(429, {"Retry-After": "7"}), 0) == 7
+    assert retry_delay(http_error(429, {"Retry-After": "3600"}), 0) == 60
+    assert retry_delay(http_error(400), 0) is None
+
+    sink = FakeSink(failures=[http_error(429, {"Retry-After": "0.3"})])
+    # Plain backoff would wait up to a minute; Retry-After wins
+    worker = SinkWorker(sink, retry_base_delay=60)
+
+    worker.submit(["uno"])
+    assert sink.done.wait(5)
+    worker.close()
+
+    assert sink.attempts[1] - sink.attempts[0] >= 0.3
+    assert sink.delivered == ["uno"]
+
+
+def test_full_backlog_drops_new_batches():
+    gate = threading.Event()
+    sink = FakeSink(gate=gate)
+    worker = SinkWorker(sink, max_backlog=2)
+
+    worker.submit(["uno"])
+    # The worker holds the first batch, the next two fill the backlog
+    assert sink.started.wait(5)
+    for name in ("dos", "tres", "cuatro"):
+        worker.submit([name])
+    assert worker.dropped == 1
+    assert worker.backlog == 2
+
+    gate.set()
+    worker.close()
+    assert sink.delivered == ["uno", "dos", "tres"]
+
+
+def test_close_gives_up_on_retries_due_after_the_deadline():
+    sink = FakeSink(failures=[http_error(429, {"Retry-After": "30"})])
+    metrics = Metrics()
+    worker = SinkWorker(sink, metrics=metrics)
+    worker.submit(["uno", "dos"])
+    assert sink.started.wait(5)
+
+    started = time.monotonic()
+    worker.close(timeout=0.2)
+
+    assert time.monotonic() - started < 1
+    assert len(sink.attempts) == 1
+    assert worker.failed == 2
+    assert worker.backlog == 0
+    # One retry scheduled, then both channels given up
+    assert metrics.counter_total("sink_deliveries_total") == 1 + 2
+
+
+def test_slow_sink_does_not_delay_the_others():
+    gate = threading.Event()
+    slow = FakeSink(gate=gate)
+    fast = FakeSink()
+    fan_out = FanOutSink([slow, fast])
+
+    fan_out.notify_live_many(["uno"])
+
+    assert fast.done.wait(5)
+    assert fast.delivered == ["uno"]
+    assert slow.delivered == []
+    assert [worker.name for worker in fan_out.workers] == [
+        "FakeSink", "FakeSink-1"
+    ]
+
+    gate.set()
+    fan_out.close()
+    assert slow.delivered == ["uno"]
+    assert fan_out.backlog == 0
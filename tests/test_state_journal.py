@@ -0,0 +1,136 @@
+import json
+
+from src import state_journal
+from src.registry import (
+    EVENT_LIVE,
+    EVENT_OFFLINE,
+    EVENT_RESTART,
+    ChannelRecord,
+    StreamEvent,
+    parse_timestamp,
+)
+from src.state_journal import StateJournal
+
+STARTED_AT = "2026-03-01T20:00:00Z"
+TICK_AT = parse_timestamp(STARTED_AT) + 600
+
+
+def helix_stream(stream_id="s1", started_at=STARTED_AT):
+    return {
+        "id": stream_id,
+        "started_at": started_at,
+        "title": "Jugando",
+        "game_name": "Minecraft",
+        "viewer_count": 10,
+    }
+
+
+def save_live_channel(path, now=TICK_AT):
+    journal = StateJournal(path)
+    record = ChannelRecord("canal", "1")
+    record.apply(True, helix_stream(), now)
+    journal.record(record, now)
+    journal.flush(now)
+    return journal
+
+
+def restored_record(path):
+    record = ChannelRecord("canal", "1")
+    assert StateJournal(path).restore(record)
+    return record
+
+
+def test_replay_restores_the_last_state(tmp_path):
+    path = tmp_path / "state.jsonl"
+    journal = save_live_channel(path)
+    other = ChannelRecord("otro", "2")
+    journal.record(other, TICK_AT + 60)
+    journal.flush(TICK_AT + 60)
+
+    record = restored_record(path)
+
+    assert record.is_live
+    assert record.stream_id == "s1"
+    assert record.title == "Jugando"
+    assert record.last_checked_at == TICK_AT + 60
+    assert not StateJournal(path).restore(ChannelRecord("nuevo", "3"))
+
+
+def test_relative_path_without_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_live_channel("state.jsonl")
+
+    assert (tmp_path / "state.jsonl").exists()
+    assert restored_record("state.jsonl").is_live
+
+
+def test_missing_directory_is_created(tmp_path):
+    path = tmp_path / "data" / "state.jsonl"
+    save_live_channel(path)
+
+    assert restored_record(path).is_live
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "state.jsonl"
+    save_live_channel(path)
+    with open(path, "a", encoding="utf-8") as journal_file:
+        journal_file.write('{"user_id": "1", "is_li')
+
+    journal = StateJournal(path)
+    assert journal.torn_tail
+    assert journal.entries["1"]["is_live"]
+
+    # The next write starts on a new line, so it can be read back
+    record = ChannelRecord("canal", "1")
+    journal.record(record, TICK_AT + 60)
+    journal.flush(TICK_AT + 60)
+    assert not restored_record(path).is_live
+
+
+def test_compaction_keeps_one_line_per_channel(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_journal, "COMPACT_EXTRA_LINES", 5)
+    path = tmp_path / "state.jsonl"
+    journal = StateJournal(path)
+    record = ChannelRecord("canal", "1")
+    for tick in range(10):
+        record.apply(tick % 2 == 0, helix_stream(f"s{tick}"), TICK_AT + tick)
+        journal.record(record, TICK_AT + tick)
+        journal.flush(TICK_AT + tick)
+
+    with open(path, encoding="utf-8") as journal_file:
+        lines = [json.loads(line) for line in journal_file]
+    assert len(lines) <= len(journal.entries) + 5 + 2
+    assert StateJournal(path).entries == journal.entries
+    restored = restored_record(path)
+    assert not restored.is_live
+    assert restored.last_checked_at == TICK_AT + 9
+
+
+def test_live_channel_that_ended_while_closed(tmp_path):
+    path = tmp_path / "state.jsonl"
+    save_live_channel(path)
+    record = restored_record(path)
+
+    events = record.apply(False, now=TICK_AT + 3600)
+
+    assert events == [StreamEvent(EVENT_OFFLINE, "canal", "s1", None)]
+
+
+def test_live_channel_with_a_new_stream_after_restart(tmp_path):
+    path = tmp_path / "state.jsonl"
+    save_live_channel(path)
+
+    # A quick comeback right after the last saved tick is the same session
+    record = restored_record(path)
+    soon = "2026-03-01T20:12:00Z"
+    events = record.apply(True, helix_stream("s2", soon), TICK_AT + 300)
+    assert events == [StreamEvent(EVENT_RESTART, "canal", "s1", "s2")]
+
+    # A stream that started long after the app was closed is notified
+    record = restored_record(path)
+    later = "2026-03-02T18:00:00Z"
+    events = record.apply(
+        True, helix_stream("s2", later), parse_timestamp(later) + 60
+    )
+    assert events == [StreamEvent(EVENT_LIVE, "canal", "s1", "s2")]
@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from benchmarks.mock_helix import MockHelixServer
+from src.twitch_client import REFRESH_RETRY_SECONDS, TokenManager, TwitchClient
+
+UNREACHABLE_OAUTH_URL = "http://127.0.0.1:1/oauth2/"
+
+
+@pytest.fixture
+def auth_server():
+    """Servidor Helix simulado que exige un token emitido por su OAuth."""
+    with MockHelixServer(channels=20, require_auth=True, seed=1) as server:
+        yield server
+
+
+def count_posts(token_manager):
+    calls = []
+    post = token_manager.session.post
+
+    def counting_post(*args, **kwargs):
+        calls.append(args)
+        return post(*args, **kwargs)
+
+    token_manager.session.post = counting_post
+    return calls
+
+
+def test_token_is_requested_on_first_use(auth_server):
+    token_manager = TokenManager(
+        "mock-client", "mock-secret", oauth_url=auth_server.oauth_url
+    )
+
+    token = token_manager.get_token()
+
+    assert token in auth_server.access_tokens
+    assert token_manager.expires_at > time.time()
+
+
+def test_token_is_refreshed_before_it_expires(auth_server):
+    token_manager = TokenManager(
+        "mock-client", "mock-secret", oauth_url=auth_server.oauth_url
+    )
+    first = token_manager.get_token()
+    # 5% of the lifetime left, below REFRESH_FRACTION
+    token_manager.expires_at = time.time() + token_manager.lifetime * 0.05
+
+    second = token_manager.get_token()
+
+    assert second != first
+    assert auth_server.token_count == 2
+
+
+def test_failed_proactive_refresh_keeps_the_current_token(capsys):
+    token_manager = TokenManager(
+        "mock-client", "mock-secret", access_token="current",
+        oauth_url=UNREACHABLE_OAUTH_URL,
+    )
+    token_manager.lifetime = 1000
+    token_manager.expires_at = time.time() + 50
+    posts = count_posts(token_manager)
+
+    assert token_manager.get_token() == "current"
+    assert token_manager.get_token() == "current"
+    # The second call waits REFRESH_RETRY_SECONDS instead of retrying
+    assert len(posts) == 1
+    assert "se sigue usando el actual" in capsys.readouterr().out
+
+
+def test_expired_token_raises_when_refresh_fails():
+    token_manager = TokenManager(
+        "mock-client", "mock-secret", access_token="current",
+        oauth_url=UNREACHABLE_OAUTH_URL,
+    )
+    token_manager.lifetime = 1000
+    token_manager.expires_at = time.time() - 1
+    posts = count_posts(token_manager)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        token_manager.get_token()
+    with pytest.raises(requests.exceptions.RequestException):
+        token_manager.get_token()
+    assert len(posts) == 1
+
+    token_manager.refresh_failed_at -= REFRESH_RETRY_SECONDS
+    with pytest.raises(requests.exceptions.ConnectionError):
+        token_manager.get_token()
+    assert len(posts) == 2
+
+
+def test_validate_static_tokens(auth_server):
+    valid = TokenManager(
+        "mock-client", access_token=auth_server.issue_token(),
+        oauth_url=auth_server.oauth_url,
+    )
+    revoked = TokenManager(
+        "mock-client", access_token="not-issued",
+        oauth_url=auth_server.oauth_url,
+    )
+
+    assert valid.validate() is True
+    assert valid.expires_at > time.time()
+    assert revoked.validate() is False
+
+
+def test_concurrent_401s_refresh_the_token_once(auth_server):
+    twitch_client = TwitchClient(
+        "mock-client", None, client_secret="mock-secret", pool_size=16,
+        token_manager=TokenManager(
+            "mock-client", "mock-secret", oauth_url=auth_server.oauth_url
+        ),
+    )
+    twitch_client.base_url = auth_server.url
+    user_ids = list(auth_server.user_ids().values())
+    assert twitch_client.get_live_streams(user_ids) is not None
+
+    auth_server.revoke_tokens()
+    barrier = threading.Barrier(16)
+    results = []
+
+    def poll():
+        barrier.wait()
+        results.append(twitch_client.get_live_streams(user_ids))
+
+    threads = [threading.Thread(target=poll) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    twitch_client.close()
+
+    assert len(results) == 16
+    assert all(result is not None for result in results)
+    # The initial token plus a single refresh for all 16 threads
+    assert auth_server.token_count == 2
+    assert auth_server.unauthorized_count >= 1
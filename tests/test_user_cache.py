@@ -0,0 +1,96 @@
+import json
+
+from src.user_cache import UserIdCache
+
+
+class FakeTwitchClient:
+    """Responde get_user_ids con IDs fijos y anota cada consulta."""
+
+    def __init__(self, user_ids):
+        self.user_ids = user_ids
+        self.calls = []
+
+    def get_user_ids(self, logins):
+        self.calls.append(list(logins))
+        return {
+            login: self.user_ids[login]
+            for login in logins if login in self.user_ids
+        }
+
+
+def test_warm_start_does_not_query_the_api(tmp_path):
+    path = tmp_path / "user_ids.json"
+    client = FakeTwitchClient({"uno": "1", "dos": "2"})
+    assert UserIdCache(path).resolve(["uno", "dos"], client) == {
+        "uno": "1", "dos": "2"
+    }
+
+    warm = FakeTwitchClient({})
+    assert UserIdCache(path).resolve(["uno", "dos"], warm) == {
+        "uno": "1", "dos": "2"
+    }
+    assert warm.calls == []
+
+
+def test_relative_path_without_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = UserIdCache("user_ids.json")
+    cache.resolve(["uno"], FakeTwitchClient({"uno": "1"}))
+
+    assert (tmp_path / "user_ids.json").exists()
+    assert UserIdCache("user_ids.json").get("uno") == "1"
+
+
+def test_missing_directory_is_created(tmp_path):
+    path = tmp_path / "cache" / "user_ids.json"
+    UserIdCache(path).resolve(["uno"], FakeTwitchClient({"uno": "1"}))
+
+    assert UserIdCache(path).get("uno") == "1"
+
+
+def test_only_missing_logins_are_queried(tmp_path):
+    cache = UserIdCache(tmp_path / "user_ids.json")
+    cache.update({"uno": "1"})
+    client = FakeTwitchClient({"dos": "2"})
+
+    assert cache.resolve(["Uno", "dos", "nadie"], client) == {
+        "Uno": "1", "dos": "2"
+    }
+    assert client.calls == [["dos", "nadie"]]
+
+
+def test_stale_entries_are_returned_and_refreshed(tmp_path, monkeypatch):
+    cache = UserIdCache(tmp_path / "user_ids.json", ttl_seconds=-1)
+    cache.update({"uno": "1"})
+    client = FakeTwitchClient({"uno": "11"})
+    threads = []
+    refresh_in_background = cache.refresh_in_background
+    monkeypatch.setattr(
+        cache, "refresh_in_background",
+        lambda logins, twitch_client: threads.append(
+            refresh_in_background(logins, twitch_client)
+        ),
+    )
+
+    # The stale ID is returned right away and revalidated afterwards
+    assert cache.resolve(["uno"], client) == {"uno": "1"}
+    threads[0].join(5)
+    assert cache.get("uno") == "11"
+    assert UserIdCache(tmp_path / "user_ids.json").get("uno") == "11"
+
+
+def test_old_dict_entries_are_loaded(tmp_path):
+    path = tmp_path / "user_ids.json"
+    path.write_text(json.dumps({"uno": {"id": "1", "resolved_at": 0}}))
+
+    cache = UserIdCache(path)
+
+    assert cache.get("uno") == "1"
+    assert cache.is_stale("uno")
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "user_ids.json"
+    path.write_text("{no es json")
+
+    assert UserIdCache(path).entries == {}